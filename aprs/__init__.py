@@ -15,26 +15,88 @@ Python APRS Module.
 
 """
 
+import importlib
+
 from .constants import (LOG_FORMAT, LOG_LEVEL, APRSIS_SW_VERSION,  # NOQA
                         APRSIS_HTTP_HEADERS, APRSIS_SERVERS,
                         APRSIS_FILTER_PORT, APRSIS_RX_PORT, RECV_BUFFER,
                         APRSIS_URL, DEFAULT_TOCALL, AX25_FLAG,
                         AX25_CONTROL_FIELD, AX25_PROTOCOL_ID, ADDR_INFO_DELIM,
-                        DATA_TYPE_MAP, KISS_DATA_FRAME)
+                        DATA_TYPE_MAP, KISS_DATA_FRAME, KISS_FEND,
+                        KISS_FESC, KISS_TFEND, KISS_TFESC, EARTH_RADIUS_KM,
+                        DISTANCE_UNITS, CALLSIGN_ALPHABET,
+                        PROFILE, PROFILE_INTERVAL, PROFILE_OUTPUT,
+                        PARSE_OK, PARSE_EMPTY, PARSE_BAD_TYPE,
+                        PARSE_NO_DESTINATION, PARSE_NO_INFO, PARSE_TRUNCATED,
+                        PARSE_BAD_SOURCE, PARSE_BAD_DESTINATION,
+                        PARSE_BAD_PATH, PARSE_ERRORS)
+
+from .exceptions import BadCallsignError, SnapshotError  # NOQA
+
+# Everything else is imported from its submodule on first use, so that
+# `import aprs` doesn't import Requests, bitarray, NumPy & the rest until
+# they're needed.
+_LAZY_ATTRIBUTES = {
+    'valid_callsign': 'util',
+    'dec2dm_lat': 'geo_util', 'dec2dm_lng': 'geo_util',
+    'dm2dec_lat': 'geo_util', 'dm2dec_lng': 'geo_util',
+    'ambiguate': 'geo_util', 'distance': 'geo_util', 'bearing': 'geo_util',
+    'bounding_box': 'geo_util', 'in_bounding_box': 'geo_util',
+    'in_range': 'geo_util',
+    'FCS': 'fcs',
+    'Profiler': 'profiling',
+    'MetricsRegistry': 'metrics',
+    'PacketTap': 'tap',
+    'parse_frame': 'functions', 'parse_callsign': 'functions',
+    'parse_callsign_ax25': 'functions', 'parse_info_field': 'functions',
+    'parse_position': 'functions', 'parse_symbol': 'functions',
+    'pack_callsign': 'functions', 'unpack_callsign': 'functions',
+    'try_parse_frame': 'functions',
+    'Frame': 'classes', 'Callsign': 'classes', 'APRS': 'classes',
+    'TCP': 'classes', 'UDP': 'classes', 'HTTP': 'classes',
+    'InformationField': 'classes', 'PositionFrame': 'classes',
+    'Station': 'station_classes', 'StationStore': 'station_classes',
+    'FrameTemplate': 'template_classes',
+    'FrameEncoder': 'encoder_classes',
+    'BulkParser': 'bulk',
+}
+
+_SUBMODULES = frozenset([
+    'analytics', 'archive', 'bulk', 'capture', 'classes', 'columnar',
+    'constants', 'decimaldegrees', 'encoder_classes', 'exceptions', 'fcs',
+    'functions', 'geo_classes', 'geo_util', 'kiss_classes', 'log_reader',
+    'metrics', 'prefilter', 'profiling', 'replay', 'server', 'snapshot',
+    'station_classes', 'tap', 'template_classes', 'tracing', 'traffic',
+    'util',
+])
+
+# `from aprs import *` exports the constants, exceptions & lazily loaded
+# attributes, as it did when they were all imported eagerly.
+__all__ = sorted(
+    [name for name in globals()
+     if not name.startswith('_') and name != 'importlib'] +
+    list(_LAZY_ATTRIBUTES))
 
-from .exceptions import BadCallsignError  # NOQA
 
-from .util import valid_callsign  # NOQA
 
-from .geo_util import dec2dm_lat, dec2dm_lng, ambiguate  # NOQA
+def __getattr__(name: str):
+    """Imports lazily loaded attributes & submodules on first access."""
+    module_name = _LAZY_ATTRIBUTES.get(name)
+    if module_name is not None:
+        value = getattr(
+            importlib.import_module('.' + module_name, __name__), name)
+        globals()[name] = value
+        return value
+    if name in _SUBMODULES:
+        return importlib.import_module('.' + name, __name__)
+    raise AttributeError("module '%s' has no attribute '%s'" % (
+        __name__, name))
 
-from .fcs import FCS  # NOQA
 
-from .functions import (parse_frame, parse_callsign,   # NOQA
-                        parse_callsign_ax25, parse_info_field)
+def __dir__():
+    """Lists the lazily loaded attributes & submodules too."""
+    return sorted(set(globals()) | set(_LAZY_ATTRIBUTES) | _SUBMODULES)
 
-from .classes import (Frame, Callsign, APRS, TCP, UDP, HTTP,  # NOQA
-                      InformationField, PositionFrame)
 
 __author__ = 'Greg Albrecht W2GMD <oss@undef.net>'  # NOQA pylint: disable=R0801
 __copyright__ = 'Copyright 2017 Greg Albrecht and Contributors'  # NOQA pylint: disable=R0801
@@ -0,0 +1,283 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Python APRS Module Analytics Definitions.
+
+Runs Reducers over the Frames in archive files in parallel. Plain-text
+archives are split into chunks on line boundaries; compressed archives are
+processed one file per task. Each task parses its chunk into `aprs.Frame`s,
+updates a partial result per Reducer, and the partials are merged.
+
+Reducers must be picklable (ie, defined at module level), as they are sent
+to the worker processes::
+
+    results = aprs.analytics.run(
+        ['2026-10-18.log'],
+        {'stations': aprs.analytics.StationCounts(),
+         'types': aprs.analytics.DataTypeHistogram()})
+"""
+
+import collections
+import concurrent.futures
+import logging
+import os
+import typing
+
+import aprs  # pylint: disable=R0801
+import aprs.archive  # pylint: disable=R0801
+
+__author__ = 'Greg Albrecht W2GMD <oss@undef.net>'  # NOQA pylint: disable=R0801
+__copyright__ = 'Copyright 2017 Greg Albrecht and Contributors'  # NOQA pylint: disable=R0801
+__license__ = 'Apache License, Version 2.0'  # NOQA pylint: disable=R0801
+
+
+ANALYTICS_CHUNK_SIZE = 64 << 20
+
+# Result keys of the Frame & parse error totals, which Reducers can't use.
+ANALYTICS_TOTALS = ('_frames', '_errors')
+
+_logger = logging.getLogger(__name__)  # pylint: disable=R0801
+if not _logger.handlers:  # pylint: disable=R0801
+    _logger.setLevel(aprs.LOG_LEVEL)  # pylint: disable=R0801
+    _console_handler = logging.StreamHandler()  # pylint: disable=R0801
+    _console_handler.setLevel(aprs.LOG_LEVEL)  # pylint: disable=R0801
+    _console_handler.setFormatter(aprs.LOG_FORMAT)  # pylint: disable=R0801
+    _logger.addHandler(_console_handler)  # pylint: disable=R0801
+    _logger.propagate = False  # pylint: disable=R0801
+
+
+class Reducer(object):
+
+    """
+    Reducer Base Class.
+
+    Subclasses build a partial result per chunk with `initial()` &
+    `update()`, and combine partial results with `merge()`.
+    """
+
+    def initial(self):
+        """Returns an empty partial result."""
+        return collections.Counter()
+
+    def update(self, partial, frame) -> None:
+        """
+        Abstract method for updating a partial result in-place with one
+        Frame.
+        """
+        pass
+
+    def merge(self, partial, other):
+        """Merges two partial results."""
+        partial.update(other)
+        return partial
+
+    def result(self, partial):
+        """Returns the final result from the merged partial results."""
+        return partial
+
+
+class FunctionReducer(Reducer):
+
+    """
+    Counts the keys returned by a (module level) function of each Frame.
+    Frames for which the function returns None are not counted.
+    """
+
+    def __init__(self, func: typing.Callable) -> None:
+        self.func = func
+
+    def update(self, partial, frame) -> None:
+        key = self.func(frame)
+        if key is not None:
+            partial[key] += 1
+
+
+class StationCounts(Reducer):
+
+    """Counts Frames per Source Callsign."""
+
+    def update(self, partial, frame) -> None:
+        partial[str(frame.source)] += 1
+
+
+class DataTypeHistogram(Reducer):
+
+    """
+    Counts Frames per Data Type, named per `aprs.DATA_TYPE_MAP` where known
+    or by Data Type Identifier otherwise.
+    """
+
+    def update(self, partial, frame) -> None:
+        partial[bytes(frame.info)[0:1]] += 1
+
+    def result(self, partial):
+        named = collections.Counter()
+        for data_type, count in partial.items():
+            named[aprs.DATA_TYPE_MAP.get(data_type, data_type)] += count
+        return named
+
+
+class PathStats(Reducer):
+
+    """
+    Counts the Frames relayed by each Digipeater (Path entries marked as
+    digipeated), and the distribution of Path lengths.
+    """
+
+    def initial(self):
+        return {'digipeaters': collections.Counter(),
+                'path_lengths': collections.Counter()}
+
+    def update(self, partial, frame) -> None:
+        partial['path_lengths'][len(frame.path)] += 1
+        digipeaters = partial['digipeaters']
+        for path_call in frame.path:
+            if path_call.digi:
+                digipeaters[str(path_call).rstrip('*')] += 1
+
+    def merge(self, partial, other):
+        for key in partial:
+            partial[key].update(other[key])
+        return partial
+
+
+def split_file(path: str, chunk_size: int=ANALYTICS_CHUNK_SIZE) -> \
+        typing.List[typing.Tuple[str, int, int]]:
+    """
+    Splits a plain-text archive into (path, start, end) byte ranges of about
+    `chunk_size`, each starting at the beginning of a line. A compressed
+    archive is returned as a single (path, 0, -1) task.
+    """
+    with open(path, 'rb') as archive:
+        magic = archive.read(4)
+        if (magic.startswith(aprs.archive.GZIP_MAGIC) or
+                magic == aprs.archive.ZSTD_MAGIC):
+            return [(path, 0, -1)]
+
+        size = os.fstat(archive.fileno()).st_size
+        chunks = []
+        start = 0
+        while start < size:
+            end = start + chunk_size
+            if end >= size:
+                end = size
+            else:
+                archive.seek(end)
+                archive.readline()
+                end = archive.tell()
+            chunks.append((path, start, end))
+            start = end
+    return chunks
+
+
+def _chunk_lines(path: str, start: int,
+                 end: int) -> typing.Iterator[bytes]:
+    """Yields the non-comment lines of a chunk."""
+    if end < 0:
+        yield from aprs.archive.ArchiveReader(path)
+        return
+
+    with open(path, 'rb') as archive:
+        archive.seek(start)
+        remaining = end - start
+        tail = b''
+        while remaining > 0:
+            block = archive.read(
+                min(remaining, aprs.archive.ARCHIVE_BLOCK_SIZE))
+            if not block:
+                break
+            remaining -= len(block)
+            lines = block.split(b'\n')
+            if tail:
+                lines[0] = tail + lines[0]
+            tail = lines.pop()
+            for line in lines:
+                if line and not line.startswith(b'#'):
+                    yield line.rstrip(b'\r')
+        if tail and not tail.startswith(b'#'):
+            yield tail.rstrip(b'\r')
+
+
+def run_chunk(task: tuple, reducers: typing.Mapping[str, Reducer]) -> dict:
+    """
+    Runs Reducers over one chunk, returning their partial results and the
+    number of Frames & parse errors under the '_frames' & '_errors' keys.
+    """
+    path, start, end = task
+    partials = {name: reducer.initial() for name, reducer in reducers.items()}
+    updates = [(reducer.update, partials[name])
+               for name, reducer in reducers.items()]
+    parse_frame_text = aprs.functions.parse_frame_text
+    frames = errors = 0
+
+    for line in _chunk_lines(path, start, end):
+        try:
+            frame = parse_frame_text(line)
+        except (ValueError, IndexError, UnicodeDecodeError):
+            errors += 1
+            continue
+        frames += 1
+        for update, partial in updates:
+            update(partial, frame)
+
+    partials['_frames'] = frames
+    partials['_errors'] = errors
+    return partials
+
+
+def run(paths: typing.Iterable[str], reducers: typing.Mapping[str, Reducer],
+        processes: int=None,
+        chunk_size: int=ANALYTICS_CHUNK_SIZE) -> dict:
+    """
+    Runs Reducers over every Frame in `paths` in a pool of processes.
+
+    :param paths: Archive file paths.
+    :param reducers: Mapping of result name to `Reducer`.
+    :param processes: Number of worker processes, defaults to the CPU count.
+                      With 1, runs in this process.
+    :param chunk_size: Approximate size of plain-text archive chunks.
+
+    :returns: Mapping of result name to Reducer result, plus the total
+              number of Frames & parse errors under '_frames' & '_errors'.
+    :rtype: dict
+
+    :raises ValueError: If a Reducer is named '_frames' or '_errors'.
+    """
+    reserved = sorted(set(reducers) & set(ANALYTICS_TOTALS))
+    if reserved:
+        raise ValueError('Reducer names %s are reserved for the totals.' %
+                         ', '.join(reserved))
+
+    tasks = []
+    for path in paths:
+        tasks.extend(split_file(path, chunk_size))
+    _logger.debug('Running %d reducers over %d chunks.',
+                  len(reducers), len(tasks))
+
+    merged = {name: reducer.initial() for name, reducer in reducers.items()}
+    merged['_frames'] = merged['_errors'] = 0
+
+    if processes == 1:
+        partials = (run_chunk(task, reducers) for task in tasks)
+        return _merge(merged, partials, reducers)
+
+    with concurrent.futures.ProcessPoolExecutor(processes) as executor:
+        partials = executor.map(
+            run_chunk, tasks, [reducers] * len(tasks))
+        return _merge(merged, partials, reducers)
+
+
+def _merge(merged: dict, partials: typing.Iterable[dict],
+           reducers: typing.Mapping[str, Reducer]) -> dict:
+    for partial in partials:
+        merged['_frames'] += partial['_frames']
+        merged['_errors'] += partial['_errors']
+        for name, reducer in reducers.items():
+            merged[name] = reducer.merge(merged[name], partial[name])
+
+    results = {name: reducer.result(merged[name])
+               for name, reducer in reducers.items()}
+    results['_frames'] = merged['_frames']
+    results['_errors'] = merged['_errors']
+    return results
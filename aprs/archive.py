@@ -0,0 +1,177 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Python APRS Module Archive Reader Definitions.
+
+Streams plain, gzip or zstd compressed archives of APRS-IS text lines, as
+written from `aprs.TCP.receive`, in constant memory.
+
+zstd support requires the optional `zstandard` package.
+"""
+
+import gzip
+import io
+import logging
+import time
+import typing
+
+import aprs  # pylint: disable=R0801
+
+__author__ = 'Greg Albrecht W2GMD <oss@undef.net>'  # NOQA pylint: disable=R0801
+__copyright__ = 'Copyright 2017 Greg Albrecht and Contributors'  # NOQA pylint: disable=R0801
+__license__ = 'Apache License, Version 2.0'  # NOQA pylint: disable=R0801
+
+
+ARCHIVE_BLOCK_SIZE = 1 << 20
+
+GZIP_MAGIC = b'\x1f\x8b'
+ZSTD_MAGIC = b'\x28\xb5\x2f\xfd'
+
+
+def open_archive(path: str) -> typing.BinaryIO:
+    """
+    Opens an archive for reading decompressed bytes, detecting gzip or zstd
+    compression from the file's magic number.
+    """
+    with open(path, 'rb') as raw_file:
+        magic = raw_file.read(4)
+
+    if magic.startswith(GZIP_MAGIC):
+        return gzip.open(path, 'rb')
+    elif magic == ZSTD_MAGIC:
+        try:
+            import zstandard  # pylint: disable=C0415
+        except ImportError:
+            raise ImportError(
+                'Reading zstd archives requires the zstandard package.')
+        return zstandard.ZstdDecompressor().stream_reader(
+            open(path, 'rb'), closefd=True)
+    return open(path, 'rb')
+
+
+class ArchiveReader(object):
+
+    """
+    Archive Reader Class.
+
+    Decompresses an archive in large blocks, splitting each block into lines
+    in one pass, and yields lines or `aprs.Frame`s from generators. Server
+    comment lines starting with '#' are skipped, as in `aprs.TCP.receive`.
+
+    `offset` is the decompressed byte offset just past the last line
+    yielded, and can be passed back in to resume reading from that line.
+    """
+
+    _logger = logging.getLogger(__name__)  # pylint: disable=R0801
+    if not _logger.handlers:  # pylint: disable=R0801
+        _logger.setLevel(aprs.LOG_LEVEL)  # pylint: disable=R0801
+        _console_handler = logging.StreamHandler()  # pylint: disable=R0801
+        _console_handler.setLevel(aprs.LOG_LEVEL)  # pylint: disable=R0801
+        _console_handler.setFormatter(aprs.LOG_FORMAT)  # pylint: disable=R0801
+        _logger.addHandler(_console_handler)  # pylint: disable=R0801
+        _logger.propagate = False  # pylint: disable=R0801
+
+    def __init__(self, path: str, offset: int=0,
+                 block_size: int=ARCHIVE_BLOCK_SIZE) -> None:
+        self.path = path
+        self.offset = offset
+        self.block_size = block_size
+
+        self.bytes_read = 0
+        self.lines = 0
+        self.comments = 0
+        self.errors = 0
+        self.elapsed = 0.0
+
+    def __iter__(self) -> typing.Iterator[bytes]:
+        return self.read_lines()
+
+    def _skip(self, archive: typing.BinaryIO) -> None:
+        """Positions the archive at `offset`."""
+        if not self.offset:
+            return
+        if isinstance(archive, io.BufferedReader):
+            archive.seek(self.offset)
+            return
+        # Compressed streams can only be skipped by decompressing.
+        remaining = self.offset
+        while remaining > 0:
+            skipped = len(archive.read(min(remaining, self.block_size)))
+            if not skipped:
+                break
+            remaining -= skipped
+
+    def read_lines(self) -> typing.Iterator[bytes]:
+        """
+        Yields each non-comment line of the archive, without line endings.
+        """
+        start_time = time.perf_counter()
+        block_size = self.block_size
+        tail = b''
+
+        with open_archive(self.path) as archive:
+            self._skip(archive)
+            offset = self.offset
+            while True:
+                block = archive.read(block_size)
+                if not block:
+                    break
+                self.bytes_read += len(block)
+
+                lines = block.split(b'\n')
+                if tail:
+                    lines[0] = tail + lines[0]
+                tail = lines.pop()
+
+                for line in lines:
+                    offset += len(line) + 1
+                    if line.startswith(b'#'):
+                        self.comments += 1
+                        continue
+                    if line.endswith(b'\r'):
+                        line = line[:-1]
+                    if not line:
+                        continue
+                    self.lines += 1
+                    self.offset = offset
+                    yield line
+
+                self.elapsed = time.perf_counter() - start_time
+
+            if tail.startswith(b'#'):
+                self.comments += 1
+            elif tail.rstrip(b'\r'):
+                self.lines += 1
+                self.offset = offset + len(tail)
+                yield tail.rstrip(b'\r')
+
+        self.elapsed = time.perf_counter() - start_time
+
+    def read_frames(self) -> typing.Iterator:
+        """
+        Yields each line of the archive parsed as an `aprs.Frame`. Lines
+        that fail to parse are counted in `errors` and skipped.
+        """
+        parse_frame_text = aprs.functions.parse_frame_text
+        for line in self.read_lines():
+            try:
+                yield parse_frame_text(line)
+            except (ValueError, IndexError, UnicodeDecodeError) as ex:
+                self.errors += 1
+                self._logger.debug('Unparsable line="%s": %s', line, ex)
+
+    def throughput(self) -> dict:
+        """
+        Returns read statistics, including decompressed MB/s & lines/s.
+        """
+        elapsed = self.elapsed or float('nan')
+        return {
+            'bytes': self.bytes_read,
+            'lines': self.lines,
+            'comments': self.comments,
+            'errors': self.errors,
+            'elapsed': self.elapsed,
+            'mb_per_sec': self.bytes_read / elapsed / 1e6,
+            'lines_per_sec': self.lines / elapsed,
+        }
@@ -0,0 +1,90 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Python APRS Module Bulk Parsing Definitions.
+
+Parses batches of raw Frames from dirty feeds or archives without raising,
+keeping the rejects & counting Frames by error::
+
+    parser = aprs.BulkParser()
+    for frame in parser.parse(open('aprsis.log', 'rb')):
+        ...
+    parser.counts  # {'ok': 99120, 'no_info': 840, 'bad_path': 40}
+    parser.rejects[0]  # (b'W2GMD>APRS', 'no_info', 10)
+"""
+
+import collections
+import typing
+
+import aprs  # pylint: disable=R0801
+
+__author__ = 'Greg Albrecht W2GMD <oss@undef.net>'  # NOQA pylint: disable=R0801
+__copyright__ = 'Copyright 2017 Greg Albrecht and Contributors'  # NOQA pylint: disable=R0801
+__license__ = 'Apache License, Version 2.0'  # NOQA pylint: disable=R0801
+
+
+class BulkParser(object):
+
+    """
+    Bulk Parser Class.
+
+    Parses Frames with `aprs.functions.try_parse_frame`, yielding the good
+    Frames and keeping the last `max_rejects` rejects as
+    (raw_frame, error name, offset). Text Frames with empty Callsigns or
+    with ':' before '>' are rejected, though `aprs.parse_frame` returns
+    them garbled, so `counts['ok']` may be lower than the number of Frames
+    `aprs.parse_frame` returns from the same feed.
+
+    :param max_rejects: Number of rejects kept, or None to keep all.
+    :param strip: Strip whitespace, eg line endings, from each raw text
+                  Frame.
+    """
+
+    __slots__ = ['rejects', 'strip', '_counts']
+
+    def __init__(self, max_rejects: int=1000, strip: bool=True) -> None:
+        self.rejects = collections.deque(maxlen=max_rejects)
+        self.strip = strip
+        self._counts = [0] * len(aprs.PARSE_ERRORS)
+
+    def __repr__(self) -> str:
+        return '<BulkParser ok=%d rejected=%d>' % (
+            self._counts[aprs.PARSE_OK], self.rejected)
+
+    def parse(self, raw_frames: typing.Iterable[bytes]
+              ) -> typing.Iterator['aprs.Frame']:
+        """Yields the Frames parsed from `raw_frames`, skipping rejects."""
+        try_parse_frame = aprs.functions.try_parse_frame
+        counts = self._counts
+        rejects = self.rejects
+        strip = self.strip
+        for raw_frame in raw_frames:
+            if strip:
+                if isinstance(raw_frame, memoryview):
+                    raw_frame = raw_frame.tobytes()
+                if isinstance(raw_frame, (bytes, bytearray, str)):
+                    raw_frame = raw_frame.strip()
+            frame, error, offset = try_parse_frame(raw_frame)
+            counts[error] += 1
+            if error:
+                rejects.append(
+                    (raw_frame, aprs.PARSE_ERRORS[error], offset))
+            else:
+                yield frame
+
+    @property
+    def counts(self) -> typing.Dict[str, int]:
+        """The number of Frames parsed & rejected, by error name."""
+        return {aprs.PARSE_ERRORS[error]: count
+                for error, count in enumerate(self._counts) if count}
+
+    @property
+    def rejected(self) -> int:
+        """The number of Frames rejected."""
+        return sum(self._counts) - self._counts[aprs.PARSE_OK]
+
+    def reset(self) -> None:
+        """Clears the rejects & counts."""
+        self.rejects.clear()
+        self._counts = [0] * len(aprs.PARSE_ERRORS)
@@ -0,0 +1,439 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Python APRS Module Frame Capture Definitions.
+
+An append-only binary Frame capture format, with a side index of record
+offsets by time bucket & source callsign.
+
+Capture file layout (little-endian)::
+
+    Header:  magic (8s)
+    Records: timestamp (d) | interface (H) | length (I) | frame (bytes)
+
+Index file (`<capture>.idx`) layout::
+
+    Header:  magic (8s) | indexed length (Q) | bucket seconds (d)
+             | bucket count (Q) | source count (Q)
+    Buckets: bucket (q) | count (Q) | offsets (Q * count)
+    Sources: key length (H) | key | count (Q) | offsets (Q * count)
+
+The index is a cache: records appended after it was written (eg, after a
+crash) are indexed by scanning the tail of the capture when it is opened.
+"""
+
+import array
+import logging
+import math
+import mmap
+import os
+import struct
+import sys
+import tempfile
+import time
+import typing
+
+import aprs  # pylint: disable=R0801
+
+__author__ = 'Greg Albrecht W2GMD <oss@undef.net>'  # NOQA pylint: disable=R0801
+__copyright__ = 'Copyright 2017 Greg Albrecht and Contributors'  # NOQA pylint: disable=R0801
+__license__ = 'Apache License, Version 2.0'  # NOQA pylint: disable=R0801
+
+
+CAPTURE_MAGIC = b'APRSCAP\x01'
+INDEX_MAGIC = b'APRSCIX\x01'
+DEFAULT_BUCKET_SECONDS = 3600.0
+
+_RECORD = struct.Struct('<dHI')
+_INDEX_HEADER = struct.Struct('<8sQdQQ')
+_BUCKET = struct.Struct('<qQ')
+_KEY = struct.Struct('<H')
+_COUNT = struct.Struct('<Q')
+
+
+def _callsign_key(callsign) -> bytes:
+    """Returns the index key for a Callsign, as in `bytes(aprs.Callsign)`."""
+    if isinstance(callsign, aprs.Callsign):
+        return bytes(callsign)
+    if isinstance(callsign, str):
+        callsign = bytes(callsign, 'UTF-8')
+    return bytes(aprs.functions.parse_callsign_text(callsign))
+
+
+def frame_source(data: bytes) -> bytes:
+    """
+    Extracts the Source Callsign from a raw plain-text or AX.25 Frame
+    without parsing the rest of the Frame.
+
+    >>> frame_source(b'W2GMD-6>APRS,WIDE1-1:>test')
+    b'W2GMD-6'
+    """
+    delim = data.find(b'>')
+    if delim > 0 and aprs.ADDR_INFO_DELIM not in data[:delim]:
+        return bytes(aprs.functions.parse_callsign_text(bytes(data[:delim])))
+    try:
+        addresses = bytes(data).strip(aprs.AX25_FLAG)
+        return bytes(aprs.parse_callsign_ax25(addresses[7:14]))
+    except (IndexError, aprs.BadCallsignError):
+        return b''
+
+
+def _le_array(data) -> array.array:
+    column = array.array('Q')
+    column.frombytes(data)
+    if sys.byteorder == 'big':  # pragma: no cover
+        column.byteswap()
+    return column
+
+
+def _le_bytes(column: array.array) -> bytes:
+    if sys.byteorder == 'big':  # pragma: no cover
+        column = array.array('Q', column)
+        column.byteswap()
+    return column.tobytes()
+
+
+class CaptureIndex(object):
+
+    """
+    Capture Index Class.
+
+    Record offsets by time bucket & by source callsign, in ascending offset
+    order.
+    """
+
+    __slots__ = ['bucket_seconds', 'length', 'buckets', 'sources']
+
+    def __init__(self, bucket_seconds: float=DEFAULT_BUCKET_SECONDS) -> None:
+        self.bucket_seconds = bucket_seconds
+        # Length of the capture covered by this index.
+        self.length = len(CAPTURE_MAGIC)
+        self.buckets: typing.Dict[int, array.array] = {}
+        self.sources: typing.Dict[bytes, array.array] = {}
+
+    def add(self, offset: int, timestamp: float, source: bytes) -> None:
+        """Indexes a record."""
+        bucket = int(timestamp // self.bucket_seconds)
+        offsets = self.buckets.get(bucket)
+        if offsets is None:
+            offsets = self.buckets[bucket] = array.array('Q')
+        offsets.append(offset)
+
+        offsets = self.sources.get(source)
+        if offsets is None:
+            offsets = self.sources[source] = array.array('Q')
+        offsets.append(offset)
+
+    def scan(self, view) -> None:
+        """
+        Indexes every complete record in `view` past `length`.
+        """
+        offset = self.length
+        end = len(view)
+        while offset + _RECORD.size <= end:
+            timestamp, _, size = _RECORD.unpack_from(view, offset)
+            start = offset + _RECORD.size
+            if start + size > end:
+                # Partially written record.
+                break
+            self.add(
+                offset, timestamp, frame_source(view[start:start + size]))
+            offset = start + size
+        self.length = offset
+
+    def save(self, path: str) -> None:
+        """Atomically writes this index to `path`."""
+        chunks = [_INDEX_HEADER.pack(
+            INDEX_MAGIC, self.length, self.bucket_seconds,
+            len(self.buckets), len(self.sources))]
+        for bucket, offsets in self.buckets.items():
+            chunks.append(_BUCKET.pack(bucket, len(offsets)))
+            chunks.append(_le_bytes(offsets))
+        for source, offsets in self.sources.items():
+            chunks.append(_KEY.pack(len(source)))
+            chunks.append(source)
+            chunks.append(_COUNT.pack(len(offsets)))
+            chunks.append(_le_bytes(offsets))
+
+        fd, tmp_path = tempfile.mkstemp(
+            prefix='.capture-idx-', dir=os.path.dirname(os.path.abspath(path)))
+        try:
+            with os.fdopen(fd, 'wb') as tmp_file:
+                tmp_file.write(b''.join(chunks))
+            os.replace(tmp_path, path)
+        except BaseException:
+            os.unlink(tmp_path)
+            raise
+
+    @classmethod
+    def load(cls, path: str, capture_length: int):
+        """
+        Reads an index from `path`, or returns None if it is missing,
+        invalid or covers more than `capture_length` bytes.
+        """
+        try:
+            with open(path, 'rb') as idx_file:
+                data = idx_file.read()
+        except OSError:
+            return None
+
+        try:
+            (magic, length, bucket_seconds, n_buckets,
+             n_sources) = _INDEX_HEADER.unpack_from(data, 0)
+            if magic != INDEX_MAGIC or length > capture_length:
+                return None
+
+            index = cls(bucket_seconds)
+            index.length = length
+            view = memoryview(data)
+            offset = _INDEX_HEADER.size
+            for _ in range(n_buckets):
+                bucket, count = _BUCKET.unpack_from(data, offset)
+                offset += _BUCKET.size
+                index.buckets[bucket] = _le_array(
+                    view[offset:offset + count * 8])
+                offset += count * 8
+            for _ in range(n_sources):
+                key_len, = _KEY.unpack_from(data, offset)
+                offset += _KEY.size
+                source = data[offset:offset + key_len]
+                offset += key_len
+                count, = _COUNT.unpack_from(data, offset)
+                offset += _COUNT.size
+                index.sources[source] = _le_array(
+                    view[offset:offset + count * 8])
+                offset += count * 8
+        except struct.error:
+            return None
+        return index
+
+
+class CaptureRecord(object):
+
+    """
+    Capture Record Class.
+
+    A captured Frame, its receive timestamp and the ID of the Interface it
+    was received on. The Frame is only parsed when `frame` is called.
+    """
+
+    __slots__ = ['offset', 'timestamp', 'interface', 'data']
+
+    def __init__(self, offset: int, timestamp: float, interface: int,
+                 data: bytes) -> None:
+        self.offset = offset
+        self.timestamp = timestamp
+        self.interface = interface
+        self.data = data
+
+    def __repr__(self) -> str:
+        return 'CaptureRecord(%r, %r, %r)' % (
+            self.timestamp, self.interface, self.data)
+
+    def frame(self):
+        """Parses the captured Frame into an `aprs.Frame`."""
+        return aprs.parse_frame(self.data)
+
+
+class CaptureWriter(object):
+
+    """
+    Capture Writer Class.
+
+    Appends Frames to a capture file, maintaining its index. The index file
+    is rewritten on `flush()` & `close()`.
+    """
+
+    _logger = logging.getLogger(__name__)  # pylint: disable=R0801
+    if not _logger.handlers:  # pylint: disable=R0801
+        _logger.setLevel(aprs.LOG_LEVEL)  # pylint: disable=R0801
+        _console_handler = logging.StreamHandler()  # pylint: disable=R0801
+        _console_handler.setLevel(aprs.LOG_LEVEL)  # pylint: disable=R0801
+        _console_handler.setFormatter(aprs.LOG_FORMAT)  # pylint: disable=R0801
+        _logger.addHandler(_console_handler)  # pylint: disable=R0801
+        _logger.propagate = False  # pylint: disable=R0801
+
+    def __init__(self, path: str,
+                 bucket_seconds: float=DEFAULT_BUCKET_SECONDS) -> None:
+        self.path = path
+        self.index_path = path + '.idx'
+
+        self._file = open(path, 'ab+')
+        self._file.seek(0, os.SEEK_END)
+        length = self._file.tell()
+        if length == 0:
+            self._file.write(CAPTURE_MAGIC)
+            self.index = CaptureIndex(bucket_seconds)
+        else:
+            self.index = _open_index(self._file, self.index_path, length,
+                                     bucket_seconds)
+            if self.index.length != length:
+                # Drop any partially written record from a crash.
+                self._logger.warning(
+                    'Truncating partial record in capture=%s at offset=%d',
+                    path, self.index.length)
+                self._file.truncate(self.index.length)
+                self._file.seek(0, os.SEEK_END)
+        self._offset = self._file.tell()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args) -> None:
+        self.close()
+
+    def write(self, frame, timestamp: float=None, interface: int=0) -> int:
+        """
+        Appends a Frame to the capture.
+
+        :param frame: `aprs.Frame`, or raw Frame bytes.
+        :param timestamp: Receive time as a UNIX timestamp. Defaults to now.
+        :param interface: Interface ID, 0-65535.
+
+        :returns: Offset of the record.
+        :rtype: int
+        """
+        if timestamp is None:
+            timestamp = time.time()
+        if isinstance(frame, aprs.Frame):
+            source = bytes(frame.source)
+            data = bytes(frame)
+        else:
+            data = bytes(frame)
+            source = frame_source(data)
+
+        offset = self._offset
+        self._file.write(_RECORD.pack(timestamp, interface, len(data)))
+        self._file.write(data)
+        self._offset += _RECORD.size + len(data)
+        self.index.add(offset, timestamp, source)
+        self.index.length = self._offset
+        return offset
+
+    def flush(self) -> None:
+        """Flushes records to disk and rewrites the index."""
+        self._file.flush()
+        os.fsync(self._file.fileno())
+        self.index.save(self.index_path)
+
+    def close(self) -> None:
+        """Flushes and closes the capture."""
+        if not self._file.closed:
+            self.flush()
+            self._file.close()
+
+
+def _open_index(cap_file, index_path: str, length: int,
+                bucket_seconds: float) -> CaptureIndex:
+    """
+    Loads the index of a capture, scanning any records it does not cover.
+    """
+    cap_file.seek(0)
+    if cap_file.read(len(CAPTURE_MAGIC)) != CAPTURE_MAGIC:
+        raise ValueError('Not an APRS capture file: %s' % cap_file.name)
+
+    index = CaptureIndex.load(index_path, length)
+    if index is None:
+        index = CaptureIndex(bucket_seconds)
+    if index.length < length:
+        with mmap.mmap(cap_file.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            index.scan(mm)
+    return index
+
+
+class CaptureReader(object):
+
+    """
+    Capture Reader Class.
+
+    Memory-maps a capture file and returns its records lazily, using the
+    index to find records by time or source callsign.
+    """
+
+    def __init__(self, path: str) -> None:
+        self.path = path
+        self._file = open(path, 'rb')
+        length = os.fstat(self._file.fileno()).st_size
+        self.index = _open_index(self._file, path + '.idx', length,
+                                 DEFAULT_BUCKET_SECONDS)
+        self._mmap = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args) -> None:
+        self.close()
+
+    def __len__(self) -> int:
+        return sum(len(offsets) for offsets in self.index.buckets.values())
+
+    def __iter__(self) -> typing.Iterator[CaptureRecord]:
+        """Yields every record, in capture order."""
+        offset = len(CAPTURE_MAGIC)
+        while offset < self.index.length:
+            record = self.record(offset)
+            offset += _RECORD.size + len(record.data)
+            yield record
+
+    def close(self) -> None:
+        """Closes the capture."""
+        self._mmap.close()
+        self._file.close()
+
+    def record(self, offset: int) -> CaptureRecord:
+        """Returns the record at `offset`."""
+        timestamp, interface, size = _RECORD.unpack_from(self._mmap, offset)
+        start = offset + _RECORD.size
+        return CaptureRecord(
+            offset, timestamp, interface, self._mmap[start:start + size])
+
+    def _records(self, offsets: typing.Iterable[int], start: float=None,
+                 end: float=None) -> typing.Iterator[CaptureRecord]:
+        for offset in offsets:
+            record = self.record(offset)
+            if start is not None and record.timestamp < start:
+                continue
+            if end is not None and record.timestamp >= end:
+                continue
+            yield record
+
+    def between(self, start: float=None,
+                end: float=None) -> typing.Iterator[CaptureRecord]:
+        """
+        Yields the records received in [start, end), in capture order.
+        Either bound may be None (or infinite) to leave it open.
+        """
+        bucket_seconds = self.index.bucket_seconds
+        buckets = self.index.buckets
+        if not buckets:
+            return iter(())
+        if start is not None and math.isfinite(start):
+            first = int(start // bucket_seconds)
+        else:
+            first = min(buckets)
+        if end is not None and math.isfinite(end):
+            last = int(end // bucket_seconds)
+        else:
+            last = max(buckets)
+        if last - first + 1 > len(buckets):
+            keys = [b for b in buckets if first <= b <= last]
+        else:
+            keys = [b for b in range(first, last + 1) if b in buckets]
+
+        offsets = array.array('Q')
+        for bucket in keys:
+            offsets.extend(buckets[bucket])
+        return self._records(sorted(offsets), start, end)
+
+    def by_source(self, callsign, start: float=None,
+                  end: float=None) -> typing.Iterator[CaptureRecord]:
+        """
+        Yields the records from a Source Callsign, optionally limited to
+        those received in [start, end), in capture order.
+
+        :param callsign: Source Callsign, as `str`, `bytes` or
+                         `aprs.Callsign`.
+        """
+        offsets = self.index.sources.get(_callsign_key(callsign), ())
+        return self._records(offsets, start, end)
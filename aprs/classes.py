@@ -3,15 +3,13 @@
 
 """Python APRS Module Class Definitions."""
 
+import functools
 import itertools
 import logging
 import socket
 import time
 import typing
 
-import pkg_resources
-import requests
-
 import aprs  # pylint: disable=R0801
 
 __author__ = 'Greg Albrecht W2GMD <oss@undef.net>'  # NOQA pylint: disable=R0801
@@ -19,15 +17,28 @@ __copyright__ = 'Copyright 2017 Greg Albrecht and Contributors'  # NOQA pylint:
 __license__ = 'Apache License, Version 2.0'  # NOQA pylint: disable=R0801
 
 
+# Shifts each Callsign character left one bit, for AX.25 address fields.
+_AX25_SHIFT_TABLE = bytes((char << 1) & 0xFF for char in range(256))
+
+
 class Frame(object):
 
     """
     Frame Class.
 
     Defines the components of an AX.25/APRS Frame.
+
+    The AX.25 encoding is cached, and re-encoded whenever the encodings of
+    its Callsigns or Information Field change, including when a Callsign in
+    `path` is changed in place (eg by `set_digi`).
+
+    Frames received by an Interface carry their receive time as
+    `received_ns` (`time.monotonic_ns`) and, if the Interface's
+    `wall_clock` is set, as `received_at` (`time.time`).
     """
 
-    __slots__ = ['source', 'destination', 'path', 'info']
+    __slots__ = ['source', 'destination', 'path', 'info', '_ax25_key', '_ax25',
+                 'received_ns', 'received_at']
 
     _logger = logging.getLogger(__name__)  # pylint: disable=R0801
     if not _logger.handlers:  # pylint: disable=R0801
@@ -45,6 +56,10 @@ class Frame(object):
         # TODO: Add parse_path function
         self.path = path
         self.info = aprs.parse_info_field(info)
+        self._ax25_key: list = None
+        self._ax25: bytes = None
+        self.received_ns: int = None
+        self.received_at: float = None
 
     def __repr__(self) -> str:
         """
@@ -69,6 +84,15 @@ class Frame(object):
         )
         return frame
 
+    def age(self) -> float:
+        """
+        Returns the seconds since this Frame was received, or None if it
+        wasn't received by an Interface.
+        """
+        if self.received_ns is None:
+            return None
+        return (time.monotonic_ns() - self.received_ns) / 1e9
+
     def set_source(self, source: typing.Union[str, bytes]) -> None:
         self.source = aprs.parse_callsign(source)
 
@@ -84,6 +108,7 @@ class Frame(object):
     def set_info(self, info: typing.Union[str, bytes]) -> None:
         self.info = aprs.parse_info_field(info)
 
+    @aprs.profiling.profiled
     def encode_ax25(self) -> bytes:
         """
         Encodes an APRS Frame as AX.25.
@@ -97,6 +122,12 @@ class Frame(object):
         encoded_frame.append(aprs.ADDR_INFO_DELIM)
         encoded_frame.append(bytes(self.info))
 
+        # Callsigns cache their own encodings, so this only re-encodes (and
+        # re-computes the FCS) if a Callsign or the Information Field changed.
+        if self._ax25 is not None and encoded_frame == self._ax25_key:
+            return self._ax25
+        self._ax25_key = encoded_frame[:]
+
         fcs = aprs.FCS()
         for bit in encoded_frame:
             fcs.update_bit(bit)
@@ -104,15 +135,21 @@ class Frame(object):
         encoded_frame.append(fcs.digest())
         encoded_frame.append(aprs.AX25_FLAG)
 
-        return b''.join(encoded_frame)
+        self._ax25 = b''.join(encoded_frame)
+        return self._ax25
 
 
+@functools.total_ordering
 class Callsign(object):
 
     """
     Callsign Class.
 
     Defines parts of an APRS AX.25 Callsign.
+
+    Callsigns compare & hash by their `packed` int where possible, and cache
+    their text & AX.25 encodings, so change them with the `set_*` methods
+    rather than by assigning attributes.
     """
 
     _logger = logging.getLogger(__name__)  # pylint: disable=R0801
@@ -124,15 +161,39 @@ class Callsign(object):
         _logger.addHandler(_console_handler)  # pylint: disable=R0801
         _logger.propagate = False  # pylint: disable=R0801
 
-    __slots__ = ['callsign', 'ssid', 'digi']
+    __slots__ = ['callsign', 'ssid', 'digi', '_packed', '_text', '_bytes',
+                 '_ax25']
 
     def __init__(self, callsign: bytes=b'', ssid: bytes=b'0',
                  digi: bool=False) -> None:
         self.callsign: bytes = callsign
         self.ssid: bytes = ssid
         self.digi: bool = digi
+        self._packed: int = None
+        self._text: str = None
+        self._bytes: bytes = None
+        self._ax25: bytes = None
+
+    def __eq__(self, other) -> bool:
+        if not isinstance(other, Callsign):
+            return NotImplemented
+        return self._key() == other._key()
+
+    def __lt__(self, other) -> bool:
+        if not isinstance(other, Callsign):
+            return NotImplemented
+        packed = self.packed
+        other_packed = other.packed
+        if packed is not None and other_packed is not None:
+            return packed < other_packed
+        return self._sort_key() < other._sort_key()
+
+    def __hash__(self) -> int:
+        return hash(self._key())
 
     def __repr__(self) -> str:
+        if self._text is not None:
+            return self._text
         _callsign = self.callsign.decode()
         _ssid = self.ssid.decode()
         call_repr = _callsign
@@ -148,11 +209,13 @@ class Callsign(object):
 
         # If callsign was digipeated, append '*'.
         if self.digi:
-            return ''.join([call_repr, '*'])
-        else:
-            return call_repr
+            call_repr = ''.join([call_repr, '*'])
+        self._text = call_repr
+        return call_repr
 
     def __bytes__(self) -> bytes:
+        if self._bytes is not None:
+            return self._bytes
         _callsign = self.callsign
         _ssid = self.ssid
         call_repr = _callsign
@@ -168,45 +231,105 @@ class Callsign(object):
 
         # If callsign was digipeated, append '*'.
         if self.digi:
-            return b''.join([call_repr, b'*'])
-        else:
-            return call_repr
+            call_repr = b''.join([call_repr, b'*'])
+        self._bytes = call_repr
+        return call_repr
+
+    @property
+    def packed(self) -> typing.Optional[int]:
+        """
+        This Callsign packed by `aprs.functions.pack_callsign`, or None if it
+        can't be packed (eg, APRS-IS Callsigns longer than 6 characters or
+        with lowercase characters).
+        """
+        if self._packed is None:
+            try:
+                self._packed = aprs.functions.pack_callsign(
+                    self.callsign, int(self.ssid or 0), self.digi)
+            except ValueError:
+                self._packed = -1
+        if self._packed < 0:
+            return None
+        return self._packed
+
+    def _key(self) -> typing.Union[int, tuple]:
+        """Returns the equality & hash key of this Callsign."""
+        packed = self.packed
+        if packed is not None:
+            return packed
+        return (self.callsign, self.ssid.lstrip(b'0'), self.digi)
+
+    def _sort_key(self) -> tuple:
+        """Returns a sort key ordering Callsigns as their packed ints do."""
+        try:
+            ssid = (0, int(self.ssid or 0), b'')
+        except ValueError:
+            ssid = (1, 0, self.ssid)
+        return (self.callsign, ssid, self.digi)
+
+    def _invalidate(self) -> None:
+        """Clears the cached packed form & encodings of this Callsign."""
+        self._packed = None
+        self._text = None
+        self._bytes = None
+        self._ax25 = None
 
     def set_callsign(self, callsign: bytes) -> None:
         self.callsign = callsign
+        self._invalidate()
 
     def set_ssid(self, ssid: bytes=b'0') -> None:
         if isinstance(ssid, bytes):
             self.ssid = ssid
         else:
             self.ssid = bytes(str(ssid), 'UTF-8')
+        self._invalidate()
 
     def set_digi(self, digi: bool) -> None:
         self.digi = digi
+        self._invalidate()
 
+    @aprs.profiling.profiled
     def encode_ax25(self) -> bytearray:
         """
         Encodes Callsign as AX.25.
         """
-        _callsign = self.callsign
-        encoded_callsign = []
+        if self._ax25 is not None:
+            return self._ax25
 
         encoded_ssid = (int(self.ssid) << 1) | 0x60
 
         if self.digi:
-            # _callsign = ''.join([_callsign, '*'])
             encoded_ssid |= 0x80
 
-        # Pad the callsign to at least 6 characters.
-        while len(_callsign) < 6:
-            _callsign += b' '
-
-        for pos in _callsign:
-            encoded_callsign.append(bytes([pos << 1]))
+        # Pad the callsign to at least 6 characters, and shift each left.
+        self._ax25 = b''.join([
+            self.callsign.ljust(6).translate(_AX25_SHIFT_TABLE),
+            bytes([encoded_ssid])
+        ])
+        return self._ax25
 
-        encoded_callsign.append(bytes([encoded_ssid]))
 
-        return b''.join(encoded_callsign)
+@functools.lru_cache(maxsize=None)
+def _version() -> bytes:
+    """
+    Returns the installed version of this module, read once, with
+    importlib.metadata, or pkg_resources before Python 3.8.
+    """
+    try:
+        import importlib.metadata  # pylint: disable=C0415
+    except ImportError:
+        import pkg_resources  # pylint: disable=C0415
+        try:
+            version = pkg_resources.get_distribution('aprs').version  # NOQA pylint: disable=E1101
+        except pkg_resources.DistributionNotFound:  # NOQA pylint: disable=E1101
+            return b'GIT'
+    else:
+        try:
+            version = importlib.metadata.version('aprs')
+        except importlib.metadata.PackageNotFoundError:
+            return b'GIT'
+    return bytes(version, 'UTF-8')
 
 
 class APRS(object):
@@ -229,12 +352,7 @@ class APRS(object):
             password = bytes(password, 'UTF-8')
         self.user = user
 
-        try:
-            version = bytes(pkg_resources.get_distribution(  # NOQA pylint: disable=E1101
-                'aprs').version, 'UTF-8')
-        except:  # pylint: disable=W0702
-            version = b'GIT'
-        version_str = b'Python APRS Module v' + version
+        version_str = b'Python APRS Module v' + _version()
 
         self._auth = b' '.join(
             [b'user', user, b'pass', password, b'vers', version_str])
@@ -242,6 +360,11 @@ class APRS(object):
         self._full_auth = None
         self.interface = None
         self.use_i_construct = False
+        self.metrics = aprs.metrics.InterfaceMetrics(
+            self.__class__.__name__.lower())
+        self.tracer = None
+        self.wall_clock = False
+        self.tap = None
 
     def start(self):
         """
@@ -280,6 +403,7 @@ class TCP(APRS):
         self.servers = itertools.cycle(servers)
         self.use_i_construct = True
         self._connected = False
+        self._connect_attempts = 0
 
     def start(self):
         """
@@ -294,6 +418,10 @@ class TCP(APRS):
                 server = servers
                 port = aprs.APRSIS_FILTER_PORT
 
+            if self._connect_attempts:
+                self.metrics.reconnects.inc()
+            self._connect_attempts += 1
+
             try:
                 addr_info = socket.getaddrinfo(server, port)
 
@@ -342,12 +470,19 @@ class TCP(APRS):
         # Unicode Sandwich: Send bytes.
         _frame = bytes(frame + b'\n\r')
 
-        return self.interface.send(_frame)
+        sent = self.interface.send(_frame)
+        self.metrics.frames_sent.inc()
+        self.metrics.bytes_sent.inc(sent)
+        return sent
 
+    @aprs.profiling.profiled
     def receive(self, callback=None, frame_handler=aprs.parse_frame):
         """
         Receives from APRS-IS.
 
+        Frames are stamped with their receive time (see `aprs.Frame`), and
+        traced through `tracer` if one is set (see `aprs.tracing`).
+
         :param callback: Optional callback to deliver frame to.
         :type callback: func
 
@@ -358,20 +493,31 @@ class TCP(APRS):
             'Receive started with callback="%s" and frame_handler="%s"',
             callback, frame_handler)
 
+        metrics = self.metrics
+        tracer = self.tracer
+        tap = self.tap
+        wall_clock = self.wall_clock
+        monotonic_ns = time.monotonic_ns
+        if callback:
+            callback = metrics.wrap_callback(callback)
+
         # Unicode Sandwich: Receive Bytes.
         recvd_data = bytes()
 
         try:
             while 1:
+                read_ns = monotonic_ns()
                 recv_data = self.interface.recv(aprs.RECV_BUFFER)
+                received_ns = monotonic_ns()
+                received_at = time.time() if wall_clock else None
 
                 if not recv_data:
+                    self._connected = False
                     break
 
+                metrics.bytes_received.inc(len(recv_data))
                 recvd_data += recv_data
 
-                self._logger.debug('recv_data="%s"', recv_data.strip())
-
                 if recvd_data.endswith(b'\r\n'):
                     lines = recvd_data.strip().split(b'\r\n')
                     recvd_data = bytes()
@@ -379,29 +525,68 @@ class TCP(APRS):
                     lines = recvd_data.split(b'\r\n')
                     recvd_data = lines.pop(-1)
 
+                split_ns = monotonic_ns() if tracer else 0
+                metrics.queue_depth.set(len(lines))
                 for line in lines:
                     if line.startswith(b'#'):
                         if b'logresp' in line:
                             self._logger.debug('logresp="%s"', line)
-                        # We log all received data anyway, so no need to log
-                        # it here again:
-                        # else:
-                        #    self._logger.debug('unknown response="%s"', line)
+                        else:
+                            # Server keepalive. We log all received data
+                            # anyway, so no need to log it here again.
+                            metrics.keepalive.set(time.time())
                     else:
-                        self._logger.debug('line="%s"', line)
+                        if tap is not None:
+                            tap.record(line, b'tcp')
                         if callback:
+                            traced = tracer is not None and tracer.sample()
+                            parse_ns = monotonic_ns() if traced else 0
                             if frame_handler:
-                                callback(frame_handler(line))
+                                try:
+                                    frame = frame_handler(line)
+                                except Exception as ex:  # NOQA pylint: disable=W0703
+                                    metrics.parse_error(ex)
+                                    raise
+                                if isinstance(frame, Frame):
+                                    frame.received_ns = received_ns
+                                    frame.received_at = received_at
                             else:
-                                callback(line)
+                                frame = line
+                            if traced:
+                                callback_ns = monotonic_ns()
+                                callback(frame)
+                                _trace(tracer, read_ns, received_ns,
+                                       split_ns, parse_ns, callback_ns,
+                                       monotonic_ns())
+                            else:
+                                callback(frame)
                         else:
+                            metrics.frames_received.inc()
                             self._logger.info('No callback set?')
 
         except socket.error as sock_err:
             self._logger.exception(sock_err)
+            if tap is not None:
+                tap.dump()
+            raise
+        except Exception:
+            if tap is not None:
+                tap.dump()
             raise
 
 
+def _trace(tracer, read_ns: int, received_ns: int, split_ns: int,
+           parse_ns: int, callback_ns: int, done_ns: int) -> None:
+    """Records the receive stages of a traced Frame."""
+    record = tracer.record
+    record('read', received_ns - read_ns)
+    record('split', split_ns - received_ns)
+    record('queue', parse_ns - split_ns)
+    record('parse', callback_ns - parse_ns)
+    record('callback', done_ns - callback_ns)
+    record('total', done_ns - received_ns)
+
+
 class UDP(APRS):
 
     """APRS-IS UDP Class."""
@@ -428,7 +613,10 @@ class UDP(APRS):
         """
         self._logger.info('Sending frame="%s"', frame)
         content = b"\n".join([self._auth, str(frame)])
-        return self.interface.sendto(content, self._addr)
+        sent = self.interface.sendto(content, self._addr)
+        self.metrics.frames_sent.inc()
+        self.metrics.bytes_sent.inc(sent)
+        return sent
 
 
 class HTTP(APRS):
@@ -446,6 +634,7 @@ class HTTP(APRS):
         """
         Connects & logs in to APRS-IS.
         """
+        import requests  # pylint: disable=C0415
         self.interface = requests.post
 
     def send(self, frame: bytes) -> bool:
@@ -462,6 +651,8 @@ class HTTP(APRS):
         self._logger.info('Sending frame="%s"', frame)
         content = b"\n".join([self._auth, frame])
         result = self.interface(self.url, data=content, headers=self.headers)
+        self.metrics.frames_sent.inc()
+        self.metrics.bytes_sent.inc(len(content))
         return result.status_code == 204
 
 
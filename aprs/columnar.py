@@ -0,0 +1,212 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Python APRS Module Columnar Export Definitions.
+
+Exports streams of `aprs.Frame`s as NumPy structured arrays, or as Arrow
+record batches with the optional `pyarrow` package, in fixed-size chunks::
+
+    exporter = aprs.columnar.ColumnExporter()
+    for batch in exporter.arrow_batches(frames, timestamps):
+        writer.write_batch(batch)
+
+Source & Destination are dictionary-encoded as codes into the exporter's
+`callsigns` list, and Paths as codes into its `paths` list. The
+dictionaries grow across chunks, so codes are stable for an exporter.
+Arrow record batches instead carry dictionaries of only the values in the
+batch, so each costs the same however many values have been seen; write
+them with an IPC stream, which allows dictionaries to change per batch.
+"""
+
+import itertools
+import typing
+
+import numpy
+
+import aprs  # pylint: disable=R0801
+import aprs.geo_classes  # pylint: disable=R0801
+
+__author__ = 'Greg Albrecht W2GMD <oss@undef.net>'  # NOQA pylint: disable=R0801
+__copyright__ = 'Copyright 2017 Greg Albrecht and Contributors'  # NOQA pylint: disable=R0801
+__license__ = 'Apache License, Version 2.0'  # NOQA pylint: disable=R0801
+
+
+COLUMN_CHUNK_SIZE = 65536
+
+FRAME_DTYPE = numpy.dtype([
+    ('source', numpy.int32),
+    ('destination', numpy.int32),
+    ('path', numpy.int32),
+    ('data_type', 'S1'),
+    ('lat', numpy.float64),
+    ('lng', numpy.float64),
+    ('timestamp', numpy.float64),
+])
+
+
+class ColumnExporter(object):
+
+    """
+    Columnar Frame Exporter Class.
+
+    Columns are gathered per chunk and written into the structured array
+    one column at a time. Frames without a decodable position have NaN
+    `lat` & `lng`, and Frames without a timestamp have a NaN `timestamp`.
+    """
+
+    def __init__(self, chunk_size: int=COLUMN_CHUNK_SIZE) -> None:
+        self.chunk_size = chunk_size
+        self.callsigns: typing.List[str] = []
+        self.paths: typing.List[str] = []
+        self._callsign_codes: typing.Dict[str, int] = {}
+        self._path_codes: typing.Dict[str, int] = {}
+
+    def _encode(self, values: typing.List[str], dictionary: list,
+                codes: dict) -> typing.List[int]:
+        """Dictionary-encodes values, adding new values to the dictionary."""
+        encoded = []
+        append = encoded.append
+        for value in values:
+            code = codes.get(value)
+            if code is None:
+                code = codes[value] = len(dictionary)
+                dictionary.append(value)
+            append(code)
+        return encoded
+
+    def _chunk(self, frames: list, timestamps: list) -> numpy.ndarray:
+        """Builds one structured array from a list of Frames."""
+        sources = []
+        destinations = []
+        paths = []
+        data_types = []
+        lats = []
+        lngs = []
+        frame_position = aprs.geo_classes.frame_position
+        nan = float('nan')
+
+        for frame in frames:
+            sources.append(str(frame.source))
+            destinations.append(str(frame.destination))
+            paths.append(','.join(str(path_call) for path_call in frame.path))
+            info = bytes(frame.info)
+            data_types.append(info[0:1])
+            position = frame_position(frame)
+            if position is None:
+                lats.append(nan)
+                lngs.append(nan)
+            else:
+                lats.append(position[0])
+                lngs.append(position[1])
+
+        chunk = numpy.empty(len(frames), dtype=FRAME_DTYPE)
+        chunk['source'] = self._encode(
+            sources, self.callsigns, self._callsign_codes)
+        chunk['destination'] = self._encode(
+            destinations, self.callsigns, self._callsign_codes)
+        chunk['path'] = self._encode(paths, self.paths, self._path_codes)
+        chunk['data_type'] = data_types
+        chunk['lat'] = lats
+        chunk['lng'] = lngs
+        chunk['timestamp'] = [nan if ts is None else ts for ts in timestamps]
+        return chunk
+
+    def chunks(self, frames: typing.Iterable,
+               timestamps: typing.Iterable[float]=None) -> \
+            typing.Iterator[numpy.ndarray]:
+        """
+        Yields structured arrays of `FRAME_DTYPE` of up to `chunk_size`
+        Frames each.
+
+        :param frames: `aprs.Frame`s.
+        :param timestamps: Receive timestamps of the Frames, if known.
+
+        :raises ValueError: If there are more or fewer timestamps than
+                            Frames.
+        """
+        frames_chunk = []
+        timestamps_chunk = []
+        if timestamps is None:
+            pairs = zip(frames, itertools.repeat(None))
+        else:
+            pairs = _zip_equal(frames, timestamps)
+        for frame, timestamp in pairs:
+            frames_chunk.append(frame)
+            timestamps_chunk.append(timestamp)
+            if len(frames_chunk) == self.chunk_size:
+                yield self._chunk(frames_chunk, timestamps_chunk)
+                frames_chunk = []
+                timestamps_chunk = []
+        if frames_chunk:
+            yield self._chunk(frames_chunk, timestamps_chunk)
+
+    def to_numpy(self, frames: typing.Iterable,
+                 timestamps: typing.Iterable[float]=None) -> numpy.ndarray:
+        """Returns all Frames as one structured array of `FRAME_DTYPE`."""
+        chunks = list(self.chunks(frames, timestamps))
+        if not chunks:
+            return numpy.empty(0, dtype=FRAME_DTYPE)
+        return numpy.concatenate(chunks)
+
+    def decode(self, chunk: numpy.ndarray, column: str) -> numpy.ndarray:
+        """
+        Returns the text values of a dictionary-encoded column of a chunk.
+        """
+        dictionary = self.paths if column == 'path' else self.callsigns
+        return numpy.array(dictionary, dtype=object)[chunk[column]]
+
+    def to_arrow(self, chunk: numpy.ndarray):
+        """
+        Converts a chunk to an Arrow record batch, with Source, Destination
+        & Path as dictionary columns. Requires `pyarrow`.
+        """
+        try:
+            import pyarrow  # pylint: disable=C0415
+        except ImportError:
+            raise ImportError('Arrow export requires the pyarrow package.')
+
+        # Re-encode against dictionaries of only this chunk's values.
+        length = len(chunk)
+        callsign_codes, callsign_indices = numpy.unique(
+            numpy.concatenate([chunk['source'], chunk['destination']]),
+            return_inverse=True)
+        callsign_indices = callsign_indices.astype(numpy.int32)
+        path_codes, path_indices = numpy.unique(
+            chunk['path'], return_inverse=True)
+        callsigns = pyarrow.array(
+            [self.callsigns[code] for code in callsign_codes],
+            pyarrow.string())
+        paths = pyarrow.array(
+            [self.paths[code] for code in path_codes], pyarrow.string())
+        columns = [
+            pyarrow.DictionaryArray.from_arrays(
+                callsign_indices[:length], callsigns),
+            pyarrow.DictionaryArray.from_arrays(
+                callsign_indices[length:], callsigns),
+            pyarrow.DictionaryArray.from_arrays(
+                path_indices.astype(numpy.int32), paths),
+            pyarrow.array(chunk['data_type'].tolist(), pyarrow.binary()),
+            pyarrow.array(chunk['lat'], from_pandas=True),
+            pyarrow.array(chunk['lng'], from_pandas=True),
+            pyarrow.array(chunk['timestamp'], from_pandas=True),
+        ]
+        return pyarrow.RecordBatch.from_arrays(columns, FRAME_DTYPE.names)
+
+    def arrow_batches(self, frames: typing.Iterable,
+                      timestamps: typing.Iterable[float]=None) -> \
+            typing.Iterator:
+        """Yields Arrow record batches of up to `chunk_size` Frames each."""
+        for chunk in self.chunks(frames, timestamps):
+            yield self.to_arrow(chunk)
+
+
+def _zip_equal(frames: typing.Iterable,
+               timestamps: typing.Iterable[float]) -> typing.Iterator[tuple]:
+    """Zips Frames & timestamps, raising ValueError if their lengths differ."""
+    missing = object()
+    for frame, timestamp in itertools.zip_longest(
+            frames, timestamps, fillvalue=missing):
+        if frame is missing or timestamp is missing:
+            raise ValueError('frames and timestamps differ in length.')
+        yield frame, timestamp
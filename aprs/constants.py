@@ -21,6 +21,23 @@ LOG_FORMAT = logging.Formatter(
     ('%(asctime)s aprs %(levelname)s %(name)s.%(funcName)s:%(lineno)d - '
      '%(message)s'))
 
+# Profiling of the hot-path parse, encode & receive functions, enabled via
+# the APRS_PROFILE Environment Variable: 'sample' samples the stacks of all
+# threads every PROFILE_INTERVAL seconds (for production), '0', 'false',
+# 'no' & 'off' leave profiling off, and any other value counts & times every
+# call. A summary is written at exit to stderr, or to the file named by
+# APRS_PROFILE_OUTPUT.
+PROFILE = os.environ.get('APRS_PROFILE', '')
+if PROFILE.lower() in ('0', 'false', 'no', 'off'):
+    PROFILE = ''
+try:
+    PROFILE_INTERVAL = float(os.environ.get('APRS_PROFILE_INTERVAL', 0.005))
+except ValueError:
+    PROFILE_INTERVAL = 0.005
+if not PROFILE_INTERVAL > 0:
+    PROFILE_INTERVAL = 0.005
+PROFILE_OUTPUT = os.environ.get('APRS_PROFILE_OUTPUT')
+
 APRSIS_SERVERS = [b'rotate.aprs.net', b'noam.aprs2.net']
 
 APRSIS_SW_VERSION = b'APRS Python Module'
@@ -57,6 +74,38 @@ DATA_TYPE_MAP = {
     b'`': b'old_mice'
 }
 
+# Error codes returned by `aprs.functions.try_parse_frame`, with the offset
+# the error was found at. PARSE_ERRORS names each code.
+PARSE_OK = 0
+PARSE_EMPTY = 1
+PARSE_BAD_TYPE = 2
+PARSE_NO_DESTINATION = 3
+PARSE_NO_INFO = 4
+PARSE_TRUNCATED = 5
+PARSE_BAD_SOURCE = 6
+PARSE_BAD_DESTINATION = 7
+PARSE_BAD_PATH = 8
+PARSE_ERRORS = ('ok', 'empty', 'bad_type', 'no_destination', 'no_info',
+                'truncated', 'bad_source', 'bad_destination', 'bad_path')
+
 # KISS Command Codes
 # http://en.wikipedia.org/wiki/KISS_(TNC)#Command_Codes
 KISS_DATA_FRAME = b'\x00'
+KISS_FEND = b'\xC0'
+KISS_FESC = b'\xDB'
+KISS_TFEND = b'\xDC'
+KISS_TFESC = b'\xDD'
+
+# Packed Callsign characters, in text sort order. Index 0 is padding.
+CALLSIGN_ALPHABET = b' 0123456789ABCDEFGHIJKLMNOPQRSTUVWXYZ'
+
+# Mean Earth Radius (IUGG), used for Great-Circle calculations.
+EARTH_RADIUS_KM = 6371.0088
+
+# Distance unit conversion factors from kilometers. APRS-IS range filters
+# (r/lat/lon/dist, m/dist, f/call/dist) are specified in km.
+DISTANCE_UNITS = {
+    'km': 1.0,
+    'mi': 0.621371192,
+    'nm': 0.539956803
+}
@@ -0,0 +1,104 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""Python APRS Module Frame Encoder Class Definitions."""
+
+import array
+import logging
+import typing
+
+import aprs  # pylint: disable=R0801
+
+__author__ = 'Greg Albrecht W2GMD <oss@undef.net>'  # NOQA pylint: disable=R0801
+__copyright__ = 'Copyright 2017 Greg Albrecht and Contributors'  # NOQA pylint: disable=R0801
+__license__ = 'Apache License, Version 2.0'  # NOQA pylint: disable=R0801
+
+
+class FrameEncoder(object):
+
+    """
+    Frame Encoder Class.
+
+    Lays out many Frames back-to-back in one reusable buffer, either as
+    AX.25 (flags, FCS & all) or as KISS data frames (FEND, command, the
+    escaped AX.25 addresses, control, PID & Information Field, FEND), ready
+    for a single `socket.sendall` or serial write::
+
+        encoder = aprs.FrameEncoder(kiss=True)
+        with encoder.encode_many(frames) as data:
+            tnc.write(data)
+
+    Each Frame's AX.25 encoding (and FCS) comes from `aprs.Frame`'s encode
+    cache, so re-sending Frames only copies them into the buffer.
+    """
+
+    __slots__ = ['kiss', 'port', 'buffer', 'offsets']
+
+    _logger = logging.getLogger(__name__)  # pylint: disable=R0801
+    if not _logger.handlers:  # pylint: disable=R0801
+        _logger.setLevel(aprs.LOG_LEVEL)  # pylint: disable=R0801
+        _console_handler = logging.StreamHandler()  # pylint: disable=R0801
+        _console_handler.setLevel(aprs.LOG_LEVEL)  # pylint: disable=R0801
+        _console_handler.setFormatter(aprs.LOG_FORMAT)  # pylint: disable=R0801
+        _logger.addHandler(_console_handler)  # pylint: disable=R0801
+        _logger.propagate = False  # pylint: disable=R0801
+
+    def __init__(self, kiss: bool=False, port: int=0,
+                 size: int=65536) -> None:
+        self.kiss = kiss
+        self.port = port
+        self.buffer = bytearray(size)
+        self.offsets = array.array('Q', [0])
+
+    def _encode(self, frame) -> bytes:
+        encoded = aprs.parse_frame(frame).encode_ax25()
+        if not self.kiss:
+            return encoded
+        # The TNC adds the flags & FCS.
+        body = encoded[1:-3]
+        if aprs.KISS_FESC in body:
+            body = body.replace(
+                aprs.KISS_FESC, aprs.KISS_FESC + aprs.KISS_TFESC)
+        if aprs.KISS_FEND in body:
+            body = body.replace(
+                aprs.KISS_FEND, aprs.KISS_FESC + aprs.KISS_TFEND)
+        return b''.join([aprs.KISS_FEND, bytes([self.port << 4]), body,
+                         aprs.KISS_FEND])
+
+    def _reserve(self, size: int) -> None:
+        """Grows the buffer to at least `size` bytes."""
+        if len(self.buffer) >= size:
+            return
+        try:
+            self.buffer.extend(bytes(size - len(self.buffer)))
+        except BufferError:
+            # A view returned by a previous call is still held.
+            self.buffer = bytearray(size)
+
+    def encode_many(self, frames: typing.Iterable) -> memoryview:
+        """
+        Encodes Frames into the buffer.
+
+        :param frames: `aprs.Frame`s, or anything `aprs.parse_frame` takes.
+
+        :returns: View of the encoded Frames in the buffer. Frame n is
+                  at [offsets[n]:offsets[n + 1]]. Release the view before
+                  the next call to let the buffer be reused in place.
+        :rtype: memoryview
+        """
+        encoded_frames = [self._encode(frame) for frame in frames]
+
+        offsets = array.array('Q', [0])
+        total = 0
+        for encoded in encoded_frames:
+            total += len(encoded)
+            offsets.append(total)
+        self.offsets = offsets
+        self._reserve(total)
+
+        view = memoryview(self.buffer)
+        start = 0
+        for encoded, end in zip(encoded_frames, offsets[1:]):
+            view[start:end] = encoded
+            start = end
+        return view[:total]
@@ -11,3 +11,8 @@ __license__ = 'Apache License, Version 2.0'  # NOQA pylint: disable=R0801
 class BadCallsignError(Exception):
     """Bad Callsign Error."""
     pass
+
+
+class SnapshotError(Exception):
+    """Invalid or Corrupt Snapshot Error."""
+    pass
@@ -15,13 +15,27 @@ __license__ = 'Apache License, Version 2.0'  # NOQA pylint: disable=R0801
 AprsCallsign = typing.TypeVar('AprsCallsign', bound='aprs.Callsign')
 AprsFrame = typing.TypeVar('AprsFrame', bound='aprs.Frame')
 
+# Packed value of each byte, 0 for characters that can't be packed.
+_CALLSIGN_VALUES = [max(aprs.CALLSIGN_ALPHABET.find(bytes([char])), 0)
+                    for char in range(256)]
+_CALLSIGN_PADDING = [37 ** (6 - _length) for _length in range(7)]
 
+# Deleting these from an AX.25 Callsign leaves any bytes with the
+# address-end bit set.
+_EVEN_BYTES = bytes(range(0, 256, 2))
+
+FrameResult = typing.Tuple[typing.Optional[AprsFrame], int, int]
+
+
+@aprs.profiling.profiled
 def parse_frame(raw_frame: typing.Union[bytes, str]) -> AprsFrame:
     """
     Parses an AX.25/APRS Frame from either plain-text or AX.25.
     """
     if isinstance(raw_frame, aprs.Frame):
         return raw_frame
+    elif isinstance(raw_frame, memoryview):
+        return parse_frame(raw_frame.tobytes())
     elif isinstance(raw_frame, str):
         return parse_frame_text(bytes(raw_frame, 'UTF-8'))
     elif isinstance(raw_frame, bytes) or isinstance(raw_frame, bytearray):
@@ -31,6 +45,119 @@ def parse_frame(raw_frame: typing.Union[bytes, str]) -> AprsFrame:
             return parse_frame_text(raw_frame)
 
 
+def try_parse_frame(raw_frame: typing.Union[bytes, str]) -> FrameResult:
+    """
+    Parses an AX.25/APRS Frame like `parse_frame`, but returns errors
+    instead of raising them, for bulk parsing of dirty feeds.
+
+    It is stricter than `parse_frame` for text Frames, rejecting some that
+    `parse_frame` returns garbled rather than raising on: those with an
+    empty Source, Destination or Path Callsign (`aprs.PARSE_BAD_SOURCE`,
+    `aprs.PARSE_BAD_DESTINATION` & `aprs.PARSE_BAD_PATH`), and those with
+    ':' before '>' (`aprs.PARSE_BAD_SOURCE`).
+
+    >>> try_parse_frame(b'W2GMD>APRS,WIDE1-1:>test')
+    (W2GMD>APRS,WIDE1-1:>test, 0, 0)
+    >>> try_parse_frame(b'W2GMD>APRS,WIDE1-1-1:>test')
+    (None, 8, 11)
+
+    :returns: The Frame, error code & offset: (Frame, `aprs.PARSE_OK`, 0)
+              or (None, one of the `aprs.PARSE_*` error codes, offset in
+              `raw_frame` the error was found at). `aprs.PARSE_ERRORS`
+              names each error code.
+    :rtype: tuple
+    """
+    if isinstance(raw_frame, aprs.Frame):
+        return raw_frame, aprs.PARSE_OK, 0
+    elif isinstance(raw_frame, memoryview):
+        raw_frame = raw_frame.tobytes()
+    elif isinstance(raw_frame, str):
+        raw_frame = bytes(raw_frame, 'UTF-8')
+    elif not isinstance(raw_frame, (bytes, bytearray)):
+        return None, aprs.PARSE_BAD_TYPE, 0
+
+    if not raw_frame:
+        return None, aprs.PARSE_EMPTY, 0
+    elif aprs.ADDR_INFO_DELIM in raw_frame:
+        return _try_parse_frame_ax25(raw_frame)
+    return _try_parse_frame_text(raw_frame)
+
+
+def _try_parse_frame_text(raw_frame: bytes) -> FrameResult:
+    """`try_parse_frame` for plain-text Frames."""
+    sd_delim = raw_frame.find(b'>')
+    if sd_delim < 0:
+        return None, aprs.PARSE_NO_DESTINATION, len(raw_frame)
+    pi_delim = raw_frame.find(b':')
+    if pi_delim < 0:
+        return None, aprs.PARSE_NO_INFO, len(raw_frame)
+    elif pi_delim < sd_delim:
+        return None, aprs.PARSE_BAD_SOURCE, pi_delim
+
+    source = raw_frame[:sd_delim]
+    if _bad_callsign_text(source):
+        return None, aprs.PARSE_BAD_SOURCE, 0
+
+    _path = raw_frame[sd_delim + 1:pi_delim].split(b',')
+    destination = _path.pop(0)
+    if _bad_callsign_text(destination):
+        return None, aprs.PARSE_BAD_DESTINATION, sd_delim + 1
+    offset = sd_delim + len(destination) + 2
+    for path in _path:
+        if _bad_callsign_text(path):
+            return None, aprs.PARSE_BAD_PATH, offset
+        offset += len(path) + 1
+
+    parsed_frame = aprs.Frame()
+    parsed_frame.set_source(source)
+    parsed_frame.set_destination(destination)
+    if _path:
+        parsed_frame.set_path(_path)
+    parsed_frame.set_info(raw_frame[pi_delim + 1:])
+    return parsed_frame, aprs.PARSE_OK, 0
+
+
+def _try_parse_frame_ax25(raw_frame: bytes) -> FrameResult:
+    """`try_parse_frame` for AX.25-Encoded Frames."""
+    kiss_call = False
+
+    _frame = raw_frame.lstrip(aprs.AX25_FLAG)
+    start = len(raw_frame) - len(_frame)
+    _frame = _frame.rstrip(aprs.AX25_FLAG)
+    if (_frame.startswith(aprs.KISS_DATA_FRAME) or
+            _frame.endswith(aprs.KISS_DATA_FRAME)):
+        _kiss_frame = _frame.lstrip(aprs.KISS_DATA_FRAME)
+        start += len(_frame) - len(_kiss_frame)
+        _frame = _kiss_frame.rstrip(aprs.KISS_DATA_FRAME)
+        kiss_call = True
+
+    addr_end = _frame.find(aprs.ADDR_INFO_DELIM)
+    if addr_end < 0:
+        return None, aprs.PARSE_NO_INFO, start + len(_frame)
+    elif addr_end < 14:
+        return None, aprs.PARSE_TRUNCATED, start + addr_end
+
+    odd = _odd_byte(_frame, 0, 6)
+    if odd >= 0:
+        return None, aprs.PARSE_BAD_DESTINATION, start + odd
+    odd = _odd_byte(_frame, 7, 13)
+    if odd >= 0:
+        return None, aprs.PARSE_BAD_SOURCE, start + odd
+    path = []
+    for pos in range(14, addr_end - 6, 7):
+        odd = _odd_byte(_frame, pos, pos + 6)
+        if odd >= 0:
+            return None, aprs.PARSE_BAD_PATH, start + odd
+        path.append(parse_callsign_ax25(_frame[pos:pos + 7]))
+
+    parsed_frame = aprs.Frame()
+    parsed_frame.set_source(parse_callsign_ax25(_frame[7:14], kiss_call))
+    parsed_frame.set_destination(parse_callsign_ax25(_frame, kiss_call))
+    parsed_frame.set_path(path)
+    parsed_frame.set_info(_frame[addr_end + 2:].rstrip(b'\xFF\x07'))
+    return parsed_frame, aprs.PARSE_OK, 0
+
+
 def parse_frame_text(raw_frame: bytes) -> AprsFrame:
     """
     Parses and Extracts the components of a str Frame.
@@ -75,7 +202,8 @@ def parse_frame_ax25(raw_frame: bytes) -> AprsFrame:
         kiss_call = True
 
     # Use these two fields as the address/information delimiter
-    frame_addressing, frame_information = _frame.split(aprs.ADDR_INFO_DELIM)
+    frame_addressing, frame_information = _frame.split(
+        aprs.ADDR_INFO_DELIM, 1)
 
     info_field = frame_information.rstrip(b'\xFF\x07')
 
@@ -98,19 +226,40 @@ def parse_frame_ax25(raw_frame: bytes) -> AprsFrame:
     return parsed_frame
 
 
+@aprs.profiling.profiled
 def parse_callsign(raw_callsign: bytes) -> AprsCallsign:
     """
     Parses an AX.25/APRS Callsign from plain-text or AX.25 input.
     """
     if isinstance(raw_callsign, aprs.Callsign):
         return raw_callsign
-    try:
+    elif isinstance(raw_callsign, str):
+        return parse_callsign_text(bytes(raw_callsign, 'UTF-8'))
+    elif _is_callsign_ax25(raw_callsign):
         return parse_callsign_ax25(raw_callsign)
-    except:
-        if isinstance(raw_callsign, str):
-            return parse_callsign_text(bytes(raw_callsign, 'UTF-8'))
-        else:
-            return parse_callsign_text(raw_callsign)
+    return parse_callsign_text(raw_callsign)
+
+
+def _is_callsign_ax25(raw_callsign: bytes) -> bool:
+    """
+    Returns True if `parse_callsign_ax25` can parse `raw_callsign`: it is at
+    least 7 bytes, with no address-end bit set in the first 6.
+    """
+    return (len(raw_callsign) >= 7 and
+            not bytes(raw_callsign[:6]).translate(None, _EVEN_BYTES))
+
+
+def _odd_byte(data: bytes, start: int, end: int) -> int:
+    """Returns the offset of the first byte with its low bit set, or -1."""
+    for offset in range(start, end):
+        if data[offset] & 1:
+            return offset
+    return -1
+
+
+def _bad_callsign_text(raw_callsign: bytes) -> bool:
+    """Returns True if `raw_callsign` is empty or has more than one SSID."""
+    return not raw_callsign or raw_callsign.count(b'-') > 1
 
 
 def parse_callsign_text(raw_callsign: bytes) -> AprsCallsign:
@@ -180,6 +329,45 @@ def parse_callsign_ax25(raw_callsign: bytes, kiss_call: bool=False) -> AprsCalls
     return parsed_callsign
 
 
+def pack_callsign(callsign: bytes, ssid: int=0, digi: bool=False) -> int:
+    """
+    Packs a Callsign into an int: up to 6 base-37 Callsign characters (0-9,
+    A-Z), a 4-bit SSID and the Digipeated flag, in 37 bits. Packed
+    Callsigns sort in the same order as their text.
+
+    >>> pack_callsign(b'W2GMD', 1) < pack_callsign(b'W2GMD', 2)
+    True
+    >>> unpack_callsign(pack_callsign(b'W2GMD', 6, True))
+    W2GMD-6*
+
+    :raises ValueError: If the Callsign can't be packed.
+    """
+    if len(callsign) > 6 or not 0 <= ssid <= 15:
+        raise ValueError('Callsign too long or SSID out of range.')
+    value = 0
+    for char in callsign:
+        char_value = _CALLSIGN_VALUES[char]
+        if not char_value:
+            raise ValueError('Callsign character %r not packable.' % char)
+        value = value * 37 + char_value
+    value *= _CALLSIGN_PADDING[len(callsign)]
+    return (value << 5) | (ssid << 1) | bool(digi)
+
+
+def unpack_callsign(packed: int) -> AprsCallsign:
+    """
+    Unpacks a Callsign packed by `pack_callsign`.
+    """
+    value = packed >> 5
+    chars = bytearray(6)
+    for pos in range(5, -1, -1):
+        value, char_value = divmod(value, 37)
+        chars[pos] = aprs.CALLSIGN_ALPHABET[char_value]
+    return aprs.Callsign(bytes(chars).rstrip(b' '),
+                         b'%d' % ((packed >> 1) & 0x0F), bool(packed & 1))
+
+
+@aprs.profiling.profiled
 def parse_info_field(raw_data: bytes, handler=None) -> bytes:
     if not raw_data:
         return bytes()
@@ -202,6 +390,92 @@ def parse_info_field(raw_data: bytes, handler=None) -> bytes:
         return aprs.InformationField(raw_data, data_type, safe=True)
 
 
+def parse_position(raw_data: bytes
+                   ) -> typing.Optional[typing.Tuple[float, float]]:
+    """
+    Decodes the Latitude & Longitude from a Position Report Information
+    Field ('!', '=', '/' or '@' Data Types), in either uncompressed or
+    compressed format.
+
+    >>> parse_position(b'!3745.00N/12227.00W-test')
+    (37.75, -122.45)
+    >>> parse_position(b'=/5L!!<*e7>7P[')
+    (49.5, -72.75000393777269)
+    >>> parse_position(b'>status') is None
+    True
+
+    :param raw_data: APRS Information Field.
+    :type raw_data: bytes
+
+    :returns: (lat, lng) in decimal degrees, or None if the Information Field
+              is not a decodable Position Report.
+    :rtype: tuple
+    """
+    raw_data = bytes(raw_data)
+    if not raw_data:
+        return None
+
+    data_type = raw_data[0:1]
+    if data_type in (b'!', b'='):
+        pos = raw_data[1:]
+    elif data_type in (b'/', b'@'):
+        # Skip the 7-byte timestamp.
+        pos = raw_data[8:]
+    else:
+        return None
+
+    try:
+        if pos[0:1].isdigit():
+            if len(pos) < 19:
+                return None
+            return (aprs.geo_util.dm2dec_lat(pos[0:8]),
+                    aprs.geo_util.dm2dec_lng(pos[9:18]))
+        elif len(pos) >= 10:
+            # Compressed: Table, 4-byte Lat, 4-byte Lng, Symbol (base 91).
+            lat = 0
+            lng = 0
+            for char in pos[1:5]:
+                lat = lat * 91 + char - 33
+            for char in pos[5:9]:
+                lng = lng * 91 + char - 33
+            return (90 - lat / 380926.0, -180 + lng / 190463.0)
+    except (ValueError, IndexError, UnicodeDecodeError):
+        pass
+
+    return None
+
+
+def parse_symbol(raw_data: bytes) -> typing.Optional[bytes]:
+    """
+    Extracts the Symbol Table ID & Symbol Code from a Position Report
+    Information Field.
+
+    >>> parse_symbol(b'!3745.00N/12227.00W-test')
+    b'/-'
+    >>> parse_symbol(b'=/5L!!<*e7>7P[')
+    b'/>'
+    >>> parse_symbol(b'>status') is None
+    True
+
+    :returns: Two bytes, Table ID then Symbol Code, or None.
+    """
+    raw_data = bytes(raw_data)
+    data_type = raw_data[0:1]
+    if data_type in (b'!', b'='):
+        pos = raw_data[1:]
+    elif data_type in (b'/', b'@'):
+        pos = raw_data[8:]
+    else:
+        return None
+
+    if pos[0:1].isdigit():
+        if len(pos) >= 19:
+            return pos[8:9] + pos[18:19]
+    elif len(pos) >= 10:
+        return pos[0:1] + pos[9:10]
+    return None
+
+
 def default_data_handler(data: bytes, data_type: bytes) -> bytes:
     """
     Handler for Undefined Data Types.
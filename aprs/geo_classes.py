@@ -0,0 +1,507 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""Python APRS Module Geo Class Definitions."""
+
+import logging
+import math
+import typing
+
+import numpy
+
+import aprs  # pylint: disable=R0801
+
+__author__ = 'Greg Albrecht W2GMD <oss@undef.net>'  # NOQA pylint: disable=R0801
+__copyright__ = 'Copyright 2017 Greg Albrecht and Contributors'  # NOQA pylint: disable=R0801
+__license__ = 'Apache License, Version 2.0'  # NOQA pylint: disable=R0801
+
+
+def _row_col(lat: float, lng: float,
+             cell_size: float) -> typing.Tuple[int, int]:
+    """
+    Returns the (row, col) of the grid cell containing a position.
+    """
+    n_rows = int(math.ceil(180 / cell_size))
+    n_cols = int(math.ceil(360 / cell_size))
+    row = min(max(int((lat + 90.0) // cell_size), 0), n_rows - 1)
+    col = int((lng + 180.0) // cell_size) % n_cols
+    return (row, col)
+
+
+def _box_rows_cols(box: tuple, cell_size: float) -> typing.Tuple[
+        range, typing.List[int]]:
+    """
+    Returns the grid rows & cols overlapping a Bounding Box, wrapping cols
+    around the anti-meridian if needed.
+    """
+    min_lat, min_lng, max_lat, max_lng = box
+    n_cols = int(math.ceil(360 / cell_size))
+    min_row, min_col = _row_col(min_lat, min_lng, cell_size)
+    max_row, max_col = _row_col(max_lat, max_lng, cell_size)
+
+    if max_lng >= 180.0:
+        max_col = n_cols - 1
+
+    if min_lng <= max_lng:
+        cols = list(range(min_col, max_col + 1))
+    else:
+        # Box crosses the anti-meridian.
+        cols = list(range(min_col, n_cols)) + list(range(0, max_col + 1))
+
+    return (range(min_row, max_row + 1), cols)
+
+
+def frame_position(frame) -> typing.Optional[typing.Tuple[float, float]]:
+    """
+    Returns the (lat, lng) of a `aprs.PositionFrame`, or decodes it from the
+    Information Field of any other `aprs.Frame`.
+    """
+    lat = getattr(frame, 'lat', None)
+    lng = getattr(frame, 'lng', None)
+    if lat is not None and lng is not None:
+        return (lat, lng)
+    return aprs.parse_position(bytes(frame.info))
+
+
+class StationIndex(object):
+
+    """
+    Spatial Index of last-known Station Positions.
+
+    Positions are held in NumPy columns and bucketed into a uniform lat/lng
+    grid of `cell_size` degree cells. Updates are O(1), and radius, bounding
+    box & k-nearest queries only examine the cells overlapping the query.
+    """
+
+    _logger = logging.getLogger(__name__)  # pylint: disable=R0801
+    if not _logger.handlers:  # pylint: disable=R0801
+        _logger.setLevel(aprs.LOG_LEVEL)  # pylint: disable=R0801
+        _console_handler = logging.StreamHandler()  # pylint: disable=R0801
+        _console_handler.setLevel(aprs.LOG_LEVEL)  # pylint: disable=R0801
+        _console_handler.setFormatter(aprs.LOG_FORMAT)  # pylint: disable=R0801
+        _logger.addHandler(_console_handler)  # pylint: disable=R0801
+        _logger.propagate = False  # pylint: disable=R0801
+
+    def __init__(self, cell_size: float=1.0, capacity: int=1024) -> None:
+        self.cell_size = float(cell_size)
+        self._n_rows = int(math.ceil(180 / self.cell_size))
+        self._n_cols = int(math.ceil(360 / self.cell_size))
+
+        # callsign -> slot, and slot -> callsign.
+        self._slots: typing.Dict[str, int] = {}
+        self._callsigns: typing.List[typing.Optional[str]] = []
+        self._free: typing.List[int] = []
+
+        # cell -> set of slots.
+        self._cells: typing.Dict[int, typing.Set[int]] = {}
+
+        self._lats = numpy.zeros(capacity, dtype=numpy.float64)
+        self._lngs = numpy.zeros(capacity, dtype=numpy.float64)
+        self._cell_ids = numpy.full(capacity, -1, dtype=numpy.int64)
+
+    def __len__(self) -> int:
+        return len(self._slots)
+
+    def __contains__(self, callsign) -> bool:
+        return str(callsign) in self._slots
+
+    def _row_col(self, lat: float, lng: float) -> typing.Tuple[int, int]:
+        return _row_col(lat, lng, self.cell_size)
+
+    def _grow(self) -> None:
+        capacity = max(len(self._lats) * 2, 16)
+        for name, fill in (('_lats', 0.0), ('_lngs', 0.0), ('_cell_ids', -1)):
+            old = getattr(self, name)
+            new = numpy.full(capacity, fill, dtype=old.dtype)
+            new[:len(old)] = old
+            setattr(self, name, new)
+
+    def update(self, callsign, lat: float, lng: float) -> None:
+        """
+        Sets the last-known position of a Station.
+
+        :param callsign: Station Callsign, as `str` or `aprs.Callsign`.
+        :param lat: Latitude in decimal degrees.
+        :param lng: Longitude in decimal degrees.
+        """
+        callsign = str(callsign)
+        row, col = self._row_col(lat, lng)
+        cell = row * self._n_cols + col
+
+        slot = self._slots.get(callsign)
+        if slot is None:
+            if self._free:
+                slot = self._free.pop()
+                self._callsigns[slot] = callsign
+            else:
+                slot = len(self._callsigns)
+                if slot >= len(self._lats):
+                    self._grow()
+                self._callsigns.append(callsign)
+            self._slots[callsign] = slot
+        else:
+            old_cell = int(self._cell_ids[slot])
+            if old_cell != cell:
+                self._discard(old_cell, slot)
+
+        self._lats[slot] = lat
+        self._lngs[slot] = lng
+        self._cell_ids[slot] = cell
+        self._cells.setdefault(cell, set()).add(slot)
+
+    def update_frame(self, frame) -> bool:
+        """
+        Sets the last-known position of the Source Station of a Frame.
+
+        :param frame: `aprs.PositionFrame` or `aprs.Frame` carrying a
+                      Position Report.
+
+        :returns: True if the Frame carried a position, False otherwise.
+        :rtype: bool
+        """
+        position = frame_position(frame)
+        if position is None:
+            return False
+        self.update(frame.source, *position)
+        return True
+
+    def _discard(self, cell: int, slot: int) -> None:
+        members = self._cells.get(cell)
+        if members is not None:
+            members.discard(slot)
+            if not members:
+                del self._cells[cell]
+
+    def remove(self, callsign) -> None:
+        """
+        Removes a Station from the Index.
+        """
+        slot = self._slots.pop(str(callsign))
+        self._discard(int(self._cell_ids[slot]), slot)
+        self._cell_ids[slot] = -1
+        self._callsigns[slot] = None
+        self._free.append(slot)
+
+    def position(self, callsign) -> typing.Tuple[float, float]:
+        """
+        Returns the last-known (lat, lng) of a Station.
+        """
+        slot = self._slots[str(callsign)]
+        return (float(self._lats[slot]), float(self._lngs[slot]))
+
+    def _candidates(self, box: tuple) -> numpy.ndarray:
+        """
+        Returns the slots of every Station in the cells overlapping `box`.
+        """
+        rows, cols = _box_rows_cols(box, self.cell_size)
+        min_row = rows.start
+        max_row = rows.stop - 1
+
+        slots: typing.List[int] = []
+        if len(rows) * len(cols) > len(self._cells):
+            # Fewer occupied cells than cells in the box, walk those instead.
+            col_set = set(cols)
+            for cell, members in self._cells.items():
+                row, col = divmod(cell, self._n_cols)
+                if min_row <= row <= max_row and col in col_set:
+                    slots.extend(members)
+        else:
+            for row in rows:
+                base = row * self._n_cols
+                for col in cols:
+                    members = self._cells.get(base + col)
+                    if members:
+                        slots.extend(members)
+
+        return numpy.fromiter(slots, dtype=numpy.int64, count=len(slots))
+
+    def in_box(self, box: tuple) -> typing.List[str]:
+        """
+        Returns the Callsigns of every Station within a Bounding Box.
+
+        :param box: (min_lat, min_lng, max_lat, max_lng), as returned by
+                    `aprs.bounding_box()`.
+        """
+        slots = self._candidates(box)
+        slots = slots[aprs.in_bounding_box(
+            self._lats[slots], self._lngs[slots], box)]
+        return [self._callsigns[slot] for slot in slots]
+
+    def in_radius(self, lat: float, lng: float, radius: float,
+                  units: str='km') -> typing.List[typing.Tuple[str, float]]:
+        """
+        Returns every Station within `radius` of a position.
+
+        :returns: List of (callsign, distance) tuples, nearest first.
+        :rtype: list
+        """
+        box = aprs.bounding_box(lat, lng, radius, units)
+        slots = self._candidates(box)
+        if not slots.size:
+            return []
+
+        distances = aprs.distance(
+            lat, lng, self._lats[slots], self._lngs[slots], units)
+        within = distances <= radius
+        slots = slots[within]
+        distances = distances[within]
+        order = numpy.argsort(distances, kind='stable')
+        return [(self._callsigns[slots[i]], float(distances[i]))
+                for i in order]
+
+    def nearest(self, lat: float, lng: float, k: int=1,
+                units: str='km') -> typing.List[typing.Tuple[str, float]]:
+        """
+        Returns the `k` Stations nearest to a position.
+
+        Searches an expanding radius, starting at one grid cell, so only the
+        neighbourhood of the position is examined on a dense Index.
+
+        :returns: List of (callsign, distance) tuples, nearest first.
+        :rtype: list
+        """
+        factor = aprs.geo_util._unit_factor(units)  # NOQA pylint: disable=W0212
+        radius = math.radians(self.cell_size) * aprs.EARTH_RADIUS_KM * factor
+        max_radius = math.pi * aprs.EARTH_RADIUS_KM * factor
+
+        while True:
+            found = self.in_radius(lat, lng, radius, units)
+            if len(found) >= k or radius >= max_radius:
+                return found[:k]
+            radius *= 2
+
+
+class Geofence(object):
+
+    """
+    Geofence Class.
+
+    Defines a named Polygon or Circle area. Polygons are given as a sequence
+    of (lat, lng) vertices and must not cross the anti-meridian.
+    """
+
+    __slots__ = ['name', 'box', '_lats', '_lngs', '_slopes', '_center',
+                 '_radius', '_units']
+
+    def __init__(self, name, vertices: typing.Sequence=None,
+                 center: typing.Tuple[float, float]=None, radius: float=None,
+                 units: str='km') -> None:
+        self.name = name
+        self._center = center
+        self._radius = radius
+        self._units = units
+
+        if vertices is not None:
+            vertices = numpy.asarray(vertices, dtype=numpy.float64)
+            if vertices.ndim != 2 or len(vertices) < 3:
+                raise ValueError('A Polygon needs at least 3 vertices.')
+            self._lats = vertices[:, 0]
+            self._lngs = vertices[:, 1]
+            # Precompute the ray-casting edge slopes (d_lng / d_lat).
+            d_lat = numpy.roll(self._lats, -1) - self._lats
+            d_lng = numpy.roll(self._lngs, -1) - self._lngs
+            flat = d_lat == 0
+            d_lat[flat] = 1.0
+            self._slopes = d_lng / d_lat
+            self.box = (float(self._lats.min()), float(self._lngs.min()),
+                        float(self._lats.max()), float(self._lngs.max()))
+        elif center is not None and radius is not None:
+            self._lats = self._lngs = self._slopes = None
+            self.box = aprs.bounding_box(center[0], center[1], radius, units)
+        else:
+            raise ValueError('A Geofence needs vertices, or center & radius.')
+
+    def __repr__(self) -> str:
+        if self._lats is None:
+            return 'Geofence(%r, center=%r, radius=%r, units=%r)' % (
+                self.name, self._center, self._radius, self._units)
+        return 'Geofence(%r, vertices=%d)' % (self.name, len(self._lats))
+
+    def contains(self, lat: float, lng: float) -> bool:
+        """
+        Tests whether a position is inside this Geofence.
+        """
+        if not aprs.in_bounding_box(lat, lng, self.box):
+            return False
+        if self._lats is None:
+            return bool(aprs.distance(
+                self._center[0], self._center[1], lat, lng,
+                self._units) <= self._radius)
+
+        # Even-odd ray-casting along the lng axis.
+        lats = self._lats
+        crosses = (lats > lat) != (numpy.roll(lats, -1) > lat)
+        hits = lng < self._slopes * (lat - lats) + self._lngs
+        return bool(numpy.count_nonzero(crosses & hits) & 1)
+
+
+class GeofenceEvent(object):
+
+    """
+    Geofence Event Class.
+
+    Describes a Station entering or exiting a Geofence.
+    """
+
+    __slots__ = ['event', 'callsign', 'fence']
+
+    ENTER = 'enter'
+    EXIT = 'exit'
+
+    def __init__(self, event: str, callsign: str, fence) -> None:
+        self.event = event
+        self.callsign = callsign
+        self.fence = fence
+
+    def __repr__(self) -> str:
+        return '%s %s %s' % (self.callsign, self.event, self.fence)
+
+    def __eq__(self, other) -> bool:
+        return (isinstance(other, GeofenceEvent) and
+                (self.event, self.callsign, self.fence) ==
+                (other.event, other.callsign, other.fence))
+
+    def __hash__(self) -> int:
+        return hash((self.event, self.callsign, self.fence))
+
+
+class GeofenceEngine(object):
+
+    """
+    Geofence Engine Class.
+
+    Holds many Geofences behind a uniform lat/lng grid prefilter, tracks
+    which Geofences each Station is inside of, and emits `GeofenceEvent`s as
+    Stations enter & exit them.
+
+    `handle_frame` can be used directly as an Interface receive callback::
+
+        engine = aprs.geo_classes.GeofenceEngine(callback=print)
+        engine.add_circle('home', 37.74, -122.39, 5)
+        aprs_conn.receive(callback=engine.handle_frame)
+    """
+
+    _logger = logging.getLogger(__name__)  # pylint: disable=R0801
+    if not _logger.handlers:  # pylint: disable=R0801
+        _logger.setLevel(aprs.LOG_LEVEL)  # pylint: disable=R0801
+        _console_handler = logging.StreamHandler()  # pylint: disable=R0801
+        _console_handler.setLevel(aprs.LOG_LEVEL)  # pylint: disable=R0801
+        _console_handler.setFormatter(aprs.LOG_FORMAT)  # pylint: disable=R0801
+        _logger.addHandler(_console_handler)  # pylint: disable=R0801
+        _logger.propagate = False  # pylint: disable=R0801
+
+    def __init__(self, cell_size: float=1.0, callback=None) -> None:
+        self.cell_size = float(cell_size)
+        self.callback = callback
+        self._n_cols = int(math.ceil(360 / self.cell_size))
+        self.fences: typing.Dict[typing.Any, Geofence] = {}
+        # cell -> names of the Geofences whose Bounding Box overlaps it.
+        self._cells: typing.Dict[int, typing.List] = {}
+        # callsign -> names of the Geofences the Station is inside.
+        self._inside: typing.Dict[str, frozenset] = {}
+
+    def __len__(self) -> int:
+        return len(self.fences)
+
+    def add(self, fence: Geofence) -> None:
+        """
+        Adds (or replaces) a Geofence.
+        """
+        if fence.name in self.fences:
+            self.remove(fence.name)
+        self.fences[fence.name] = fence
+        rows, cols = _box_rows_cols(fence.box, self.cell_size)
+        for row in rows:
+            for col in cols:
+                self._cells.setdefault(
+                    row * self._n_cols + col, []).append(fence.name)
+
+    def add_polygon(self, name, vertices: typing.Sequence) -> None:
+        """
+        Adds a Polygon Geofence from a sequence of (lat, lng) vertices.
+        """
+        self.add(Geofence(name, vertices=vertices))
+
+    def add_circle(self, name, lat: float, lng: float, radius: float,
+                   units: str='km') -> None:
+        """
+        Adds a Circle Geofence of `radius` around a position.
+        """
+        self.add(Geofence(name, center=(lat, lng), radius=radius,
+                          units=units))
+
+    def remove(self, name) -> None:
+        """
+        Removes a Geofence. No exit events are emitted for Stations inside.
+        """
+        fence = self.fences.pop(name)
+        rows, cols = _box_rows_cols(fence.box, self.cell_size)
+        for row in rows:
+            for col in cols:
+                cell = row * self._n_cols + col
+                names = self._cells[cell]
+                names.remove(name)
+                if not names:
+                    del self._cells[cell]
+        for callsign, inside in list(self._inside.items()):
+            if name in inside:
+                if len(inside) == 1:
+                    del self._inside[callsign]
+                else:
+                    self._inside[callsign] = inside - {name}
+
+    def inside(self, callsign) -> frozenset:
+        """
+        Returns the names of the Geofences a Station was last inside.
+        """
+        return self._inside.get(str(callsign), frozenset())
+
+    def locate(self, lat: float, lng: float) -> frozenset:
+        """
+        Returns the names of every Geofence containing a position.
+        """
+        row, col = _row_col(lat, lng, self.cell_size)
+        names = self._cells.get(row * self._n_cols + col)
+        if not names:
+            return frozenset()
+        fences = self.fences
+        return frozenset(
+            name for name in names if fences[name].contains(lat, lng))
+
+    def check(self, callsign, lat: float,
+              lng: float) -> typing.List[GeofenceEvent]:
+        """
+        Updates a Station's position, returning (and passing to `callback`)
+        any enter & exit events.
+        """
+        callsign = str(callsign)
+        now_inside = self.locate(lat, lng)
+        was_inside = self._inside.get(callsign, frozenset())
+        if now_inside == was_inside:
+            return []
+
+        if now_inside:
+            self._inside[callsign] = now_inside
+        else:
+            del self._inside[callsign]
+
+        events = (
+            [GeofenceEvent(GeofenceEvent.EXIT, callsign, name)
+             for name in was_inside - now_inside] +
+            [GeofenceEvent(GeofenceEvent.ENTER, callsign, name)
+             for name in now_inside - was_inside]
+        )
+        if self.callback:
+            for event in events:
+                self.callback(event)
+        return events
+
+    def handle_frame(self, frame) -> typing.List[GeofenceEvent]:
+        """
+        Checks the position of a `aprs.PositionFrame` or any `aprs.Frame`
+        carrying a Position Report. Frames without a position are ignored.
+        """
+        position = frame_position(frame)
+        if position is None:
+            return []
+        return self.check(frame.source, *position)
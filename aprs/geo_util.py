@@ -3,6 +3,10 @@
 
 """Python APRS Module Geo Utility Function Definitions."""
 
+import functools
+import math
+import typing
+
 import aprs.decimaldegrees
 
 __author__ = 'Greg Albrecht W2GMD <oss@undef.net>'  # NOQA pylint: disable=R0801
@@ -70,6 +74,49 @@ def dec2dm_lng(dec: float) -> str:
     return "%03d%05.2f%s" % (abs_deg, dec_min[1], suffix)
 
 
+def dm2dec_lat(dm_lat: typing.Union[bytes, str]) -> float:
+    """
+    Converts APRS Coord format Latitude to DecDeg. Inverse of `dec2dm_lat()`.
+
+    Position ambiguity spaces are treated as zeros.
+
+    Example:
+        >>> '%.5f' % dm2dec_lat('3744.51N')
+        '37.74183'
+        >>> '%.2f' % dm2dec_lat(b'0800.60S')
+        '-8.01'
+        >>> '%.2f' % dm2dec_lat('37  .  N')
+        '37.00'
+    """
+    if isinstance(dm_lat, (bytes, bytearray)):
+        dm_lat = dm_lat.decode('ascii')
+    dm_lat = dm_lat.replace(' ', '0')
+    dec = int(dm_lat[0:2]) + float(dm_lat[2:7]) / 60.0
+    if dm_lat[7] in 'Ss':
+        return -dec
+    return dec
+
+
+def dm2dec_lng(dm_lng: typing.Union[bytes, str]) -> float:
+    """
+    Converts APRS Coord format Longitude to DecDeg. Inverse of
+    `dec2dm_lng()`.
+
+    Example:
+        >>> '%.5f' % dm2dec_lng('12223.30E')
+        '122.38833'
+        >>> '%.2f' % dm2dec_lng(b'09900.60W')
+        '-99.01'
+    """
+    if isinstance(dm_lng, (bytes, bytearray)):
+        dm_lng = dm_lng.decode('ascii')
+    dm_lng = dm_lng.replace(' ', '0')
+    dec = int(dm_lng[0:3]) + float(dm_lng[3:8]) / 60.0
+    if dm_lng[8] in 'Ww':
+        return -dec
+    return dec
+
+
 def ambiguate(pos: float, ambiguity: int) -> str:
     """
     Adjust ambiguity of position.
@@ -97,6 +144,182 @@ def ambiguate(pos: float, ambiguity: int) -> str:
     return num.decode()
 
 
+@functools.lru_cache(maxsize=None)
+def _numpy():
+    """
+    Returns NumPy, imported on first use so `import aprs` doesn't pay for it,
+    or None if it isn't installed.
+    """
+    try:
+        import numpy  # pylint: disable=C0415
+    except ImportError:  # pragma: no cover
+        return None
+    return numpy
+
+
+def _unit_factor(units: str) -> float:
+    """Returns the conversion factor from kilometers to `units`."""
+    try:
+        return aprs.DISTANCE_UNITS[units]
+    except KeyError:
+        raise ValueError("Unknown distance units '%s', expected one of: %s" % (
+            units, ', '.join(sorted(aprs.DISTANCE_UNITS))))
+
+
+def distance(lat1, lng1, lat2, lng2, units: str='km'):
+    """
+    Great-Circle (Haversine) Distance between two positions.
+
+    Any of the arguments may be NumPy arrays, in which case the distance is
+    computed element-wise (scalar-to-array or array-to-array) and an array is
+    returned. Without NumPy only scalar arguments are supported.
+
+    >>> '%.1f' % distance(37.7418096, -122.38833, 40.7128, -74.006)
+    '4127.8'
+    >>> '%.1f' % distance(37.7418096, -122.38833, 40.7128, -74.006, 'mi')
+    '2564.9'
+    >>> '%.1f' % distance(37.7418096, -122.38833, 40.7128, -74.006, 'nm')
+    '2228.8'
+
+    :param lat1: Latitude(s) of the first position, in decimal degrees.
+    :param lng1: Longitude(s) of the first position, in decimal degrees.
+    :param lat2: Latitude(s) of the second position, in decimal degrees.
+    :param lng2: Longitude(s) of the second position, in decimal degrees.
+    :param units: One of 'km', 'mi' or 'nm'.
+    :type units: str
+
+    :returns: Distance(s) in `units`.
+    """
+    radius = aprs.EARTH_RADIUS_KM * _unit_factor(units)
+
+    numpy = _numpy()
+    if numpy is None:
+        lat1, lng1, lat2, lng2 = map(math.radians, (lat1, lng1, lat2, lng2))
+        hav = (math.sin((lat2 - lat1) / 2) ** 2 + math.cos(lat1) *
+               math.cos(lat2) * math.sin((lng2 - lng1) / 2) ** 2)
+        return 2 * radius * math.asin(math.sqrt(min(hav, 1.0)))
+
+    lat1 = numpy.radians(lat1)
+    lat2 = numpy.radians(lat2)
+    hav = numpy.sin((lat2 - lat1) * 0.5) ** 2
+    hav += (numpy.cos(lat1) * numpy.cos(lat2) *
+            numpy.sin(numpy.radians(numpy.subtract(lng2, lng1)) * 0.5) ** 2)
+    return 2 * radius * numpy.arcsin(numpy.sqrt(numpy.minimum(hav, 1.0)))
+
+
+def bearing(lat1, lng1, lat2, lng2):
+    """
+    Initial Great-Circle Bearing from the first position to the second.
+
+    Accepts scalars or NumPy arrays, like `distance()`.
+
+    >>> '%.1f' % bearing(37.7418096, -122.38833, 40.7128, -74.006)
+    '69.9'
+    >>> '%.1f' % bearing(0, 0, -1, 0)
+    '180.0'
+
+    :returns: Bearing(s) in degrees, clockwise from True North [0, 360).
+    """
+    numpy = _numpy()
+    if numpy is None:
+        lat1, lng1, lat2, lng2 = map(math.radians, (lat1, lng1, lat2, lng2))
+        d_lng = lng2 - lng1
+        theta = math.atan2(
+            math.sin(d_lng) * math.cos(lat2),
+            math.cos(lat1) * math.sin(lat2) -
+            math.sin(lat1) * math.cos(lat2) * math.cos(d_lng))
+        return math.degrees(theta) % 360.0
+
+    lat1 = numpy.radians(lat1)
+    lat2 = numpy.radians(lat2)
+    d_lng = numpy.radians(numpy.subtract(lng2, lng1))
+    cos_lat2 = numpy.cos(lat2)
+    theta = numpy.arctan2(
+        numpy.sin(d_lng) * cos_lat2,
+        numpy.cos(lat1) * numpy.sin(lat2) -
+        numpy.sin(lat1) * cos_lat2 * numpy.cos(d_lng))
+    return numpy.degrees(theta) % 360.0
+
+
+def bounding_box(lat: float, lng: float, radius: float,
+                 units: str='km') -> tuple:
+    """
+    Computes a lat/lng Bounding Box enclosing the circle of `radius` around
+    a position, for use as a cheap prefilter before `distance()`.
+
+    If the box crosses the anti-meridian, min_lng will be greater than
+    max_lng. If it reaches a pole, it spans all longitudes.
+
+    >>> [round(x, 4) for x in bounding_box(37.7418096, -122.38833, 10)]
+    [37.6519, -122.5021, 37.8317, -122.2746]
+    >>> [round(x, 4) for x in bounding_box(0, 179.99, 10)]
+    [-0.0899, 179.9001, 0.0899, -179.9201]
+
+    :returns: (min_lat, min_lng, max_lat, max_lng) in decimal degrees.
+    :rtype: tuple
+    """
+    ang = radius / (aprs.EARTH_RADIUS_KM * _unit_factor(units))
+    d_lat = math.degrees(ang)
+    min_lat = lat - d_lat
+    max_lat = lat + d_lat
+
+    if max_lat >= 90 or min_lat <= -90:
+        return (max(min_lat, -90.0), -180.0, min(max_lat, 90.0), 180.0)
+
+    d_lng = math.degrees(
+        math.asin(min(math.sin(ang) / math.cos(math.radians(lat)), 1.0)))
+    min_lng = lng - d_lng
+    max_lng = lng + d_lng
+    if min_lng < -180:
+        min_lng += 360
+    if max_lng > 180:
+        max_lng -= 360
+
+    return (min_lat, min_lng, max_lat, max_lng)
+
+
+def in_bounding_box(lat, lng, box: tuple):
+    """
+    Tests whether position(s) fall within a Bounding Box, as returned by
+    `bounding_box()`. Accepts scalars or NumPy arrays.
+
+    >>> box = bounding_box(37.7418096, -122.38833, 10)
+    >>> in_bounding_box(37.75, -122.4, box)
+    True
+    >>> in_bounding_box(40.7128, -74.006, box)
+    False
+
+    :returns: bool, or boolean array mask.
+    """
+    min_lat, min_lng, max_lat, max_lng = box
+    lat_mask = (lat >= min_lat) & (lat <= max_lat)
+    if min_lng <= max_lng:
+        return lat_mask & (lng >= min_lng) & (lng <= max_lng)
+    return lat_mask & ((lng >= min_lng) | (lng <= max_lng))
+
+
+def in_range(lat: float, lng: float, lats, lngs, radius: float,
+             units: str='km'):
+    """
+    Returns a boolean mask of the positions in the `lats` & `lngs` arrays
+    within `radius` of a position. Only positions passing the Bounding Box
+    prefilter have their Great-Circle distance computed.
+
+    Requires NumPy.
+
+    :returns: Boolean array mask, same shape as `lats`.
+    """
+    numpy = _numpy()
+    lats = numpy.asarray(lats, dtype=numpy.float64)
+    lngs = numpy.asarray(lngs, dtype=numpy.float64)
+    mask = in_bounding_box(lats, lngs, bounding_box(lat, lng, radius, units))
+    candidates = numpy.flatnonzero(mask)
+    if candidates.size:
+        mask[candidates] = distance(
+            lat, lng, lats[candidates], lngs[candidates], units) <= radius
+    return mask
+
+
 def run_doctest():  # pragma: no cover
     """Runs doctests for this module."""
     import doctest
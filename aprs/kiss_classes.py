@@ -186,7 +186,7 @@ class Frame(object):
 
             if path_call:
                 if ord(self.frame[i * 7 + 6]) & 0x80:
-                    path_call.digi = True
+                    path_call.set_digi(True)
 
                 self.path.append(path_call)
 
@@ -200,6 +200,14 @@ class SerialKISS(kiss.SerialKISS):
         self.send = self.write
         self.receive = self.read
         self.use_i_construct = False
+        self.metrics = aprs.metrics.InterfaceMetrics('serialkiss')
+        self.tap = None
+
+    @aprs.profiling.profiled
+    def read(self, read_bytes=None, callback=None, *args, **kwargs):  # NOQA pylint: disable=W1113
+        """Reads from the KISS device, counting Frames delivered."""
+        return _read(super(SerialKISS, self).read, self.metrics, self.tap,
+                     read_bytes, callback, args, kwargs)
 
     def write(self, frame):
         """Writes APRS-encoded frame to KISS device.
@@ -207,7 +215,10 @@ class SerialKISS(kiss.SerialKISS):
         :param frame: APRS frame to write to KISS device.
         :type frame: str
         """
-        super(SerialKISS, self).write(frame.encode_kiss())
+        encoded_frame = frame.encode_kiss()
+        super(SerialKISS, self).write(encoded_frame)
+        self.metrics.frames_sent.inc()
+        self.metrics.bytes_sent.inc(len(encoded_frame))
 
 
 class TCPKISS(kiss.TCPKISS):
@@ -219,6 +230,14 @@ class TCPKISS(kiss.TCPKISS):
         self.send = self.write
         self.receive = self.read
         self.use_i_construct = False
+        self.metrics = aprs.metrics.InterfaceMetrics('tcpkiss')
+        self.tap = None
+
+    @aprs.profiling.profiled
+    def read(self, read_bytes=None, callback=None, *args, **kwargs):  # NOQA pylint: disable=W1113
+        """Reads from the KISS device, counting Frames delivered."""
+        return _read(super(TCPKISS, self).read, self.metrics, self.tap,
+                     read_bytes, callback, args, kwargs)
 
     def write(self, frame):
         """
@@ -227,4 +246,26 @@ class TCPKISS(kiss.TCPKISS):
         :param frame: APRS frame to write to KISS device.
         :type frame: str
         """
-        super(TCPKISS, self).write(frame.encode_kiss())
+        encoded_frame = frame.encode_kiss()
+        super(TCPKISS, self).write(encoded_frame)
+        self.metrics.frames_sent.inc()
+        self.metrics.bytes_sent.inc(len(encoded_frame))
+
+
+def _read(read, metrics, tap, read_bytes, callback, args: tuple,
+          kwargs: dict):
+    """
+    Calls a `kiss` read, wrapping its callback (passed by position or
+    keyword) with `metrics` and recording its Frames to `tap`, if set.
+    """
+    if callback is not None:
+        if tap is not None:
+            tag = metrics.interface.encode()
+            tapped = callback
+
+            def callback(frame):
+                tap.record(frame, tag)
+                return tapped(frame)
+
+        callback = metrics.wrap_callback(callback)
+    return read(read_bytes, callback, *args, **kwargs)
@@ -0,0 +1,328 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Python APRS Module Text Log Reader Definitions.
+
+Random access to the Frames in large plain-text logs, by memory-mapping the
+log and keeping a compact line index: NumPy uint64 columns of the start &
+end offset of each Frame, and optionally a float64 column of receive
+timestamps. Comment ('#') & blank lines are not indexed.
+
+With `timestamps=True`, each line is expected to be prefixed with its
+receive time in UNIX seconds and a space, eg::
+
+    1792375200.25 W2GMD-6>APRS,TCPIP*:>test
+
+The index is persisted alongside the log (`<log>.lidx`) and extended as the
+log is appended to. If the log is truncated, rewritten or rotated (replaced
+by a new file at the same path), the index is rebuilt; lines that can't be
+read as timestamped get a NaN timestamp.
+"""
+
+import mmap
+import os
+import struct
+import tempfile
+import typing
+import zlib
+
+import numpy
+
+import aprs  # pylint: disable=R0801
+
+__author__ = 'Greg Albrecht W2GMD <oss@undef.net>'  # NOQA pylint: disable=R0801
+__copyright__ = 'Copyright 2017 Greg Albrecht and Contributors'  # NOQA pylint: disable=R0801
+__license__ = 'Apache License, Version 2.0'  # NOQA pylint: disable=R0801
+
+
+LINE_INDEX_MAGIC = b'APRSLIX\x01'
+SCAN_CHUNK_SIZE = 64 << 20
+
+# magic, flags, indexed length, crc32 of the log's first block, line count.
+_HEADER = struct.Struct('<8sIQIQ')
+_HEAD_SIZE = 65536
+_HAS_TIMESTAMPS = 0x1
+
+
+class LogReader(object):
+
+    """
+    Text Log Reader Class.
+
+    `reader[n]` returns the nth Frame line as a `memoryview` into the log,
+    and `reader.frame(n)` parses it with `aprs.parse_frame`. Views stay
+    valid across `refresh()`, which maps the log anew and leaves the old
+    map to be unmapped once its views are released, but must be released
+    before the reader is closed.
+    """
+
+    def __init__(self, path: str, timestamps: bool=False,
+                 index_path: str=None, save_index: bool=True) -> None:
+        self.path = path
+        self.index_path = index_path or path + '.lidx'
+        self.has_timestamps = timestamps
+        self.save_index = save_index
+
+        self.starts = numpy.zeros(0, dtype=numpy.uint64)
+        self.ends = numpy.zeros(0, dtype=numpy.uint64)
+        self.timestamps = numpy.zeros(0, dtype=numpy.float64)
+        self.indexed_length = 0
+        self._head_length = 0
+        self._head_crc_value = zlib.crc32(b'')
+
+        self._file = open(path, 'rb')
+        self._mmap = None
+        self._view = None
+        self._map()
+        if not self._load_index():
+            self._reset_index()
+        self.refresh()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args) -> None:
+        self.close()
+
+    def __len__(self) -> int:
+        return len(self.starts)
+
+    def __getitem__(self, n: int) -> memoryview:
+        return self._view[int(self.starts[n]):int(self.ends[n])]
+
+    def __iter__(self) -> typing.Iterator[memoryview]:
+        for n in range(len(self)):
+            yield self[n]
+
+    def _map(self) -> None:
+        size = os.fstat(self._file.fileno()).st_size
+        if self._view is not None and len(self._view) == size:
+            return
+        # The old map isn't closed, as views of it may still be held: it's
+        # unmapped when the last of them is released.
+        if size:
+            self._mmap = mmap.mmap(
+                self._file.fileno(), 0, access=mmap.ACCESS_READ)
+            self._view = memoryview(self._mmap)
+        else:
+            self._mmap = None
+            self._view = memoryview(b'')
+
+    def _reopen_if_rotated(self) -> bool:
+        """
+        Reopens the log if another file has replaced it at its path.
+
+        :returns: True if the log was reopened.
+        """
+        try:
+            path_stat = os.stat(self.path)
+        except OSError:
+            # Rotated away, and not yet replaced.
+            return False
+        file_stat = os.fstat(self._file.fileno())
+        if (path_stat.st_ino, path_stat.st_dev) == (
+                file_stat.st_ino, file_stat.st_dev):
+            return False
+        self._file.close()
+        self._file = open(self.path, 'rb')
+        self._view = None
+        return True
+
+    def _reset_index(self) -> None:
+        self.starts = numpy.zeros(0, dtype=numpy.uint64)
+        self.ends = numpy.zeros(0, dtype=numpy.uint64)
+        self.timestamps = numpy.zeros(0, dtype=numpy.float64)
+        self.indexed_length = 0
+        self._head_length = 0
+        self._head_crc_value = zlib.crc32(b'')
+
+    def _head_crc(self, length: int) -> int:
+        """Checksums the start of the log, to detect a rewritten log."""
+        head = self._view[:min(_HEAD_SIZE, length)]
+        crc = zlib.crc32(head)
+        head.release()
+        return crc
+
+    def close(self) -> None:
+        """Closes the log."""
+        self._view.release()
+        if self._mmap is not None:
+            self._mmap.close()
+        self._file.close()
+
+    def frame(self, n: int):
+        """Returns the nth Frame, parsed by `aprs.parse_frame`."""
+        return aprs.parse_frame(self[n])
+
+    def timestamp(self, n: int) -> float:
+        """Returns the receive timestamp of the nth Frame."""
+        return float(self.timestamps[n])
+
+    def search(self, timestamp: float) -> int:
+        """
+        Returns the number of the first Frame received at or after
+        `timestamp`, by binary search. Timestamps must be non-decreasing.
+        """
+        return int(numpy.searchsorted(self.timestamps, timestamp, 'left'))
+
+    def between(self, start: float, end: float) -> range:
+        """
+        Returns the range of Frame numbers received in [start, end).
+        """
+        return range(self.search(start), self.search(end))
+
+    def refresh(self) -> int:
+        """
+        Indexes any lines appended to the log since it was last indexed,
+        saving the index if it changed. The index is rebuilt if the log was
+        truncated, rewritten or rotated.
+
+        :returns: Number of Frames added to the index.
+        :rtype: int
+        """
+        rebuild = self._reopen_if_rotated()
+        self._map()
+        size = len(self._view)
+        if (rebuild or size < self.indexed_length or
+                self._head_crc(self._head_length) != self._head_crc_value):
+            self._reset_index()
+        if size <= self.indexed_length:
+            return 0
+
+        starts, ends, stamps, indexed_length = self._scan(
+            self.indexed_length, size)
+        if indexed_length == self.indexed_length:
+            return 0
+
+        self.starts = numpy.concatenate([self.starts, starts])
+        self.ends = numpy.concatenate([self.ends, ends])
+        if self.has_timestamps:
+            self.timestamps = numpy.concatenate([self.timestamps, stamps])
+        self.indexed_length = indexed_length
+        self._head_length = min(_HEAD_SIZE, indexed_length)
+        self._head_crc_value = self._head_crc(self._head_length)
+
+        if self.save_index:
+            self._save_index()
+        return len(starts)
+
+    def _scan(self, start: int, end: int) -> tuple:
+        """
+        Finds the Frame lines in [start, end). Only lines terminated by a
+        newline are indexed, so a partially written last line is picked up
+        by a later `refresh()`.
+        """
+        data = numpy.frombuffer(self._mmap, dtype=numpy.uint8)
+        try:
+            newlines = [
+                numpy.flatnonzero(data[pos:min(pos + SCAN_CHUNK_SIZE, end)] ==
+                                  ord('\n')).astype(numpy.uint64) + pos
+                for pos in range(start, end, SCAN_CHUNK_SIZE)
+            ]
+            ends = numpy.concatenate(newlines)
+            if not len(ends):
+                empty = numpy.zeros(0, dtype=numpy.uint64)
+                return (empty, empty, numpy.zeros(0), start)
+
+            indexed_length = int(ends[-1]) + 1
+            starts = numpy.empty_like(ends)
+            starts[0] = start
+            starts[1:] = ends[:-1] + 1
+
+            # Drop the '\r' of '\r\n' line endings.
+            crlf = (ends > starts)
+            crlf[crlf] = (
+                data[(ends[crlf] - 1).astype(numpy.intp)] == ord('\r'))
+            ends[crlf] -= 1
+
+            # Drop blank & comment lines.
+            keep = ends > starts
+            keep[keep] = data[starts[keep].astype(numpy.intp)] != ord('#')
+            starts = starts[keep]
+            ends = ends[keep]
+        finally:
+            del data
+
+        stamps = numpy.zeros(0)
+        if self.has_timestamps:
+            stamps = numpy.empty(len(starts), dtype=numpy.float64)
+            mm_find = self._mmap.find
+            for i in range(len(starts)):
+                line_start = int(starts[i])
+                space = mm_find(b' ', line_start, int(ends[i]))
+                if space < 0:
+                    stamps[i] = numpy.nan
+                    continue
+                try:
+                    stamps[i] = float(self._mmap[line_start:space])
+                except ValueError:
+                    stamps[i] = numpy.nan
+                    continue
+                starts[i] = space + 1
+
+        return (starts, ends, stamps, indexed_length)
+
+    def _save_index(self) -> None:
+        """Atomically writes the index."""
+        flags = _HAS_TIMESTAMPS if self.has_timestamps else 0
+        fd, tmp_path = tempfile.mkstemp(
+            prefix='.log-idx-',
+            dir=os.path.dirname(os.path.abspath(self.index_path)))
+        try:
+            with os.fdopen(fd, 'wb') as tmp_file:
+                tmp_file.write(_HEADER.pack(
+                    LINE_INDEX_MAGIC, flags, self.indexed_length,
+                    self._head_crc_value, len(self.starts)))
+                tmp_file.write(self.starts.astype('<u8').tobytes())
+                tmp_file.write(self.ends.astype('<u8').tobytes())
+                if self.has_timestamps:
+                    tmp_file.write(self.timestamps.astype('<f8').tobytes())
+            os.replace(tmp_path, self.index_path)
+        except BaseException:
+            os.unlink(tmp_path)
+            raise
+
+    def _load_index(self) -> bool:
+        """
+        Memory-maps a saved index, if it matches this log.
+
+        :returns: True if the index was loaded.
+        """
+        try:
+            with open(self.index_path, 'rb') as idx_file:
+                header = idx_file.read(_HEADER.size)
+        except OSError:
+            return False
+        if len(header) != _HEADER.size:
+            return False
+
+        magic, flags, indexed_length, head_crc, count = _HEADER.unpack(header)
+        if (magic != LINE_INDEX_MAGIC or
+                bool(flags & _HAS_TIMESTAMPS) != self.has_timestamps or
+                indexed_length > len(self._view)):
+            return False
+
+        head_length = min(_HEAD_SIZE, indexed_length)
+        if self._head_crc(head_length) != head_crc:
+            return False
+
+        columns = 3 if self.has_timestamps else 2
+        expected_size = _HEADER.size + count * 8 * columns
+        if os.path.getsize(self.index_path) != expected_size:
+            return False
+
+        offset = _HEADER.size
+        if count:
+            self.starts = numpy.memmap(
+                self.index_path, '<u8', 'r', offset, (count,))
+            self.ends = numpy.memmap(
+                self.index_path, '<u8', 'r', offset + count * 8, (count,))
+            if self.has_timestamps:
+                self.timestamps = numpy.memmap(
+                    self.index_path, '<f8', 'r', offset + count * 16,
+                    (count,))
+        self.indexed_length = indexed_length
+        self._head_length = head_length
+        self._head_crc_value = head_crc
+        return True
@@ -0,0 +1,391 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Python APRS Module Metrics Definitions.
+
+Counters, Gauges & Histograms for the Interfaces & parsers, readable as a
+dict or in the Prometheus text exposition format::
+
+    aprs_conn = aprs.TCP(b'W2GMD', b'12345')
+    aprs.metrics.REGISTRY.serve(9108)  # http://localhost:9108/metrics
+    ...
+    aprs.metrics.REGISTRY.as_dict()
+
+Counters & Histograms are kept in per-thread cells that are only summed
+when read, so updating them never takes a lock. Each Interface has an
+`InterfaceMetrics` as its `metrics` attribute, labelled with the
+Interface's class name & registered in `REGISTRY`; assign another to
+record to a different `MetricsRegistry`.
+"""
+
+import bisect
+import threading
+import time
+import typing
+
+__author__ = 'Greg Albrecht W2GMD <oss@undef.net>'  # NOQA pylint: disable=R0801
+__copyright__ = 'Copyright 2017 Greg Albrecht and Contributors'  # NOQA pylint: disable=R0801
+__license__ = 'Apache License, Version 2.0'  # NOQA pylint: disable=R0801
+
+
+# Callback latency Histogram bucket upper bounds, in seconds.
+LATENCY_BUCKETS = (0.00001, 0.00005, 0.0001, 0.0005, 0.001, 0.005, 0.01,
+                   0.05, 0.1, 0.5, 1.0, 5.0)
+
+PROMETHEUS_CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
+
+
+def _label_text(labels: tuple) -> str:
+    if not labels:
+        return ''
+    return '{%s}' % ','.join(
+        '%s="%s"' % (name, str(value).replace('\\', '\\\\').replace(
+            '"', '\\"').replace('\n', '\\n'))
+        for name, value in labels)
+
+
+class _Cells(object):
+
+    """Per-thread cells, created on a thread's first update."""
+
+    __slots__ = ['_local', '_lock', 'cells', '_size']
+
+    def __init__(self, size: int) -> None:
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self.cells: typing.List[list] = []
+        self._size = size
+
+    def cell(self) -> list:
+        """Returns this thread's cell."""
+        try:
+            return self._local.cell
+        except AttributeError:
+            cell = [0] * self._size
+            with self._lock:
+                self.cells.append(cell)
+            self._local.cell = cell
+            return cell
+
+
+class Counter(object):
+
+    """
+    Counter Class.
+
+    A monotonically increasing count.
+    """
+
+    __slots__ = ['name', 'labels', '_cells']
+
+    kind = 'counter'
+
+    def __init__(self, name: str, labels: tuple=()) -> None:
+        self.name = name
+        self.labels = labels
+        self._cells = _Cells(1)
+
+    def __repr__(self) -> str:
+        return '%s%s %r' % (self.name, _label_text(self.labels), self.value)
+
+    def inc(self, amount: int=1) -> None:
+        """Adds `amount` to the count."""
+        self._cells.cell()[0] += amount
+
+    @property
+    def value(self):
+        """The current count."""
+        return sum(cell[0] for cell in self._cells.cells)
+
+    def samples(self) -> typing.List[tuple]:
+        """Returns the (name, labels, value) Prometheus samples."""
+        return [(self.name, self.labels, self.value)]
+
+
+class Gauge(object):
+
+    """
+    Gauge Class.
+
+    A value that is set, eg a queue depth or a last-heard timestamp.
+    """
+
+    __slots__ = ['name', 'labels', 'value']
+
+    kind = 'gauge'
+
+    def __init__(self, name: str, labels: tuple=()) -> None:
+        self.name = name
+        self.labels = labels
+        self.value = 0
+
+    def __repr__(self) -> str:
+        return '%s%s %r' % (self.name, _label_text(self.labels), self.value)
+
+    def set(self, value) -> None:
+        """Sets the value."""
+        self.value = value
+
+    def samples(self) -> typing.List[tuple]:
+        """Returns the (name, labels, value) Prometheus samples."""
+        return [(self.name, self.labels, self.value)]
+
+
+class Histogram(object):
+
+    """
+    Histogram Class.
+
+    Counts observations (eg, latencies in seconds) into buckets by upper
+    bound, with their sum.
+    """
+
+    __slots__ = ['name', 'labels', 'buckets', '_cells']
+
+    kind = 'histogram'
+
+    def __init__(self, name: str, labels: tuple=(),
+                 buckets: typing.Sequence[float]=LATENCY_BUCKETS) -> None:
+        self.name = name
+        self.labels = labels
+        self.buckets = tuple(sorted(buckets))
+        # Bucket counts, then the +Inf bucket count, then the sum.
+        self._cells = _Cells(len(self.buckets) + 2)
+
+    def __repr__(self) -> str:
+        return '%s%s count=%d' % (
+            self.name, _label_text(self.labels), self.count)
+
+    def observe(self, value: float) -> None:
+        """Records an observation."""
+        cell = self._cells.cell()
+        cell[bisect.bisect_left(self.buckets, value)] += 1
+        cell[-1] += value
+
+    def _totals(self) -> list:
+        totals = [0] * (len(self.buckets) + 2)
+        for cell in self._cells.cells:
+            for index, value in enumerate(cell):
+                totals[index] += value
+        return totals
+
+    @property
+    def count(self) -> int:
+        """The number of observations."""
+        return sum(self._totals()[:-1])
+
+    @property
+    def value(self) -> dict:
+        """
+        Returns the observation count, sum & cumulative count per bucket
+        upper bound.
+        """
+        totals = self._totals()
+        cumulative = 0
+        buckets = {}
+        for bound, count in zip(self.buckets + (float('inf'),), totals):
+            cumulative += count
+            buckets[bound] = cumulative
+        return {'count': cumulative, 'sum': totals[-1], 'buckets': buckets}
+
+    def samples(self) -> typing.List[tuple]:
+        """Returns the (name, labels, value) Prometheus samples."""
+        value = self.value
+        samples = []
+        for bound, count in value['buckets'].items():
+            samples.append((self.name + '_bucket',
+                            self.labels + (('le', _prometheus_float(bound)),),
+                            count))
+        samples.append((self.name + '_sum', self.labels, value['sum']))
+        samples.append((self.name + '_count', self.labels, value['count']))
+        return samples
+
+
+def _prometheus_float(value: float) -> str:
+    if value == float('inf'):
+        return '+Inf'
+    return repr(float(value))
+
+
+class MetricsRegistry(object):
+
+    """
+    Metrics Registry Class.
+
+    Creates (or returns the existing) metric for each name & label set.
+    """
+
+    def __init__(self) -> None:
+        self._metrics: typing.Dict[tuple, object] = {}
+        self._help: typing.Dict[str, str] = {}
+        self._lock = threading.Lock()
+
+    def _metric(self, metric_class, name: str, help_text: str,
+                labels: dict, **kwargs):
+        key = (name, tuple(sorted(labels.items())))
+        metric = self._metrics.get(key)
+        if metric is None:
+            with self._lock:
+                metric = self._metrics.get(key)
+                if metric is None:
+                    metric = metric_class(name, key[1], **kwargs)
+                    self._metrics[key] = metric
+                    self._help.setdefault(name, help_text)
+        if not isinstance(metric, metric_class):
+            raise ValueError('Metric %s is a %s, not a %s' % (
+                name, metric.kind, metric_class.kind))
+        return metric
+
+    def counter(self, name: str, help_text: str='', **labels) -> Counter:
+        """Returns the Counter `name` with `labels`."""
+        return self._metric(Counter, name, help_text, labels)
+
+    def gauge(self, name: str, help_text: str='', **labels) -> Gauge:
+        """Returns the Gauge `name` with `labels`."""
+        return self._metric(Gauge, name, help_text, labels)
+
+    def histogram(self, name: str, help_text: str='',
+                  buckets: typing.Sequence[float]=LATENCY_BUCKETS,
+                  **labels) -> Histogram:
+        """Returns the Histogram `name` with `labels`."""
+        return self._metric(Histogram, name, help_text, labels,
+                            buckets=buckets)
+
+    def metrics(self) -> list:
+        """Returns all metrics, ordered by name & labels."""
+        return [self._metrics[key] for key in sorted(self._metrics)]
+
+    def as_dict(self) -> dict:
+        """
+        Returns the current value of each metric, keyed by its name &
+        labels as in the Prometheus exposition, eg
+        'aprs_frames_received_total{interface="tcp"}'.
+        """
+        return {metric.name + _label_text(metric.labels): metric.value
+                for metric in self.metrics()}
+
+    def prometheus(self) -> str:
+        """Returns all metrics in the Prometheus text exposition format."""
+        lines = []
+        described = set()
+        for metric in self.metrics():
+            if metric.name not in described:
+                described.add(metric.name)
+                if self._help.get(metric.name):
+                    lines.append('# HELP %s %s' % (
+                        metric.name, self._help[metric.name]))
+                lines.append('# TYPE %s %s' % (metric.name, metric.kind))
+            for name, labels, value in metric.samples():
+                lines.append('%s%s %s' % (name, _label_text(labels), value))
+        return '\n'.join(lines) + '\n'
+
+    def serve(self, port: int=9108, host: str=''):
+        """
+        Serves the Prometheus exposition over HTTP from a daemon thread.
+
+        :returns: The HTTP server; `shutdown()` it to stop serving.
+        """
+        import http.server  # pylint: disable=C0415
+
+        registry = self
+
+        class _Handler(http.server.BaseHTTPRequestHandler):
+
+            def do_GET(self):  # pylint: disable=C0103
+                """Responds with the metrics."""
+                body = registry.prometheus().encode('UTF-8')
+                self.send_response(200)
+                self.send_header('Content-Type', PROMETHEUS_CONTENT_TYPE)
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args) -> None:
+                pass
+
+        server = http.server.ThreadingHTTPServer((host, port), _Handler)
+        server.daemon_threads = True
+        thread = threading.Thread(target=server.serve_forever, daemon=True)
+        thread.start()
+        return server
+
+
+REGISTRY = MetricsRegistry()
+
+
+class InterfaceMetrics(object):
+
+    """
+    Interface Metrics Class.
+
+    The metrics of one kind of Interface, labelled `interface=<name>`.
+    """
+
+    __slots__ = ['registry', 'interface', 'frames_received', 'frames_sent',
+                 'bytes_received', 'bytes_sent', 'reconnects', 'keepalive',
+                 'queue_depth', 'callback_latency', '_parse_errors']
+
+    def __init__(self, interface: str,
+                 registry: MetricsRegistry=None) -> None:
+        registry = registry or REGISTRY
+        self.registry = registry
+        self.interface = interface
+        self.frames_received = registry.counter(
+            'aprs_frames_received_total', 'Frames received.',
+            interface=interface)
+        self.frames_sent = registry.counter(
+            'aprs_frames_sent_total', 'Frames sent.', interface=interface)
+        self.bytes_received = registry.counter(
+            'aprs_bytes_received_total', 'Bytes received.',
+            interface=interface)
+        self.bytes_sent = registry.counter(
+            'aprs_bytes_sent_total', 'Bytes sent.', interface=interface)
+        self.reconnects = registry.counter(
+            'aprs_reconnects_total', 'Connection attempts after the first.',
+            interface=interface)
+        self.keepalive = registry.gauge(
+            'aprs_keepalive_timestamp_seconds',
+            'UNIX time the last server keepalive was heard.',
+            interface=interface)
+        self.queue_depth = registry.gauge(
+            'aprs_queue_depth', 'Lines received & waiting to be handled.',
+            interface=interface)
+        self.callback_latency = registry.histogram(
+            'aprs_callback_latency_seconds',
+            'Time spent in the receive callback, per Frame.',
+            interface=interface)
+        self._parse_errors: typing.Dict[str, Counter] = {}
+
+    def __repr__(self) -> str:
+        return '<InterfaceMetrics %s>' % self.interface
+
+    def parse_error(self, error: Exception) -> None:
+        """Counts a parse error, by exception type."""
+        error_type = type(error).__name__
+        counter = self._parse_errors.get(error_type)
+        if counter is None:
+            counter = self.registry.counter(
+                'aprs_parse_errors_total', 'Frames that failed to parse.',
+                interface=self.interface, error=error_type)
+            self._parse_errors[error_type] = counter
+        counter.inc()
+
+    def wrap_callback(self, callback: typing.Callable) -> typing.Callable:
+        """
+        Wraps a receive callback to count the Frames it is called with and
+        record its latency.
+        """
+        perf_counter = time.perf_counter
+        frames_received = self.frames_received
+        observe = self.callback_latency.observe
+
+        def _callback(frame, *args, **kwargs):
+            frames_received.inc()
+            start = perf_counter()
+            try:
+                return callback(frame, *args, **kwargs)
+            finally:
+                observe(perf_counter() - start)
+
+        return _callback
@@ -0,0 +1,343 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Python APRS Module Prefilter Definitions.
+
+Tests the header of raw APRS-IS text lines with `bytes.find` &
+`bytes.startswith` over offsets into the line, without building any
+`aprs.Frame` or `aprs.Callsign`, so only lines that pass are fully parsed::
+
+    prefilter = aprs.prefilter.Prefilter(
+        aprs.prefilter.path_contains(b'qAR') &
+        ~aprs.prefilter.tocall_prefix(b'APRS') &
+        aprs.prefilter.data_type(b'!', b'=', b'/', b'@'))
+
+    aprs_conn.receive(callback=prefilter.wrap(handle_frame),
+                      frame_handler=None)
+
+`aprsis_filter` builds a Predicate from an APRS-IS server-side filter
+string, eg b'p/W2GMD r/37.7/-122.4/50 t/pm -b/W2GMD-1'.
+"""
+
+import typing
+
+import aprs  # pylint: disable=R0801
+
+__author__ = 'Greg Albrecht W2GMD <oss@undef.net>'  # NOQA pylint: disable=R0801
+__copyright__ = 'Copyright 2017 Greg Albrecht and Contributors'  # NOQA pylint: disable=R0801
+__license__ = 'Apache License, Version 2.0'  # NOQA pylint: disable=R0801
+
+
+# Bytes that can follow a complete Path element.
+_PATH_ELEMENT_ENDS = frozenset(b',:*')
+
+# APRS-IS Type filter (t/) letters to Data Type Identifiers.
+APRSIS_FILTER_TYPES = {
+    ord('p'): (b'!', b'=', b'/', b'@', b'`', b"'"),
+    ord('o'): (b';',),
+    ord('i'): (b')',),
+    ord('m'): (b':',),
+    ord('q'): (b'?',),
+    ord('s'): (b'>',),
+    ord('t'): (b'T',),
+    ord('u'): (b'{',),
+    ord('w'): (b'_',),
+}
+
+
+class Predicate(object):
+
+    """
+    Predicate Class.
+
+    Wraps a function of (line, source_end, path_end), where `source_end` is
+    the offset of the '>' after the Source Callsign and `path_end` the
+    offset of the ':' before the Information Field. Predicates compose with
+    `&`, `|` and `~`.
+    """
+
+    __slots__ = ['func', 'name']
+
+    def __init__(self, func: typing.Callable[[bytes, int, int], bool],
+                 name: str='predicate') -> None:
+        self.func = func
+        self.name = name
+
+    def __repr__(self) -> str:
+        return self.name
+
+    def __call__(self, line: bytes, source_end: int, path_end: int) -> bool:
+        return self.func(line, source_end, path_end)
+
+    def __and__(self, other: 'Predicate') -> 'Predicate':
+        left = self.func
+        right = other.func
+        return Predicate(
+            lambda line, src, pth: left(line, src, pth) and
+            right(line, src, pth),
+            '(%s & %s)' % (self, other))
+
+    def __or__(self, other: 'Predicate') -> 'Predicate':
+        left = self.func
+        right = other.func
+        return Predicate(
+            lambda line, src, pth: left(line, src, pth) or
+            right(line, src, pth),
+            '(%s | %s)' % (self, other))
+
+    def __invert__(self) -> 'Predicate':
+        func = self.func
+        return Predicate(
+            lambda line, src, pth: not func(line, src, pth),
+            '~%s' % self)
+
+
+def source_prefix(*prefixes: bytes) -> Predicate:
+    """Passes lines whose Source Callsign starts with any of `prefixes`."""
+    return Predicate(
+        lambda line, src, pth: line.startswith(prefixes, 0, src),
+        'source_prefix%r' % (prefixes,))
+
+
+def source_is(*callsigns: bytes) -> Predicate:
+    """Passes lines whose Source Callsign (with SSID) is in `callsigns`."""
+    callsigns = frozenset(callsigns)
+    return Predicate(
+        lambda line, src, pth: line[:src] in callsigns,
+        'source_is%r' % (tuple(sorted(callsigns)),))
+
+
+def tocall_prefix(*prefixes: bytes) -> Predicate:
+    """Passes lines whose Destination starts with any of `prefixes`."""
+    return Predicate(
+        lambda line, src, pth: line.startswith(prefixes, src + 1, pth),
+        'tocall_prefix%r' % (prefixes,))
+
+
+def path_contains(element: bytes) -> Predicate:
+    """
+    Passes lines whose Path contains `element` as a whole Path entry, eg
+    b'qAR' or b'WIDE2', ignoring any digipeated '*' mark.
+    """
+    needle = b',' + element
+    needle_len = len(needle)
+
+    def _path_contains(line: bytes, src: int, pth: int) -> bool:
+        pos = line.find(needle, src, pth)
+        while pos >= 0:
+            if line[pos + needle_len] in _PATH_ELEMENT_ENDS:
+                return True
+            pos = line.find(needle, pos + needle_len, pth)
+        return False
+
+    return Predicate(_path_contains, 'path_contains(%r)' % element)
+
+
+def digipeated_by(*callsigns: bytes) -> Predicate:
+    """
+    Passes lines digipeated by any of `callsigns`, ie whose Path contains
+    the Callsign at or before the last digipeated '*' mark. Callsigns
+    ending in '*' match as prefixes.
+    """
+    prefixes = tuple(callsign[:-1] for callsign in callsigns
+                     if callsign.endswith(b'*'))
+    exact = frozenset(callsign for callsign in callsigns
+                      if not callsign.endswith(b'*'))
+
+    def _digipeated_by(line: bytes, src: int, pth: int) -> bool:
+        used = line.rfind(b'*', src, pth)
+        if used < 0:
+            return False
+        # Skips the Destination, the first element after the Source.
+        for element in line[src + 1:used].split(b',')[1:]:
+            element = element.rstrip(b'*')
+            if element in exact or (prefixes and element.startswith(prefixes)):
+                return True
+        return False
+
+    return Predicate(
+        _digipeated_by, 'digipeated_by%r' % (tuple(sorted(callsigns)),))
+
+
+def data_type(*identifiers: bytes) -> Predicate:
+    """
+    Passes lines whose Information Field starts with any of the Data Type
+    Identifiers in `identifiers`.
+    """
+    return Predicate(
+        lambda line, src, pth: line.startswith(identifiers, pth + 1),
+        'data_type%r' % (identifiers,))
+
+
+def info_contains(needle: bytes) -> Predicate:
+    """Passes lines whose Information Field contains `needle`."""
+    return Predicate(
+        lambda line, src, pth: line.find(needle, pth + 1) >= 0,
+        'info_contains(%r)' % needle)
+
+
+def in_range(lat: float, lng: float, radius: float) -> Predicate:
+    """
+    Passes lines whose Position Report (see `aprs.parse_position`) lies
+    within `radius` km of a position.
+    """
+    box = aprs.bounding_box(lat, lng, radius)
+    parse_position = aprs.parse_position
+
+    def _in_range(line: bytes, src: int, pth: int) -> bool:
+        position = parse_position(line[pth + 1:])
+        if position is None or \
+                not aprs.in_bounding_box(position[0], position[1], box):
+            return False
+        return aprs.distance(lat, lng, position[0], position[1]) <= radius
+
+    return Predicate(_in_range, 'in_range(%r, %r, %r)' % (lat, lng, radius))
+
+
+def nothing() -> Predicate:
+    """Passes no lines."""
+    return Predicate(lambda line, src, pth: False, 'nothing()')
+
+
+def _source_match(*patterns: bytes) -> Predicate:
+    """Budlist (b/) match: exact Callsigns, or prefixes ending in '*'."""
+    prefixes = tuple(pattern[:-1] for pattern in patterns
+                     if pattern.endswith(b'*'))
+    exact = [pattern for pattern in patterns if not pattern.endswith(b'*')]
+    predicates = []
+    if exact:
+        predicates.append(source_is(*exact))
+    if prefixes:
+        predicates.append(source_prefix(*prefixes))
+    return _any(predicates)
+
+
+def _any(predicates: typing.List[Predicate]) -> Predicate:
+    if not predicates:
+        return nothing()
+    combined = predicates[0]
+    for predicate in predicates[1:]:
+        combined = combined | predicate
+    return combined
+
+
+def _filter_entry(entry: bytes) -> Predicate:
+    kind, _, args = entry.partition(b'/')
+    args = [arg.upper() for arg in args.split(b'/') if arg]
+    if kind == b'p' and args:
+        return source_prefix(*args)
+    elif kind == b'b' and args:
+        return _source_match(*args)
+    elif kind == b'd' and args:
+        return digipeated_by(*args)
+    elif kind == b't' and args:
+        identifiers = []
+        for letter in args[0].lower():
+            identifiers.extend(APRSIS_FILTER_TYPES.get(letter, ()))
+        if identifiers:
+            return data_type(*identifiers)
+    elif kind == b'r' and len(args) == 3:
+        return in_range(float(args[0]), float(args[1]), float(args[2]))
+    raise ValueError('Unsupported APRS-IS filter: %r' % entry)
+
+
+def aprsis_filter(spec: typing.Union[str, bytes]) -> Predicate:
+    """
+    Builds a Predicate from an APRS-IS filter string.
+
+    Supports the Prefix (p/), Budlist (b/), Digipeater (d/), Type (t/) &
+    Range (r/) filters, trailing '*' wildcards in Budlist & Digipeater
+    filters, and their '-' exclusions. As on APRS-IS, Digipeater filters
+    only pass Path elements that have digipeated the line. Unsupported or
+    malformed entries are ignored, as APRS-IS servers do. Without any
+    (supported) filter, no lines pass.
+
+    >>> predicate = aprsis_filter(b'p/W2GMD t/s -b/W2GMD-1')
+    >>> Prefilter(predicate).match(b'W2GMD-6>APRS:>status')
+    True
+    >>> Prefilter(predicate).match(b'W2GMD-1>APRS:>status')
+    False
+    """
+    if isinstance(spec, str):
+        spec = bytes(spec, 'UTF-8')
+    includes = []
+    excludes = []
+    for entry in spec.split():
+        exclude = entry.startswith(b'-')
+        try:
+            predicate = _filter_entry(entry.lstrip(b'-'))
+        except ValueError:
+            continue
+        if exclude:
+            excludes.append(predicate)
+        else:
+            includes.append(predicate)
+
+    predicate = _any(includes)
+    if excludes:
+        predicate = predicate & ~_any(excludes)
+    return predicate
+
+
+class Prefilter(object):
+
+    """
+    Prefilter Class.
+
+    Finds the header delimiters of each line once and applies a Predicate.
+    Lines without a '>' before a ':' never pass. `memoryview` lines are
+    copied to `bytes` once, as memoryviews have no `find`.
+    """
+
+    __slots__ = ['predicate', 'scanned', 'passed']
+
+    def __init__(self, predicate: Predicate) -> None:
+        self.predicate = predicate
+        self.scanned = 0
+        self.passed = 0
+
+    def match(self, line: typing.Union[bytes, memoryview]) -> bool:
+        """Tests one line."""
+        if isinstance(line, memoryview):
+            line = line.tobytes()
+        self.scanned += 1
+        source_end = line.find(b'>')
+        if source_end < 0:
+            return False
+        path_end = line.find(b':', source_end)
+        if path_end < 0:
+            return False
+        if self.predicate.func(line, source_end, path_end):
+            self.passed += 1
+            return True
+        return False
+
+    def filter(self, lines: typing.Iterable[bytes]) -> \
+            typing.Iterator[bytes]:
+        """Yields the lines that pass."""
+        match = self.match
+        for line in lines:
+            if match(line):
+                yield line
+
+    def frames(self, lines: typing.Iterable[bytes]) -> typing.Iterator:
+        """Yields the lines that pass, parsed by `aprs.parse_frame`."""
+        parse_frame = aprs.parse_frame
+        for line in self.filter(lines):
+            yield parse_frame(line)
+
+    def wrap(self, callback: typing.Callable) -> typing.Callable:
+        """
+        Wraps a Frame callback as a raw line callback for
+        `aprs.TCP.receive(callback, frame_handler=None)`, parsing only the
+        lines that pass.
+        """
+        match = self.match
+        parse_frame = aprs.parse_frame
+
+        def _callback(line: bytes) -> None:
+            if match(line):
+                callback(parse_frame(line))
+
+        return _callback
@@ -0,0 +1,264 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Python APRS Module Profiling Definitions.
+
+Opt-in profiling of the hot-path parse, encode & receive functions,
+enabled at import time by the APRS_PROFILE Environment Variable, like
+DEBUG::
+
+    $ APRS_PROFILE=1 python my_igate.py       # count & time every call
+    $ APRS_PROFILE=sample python my_igate.py  # sample stacks, production
+
+With APRS_PROFILE=1, each `profiled` function is wrapped with a call
+counter & timer, which costs ~0.5us per call. With APRS_PROFILE=sample,
+functions are left unwrapped and a daemon thread instead samples the
+stacks of all threads every APRS_PROFILE_INTERVAL seconds (default 5ms),
+counting the samples each profiled function is on the stack for, which
+costs well under 1%. Sampled times are wall-clock: time blocked in a
+function, eg a receive loop waiting on its socket, is counted.
+
+A summary sorted by total time is written at exit, and can be read at any
+time with `aprs.profiling.PROFILER.summary()` or written with
+`aprs.profiling.PROFILER.dump()`. When APRS_PROFILE is unset (or '0',
+'false', 'no' or 'off'), `profiled` returns functions unchanged and
+profiling costs nothing.
+"""
+
+import atexit
+import functools
+import sys
+import threading
+import time
+import typing
+
+import aprs  # pylint: disable=R0801
+
+__author__ = 'Greg Albrecht W2GMD <oss@undef.net>'  # NOQA pylint: disable=R0801
+__copyright__ = 'Copyright 2017 Greg Albrecht and Contributors'  # NOQA pylint: disable=R0801
+__license__ = 'Apache License, Version 2.0'  # NOQA pylint: disable=R0801
+
+
+def _name(func: typing.Callable) -> str:
+    return '%s.%s' % (func.__module__, func.__qualname__)
+
+
+class CallStats(object):
+
+    """
+    Call Stats Class.
+
+    Call count & timings of one profiled function.
+    """
+
+    __slots__ = ['name', 'calls', 'total_ns', 'max_ns']
+
+    def __init__(self, name: str) -> None:
+        self.name = name
+        self.calls = 0
+        self.total_ns = 0
+        self.max_ns = 0
+
+    def __repr__(self) -> str:
+        return '<CallStats %s calls=%d>' % (self.name, self.calls)
+
+    def as_dict(self) -> dict:
+        """Returns the call count, and mean, max & total time in seconds."""
+        return {
+            'calls': self.calls,
+            'mean': self.total_ns / self.calls / 1e9 if self.calls else 0.0,
+            'max': self.max_ns / 1e9,
+            'total': self.total_ns / 1e9,
+        }
+
+
+class Profiler(object):
+
+    """
+    Profiler Class.
+
+    Counts & times every call of the functions it wraps.
+    """
+
+    def __init__(self) -> None:
+        self.stats: typing.Dict[str, CallStats] = {}
+
+    def __repr__(self) -> str:
+        return '<Profiler functions=%d>' % len(self.stats)
+
+    def wrap(self, func: typing.Callable) -> typing.Callable:
+        """Returns `func` wrapped with a call counter & timer."""
+        name = _name(func)
+        stats = self.stats.setdefault(name, CallStats(name))
+        perf_counter_ns = time.perf_counter_ns
+
+        @functools.wraps(func)
+        def _profiled(*args, **kwargs):
+            start = perf_counter_ns()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                elapsed = perf_counter_ns() - start
+                stats.calls += 1
+                stats.total_ns += elapsed
+                if elapsed > stats.max_ns:
+                    stats.max_ns = elapsed
+
+        return _profiled
+
+    def reset(self) -> None:
+        """Clears all counts & timings."""
+        # Zeroed in place, as the wrapped functions hold their CallStats.
+        for stats in self.stats.values():
+            stats.calls = 0
+            stats.total_ns = 0
+            stats.max_ns = 0
+
+    def summary(self) -> typing.List[typing.Tuple[str, dict]]:
+        """
+        Returns (name, `CallStats.as_dict()`) for each function called,
+        sorted by total time, highest first.
+        """
+        summary = [(name, stats.as_dict())
+                   for name, stats in self.stats.items() if stats.calls]
+        return sorted(summary, key=lambda item: -item[1]['total'])
+
+    def dump(self, out: typing.TextIO=None) -> None:
+        """Writes the summary as a table, to stderr by default."""
+        out = out or sys.stderr
+        out.write('aprs profile, every call timed:\n')
+        out.write('%-44s %10s %10s %10s %10s\n' % (
+            'function', 'calls', 'mean us', 'max us', 'total s'))
+        for name, stats in self.summary():
+            out.write('%-44s %10d %10.2f %10.2f %10.4f\n' % (
+                name[-44:], stats['calls'], stats['mean'] * 1e6,
+                stats['max'] * 1e6, stats['total']))
+        out.flush()
+
+
+class SamplingProfiler(object):
+
+    """
+    Sampling Profiler Class.
+
+    Samples the stacks of all other threads every `interval` seconds from a
+    daemon thread, counting for each registered function the samples it is
+    on the stack for (`samples`) and the samples it is the innermost
+    registered function for (`self_samples`).
+    """
+
+    def __init__(self, interval: float=0.005) -> None:
+        self.interval = interval
+        self.codes: typing.Dict[object, str] = {}
+        self.samples: typing.Dict[str, int] = {}
+        self.self_samples: typing.Dict[str, int] = {}
+        self.sampled = 0
+        self._thread = None
+
+    def __repr__(self) -> str:
+        return '<SamplingProfiler %.4fs functions=%d>' % (
+            self.interval, len(self.codes))
+
+    def wrap(self, func: typing.Callable) -> typing.Callable:
+        """Registers `func` to be counted in samples, returning it as-is."""
+        name = _name(func)
+        self.codes[func.__code__] = name
+        self.samples.setdefault(name, 0)
+        self.self_samples.setdefault(name, 0)
+        return func
+
+    def start(self) -> None:
+        """Starts sampling."""
+        if self._thread is None:
+            self._thread = threading.Thread(
+                target=self._run, name='aprs-profiler', daemon=True)
+            self._thread.start()
+
+    def _run(self) -> None:
+        own_id = threading.get_ident()
+        while True:
+            time.sleep(self.interval)
+            self.sample(own_id)
+
+    def sample(self, exclude: int=None) -> None:
+        """Takes one sample of the stacks of all threads."""
+        codes = self.codes
+        for thread_id, frame in sys._current_frames().items():  # NOQA pylint: disable=W0212
+            if thread_id == exclude:
+                continue
+            self.sampled += 1
+            seen = set()
+            while frame is not None:
+                name = codes.get(frame.f_code)
+                if name is not None and name not in seen:
+                    if not seen:
+                        self.self_samples[name] += 1
+                    seen.add(name)
+                    self.samples[name] += 1
+                frame = frame.f_back
+
+    def reset(self) -> None:
+        """Clears all samples."""
+        self.sampled = 0
+        for name in self.samples:
+            self.samples[name] = 0
+            self.self_samples[name] = 0
+
+    def summary(self) -> typing.List[typing.Tuple[str, dict]]:
+        """
+        Returns (name, stats) for each function sampled, sorted by total
+        time, highest first. Stats are the sample counts & the estimated
+        total & self times, in seconds.
+        """
+        summary = [
+            (name, {'samples': count,
+                    'self_samples': self.self_samples[name],
+                    'total': count * self.interval,
+                    'self': self.self_samples[name] * self.interval})
+            for name, count in self.samples.items() if count
+        ]
+        return sorted(summary, key=lambda item: -item[1]['total'])
+
+    def dump(self, out: typing.TextIO=None) -> None:
+        """Writes the summary as a table, to stderr by default."""
+        out = out or sys.stderr
+        out.write('aprs profile, %d stack samples every %.1fms:\n' % (
+            self.sampled, self.interval * 1e3))
+        out.write('%-44s %10s %10s %10s\n' % (
+            'function', 'samples', 'self s', 'total s'))
+        for name, stats in self.summary():
+            out.write('%-44s %10d %10.3f %10.3f\n' % (
+                name[-44:], stats['samples'], stats['self'],
+                stats['total']))
+        out.flush()
+
+
+def _dump_at_exit(profiler, path: str=None) -> None:
+    if path:
+        with open(path, 'w') as out:
+            profiler.dump(out)
+    else:
+        profiler.dump()
+
+
+if aprs.PROFILE == 'sample':
+    PROFILER = SamplingProfiler(aprs.PROFILE_INTERVAL)
+    PROFILER.start()
+elif aprs.PROFILE:
+    PROFILER = Profiler()
+else:
+    PROFILER = None
+
+if PROFILER is not None:
+    atexit.register(_dump_at_exit, PROFILER, aprs.PROFILE_OUTPUT)
+
+
+def profiled(func: typing.Callable) -> typing.Callable:
+    """
+    Decorates a hot-path function to be profiled when APRS_PROFILE is set,
+    otherwise returns it unchanged.
+    """
+    if PROFILER is None:
+        return func
+    return PROFILER.wrap(func)
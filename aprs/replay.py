@@ -0,0 +1,327 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Python APRS Module Replay Definitions.
+
+Re-emits recorded traffic with its original timing, at 1x, Nx or flat-out
+speed, to reproduce production traffic (and its spikes) against
+consumers::
+
+    replay = aprs.replay.Replay(
+        aprs.replay.log_events('aprsis.log.gz'), speed=10)
+    stats = replay.run(aprs.replay.callback_sink(handle_frame))
+    print(stats['achieved_rate'], stats['target_rate'])
+
+Recordings are read as (timestamp, data) events:
+
+* `log_events`: APRS-IS text logs (plain, gzip or zstd) with each line
+  prefixed by its receive time in UNIX seconds and a space, as read by
+  `aprs.log_reader.LogReader(timestamps=True)`.
+* `capture_events`: `aprs.capture` files, eg of KISS or AX.25 Frames.
+
+and re-emitted to a sink, any callable taking the event data:
+
+* `callback_sink`: an `aprs.TCP.receive`-style callback.
+* `StreamSink`: clients of a local TCP port, as lines or as a KISS TCP
+  port for `aprs.TCPKISS`.
+* `aprsis_sink`: clients of an `aprs.server.APRSISServer`, eg `aprs.TCP`.
+"""
+
+import asyncio
+import logging
+import socket
+import time
+import typing
+
+import aprs  # pylint: disable=R0801
+import aprs.archive  # pylint: disable=R0801
+import aprs.capture  # pylint: disable=R0801
+
+__author__ = 'Greg Albrecht W2GMD <oss@undef.net>'  # NOQA pylint: disable=R0801
+__copyright__ = 'Copyright 2017 Greg Albrecht and Contributors'  # NOQA pylint: disable=R0801
+__license__ = 'Apache License, Version 2.0'  # NOQA pylint: disable=R0801
+
+
+# Seconds before each event's due time to stop sleeping and busy-wait,
+# as `time.sleep` can overshoot by ~0.1ms or more.
+REPLAY_SPIN = 0.0005
+
+# Seconds between progress reports logged during a replay.
+REPORT_INTERVAL = 10.0
+
+
+def log_events(path: str) -> typing.Iterator[typing.Tuple[float, bytes]]:
+    """
+    Yields the (timestamp, line) events of a timestamped APRS-IS text log.
+    Lines without a timestamp prefix take the previous line's timestamp.
+    """
+    timestamp = 0.0
+    for line in aprs.archive.ArchiveReader(path).read_lines():
+        prefix, _, rest = line.partition(b' ')
+        try:
+            timestamp = float(prefix)
+        except ValueError:
+            rest = line
+        if rest:
+            yield (timestamp, rest)
+
+
+def capture_events(path: str, start: float=None, end: float=None) -> \
+        typing.Iterator[typing.Tuple[float, bytes]]:
+    """
+    Yields the (timestamp, data) events of an `aprs.capture` file,
+    optionally only those received in [start, end).
+    """
+    with aprs.capture.CaptureReader(path) as reader:
+        if start is None and end is None:
+            records = iter(reader)
+        else:
+            records = reader.between(start, end)
+        for record in records:
+            yield (record.timestamp, bytes(record.data))
+
+
+def callback_sink(callback: typing.Callable,
+                  frame_handler: typing.Callable=aprs.parse_frame) -> \
+        typing.Callable[[bytes], None]:
+    """
+    Returns a sink delivering events to a callback, as `aprs.TCP.receive`
+    does: parsed by `frame_handler`, or raw if it is None.
+    """
+    if frame_handler is None:
+        return callback
+
+    def _sink(data: bytes) -> None:
+        callback(frame_handler(data))
+
+    return _sink
+
+
+def aprsis_sink(server, loop: asyncio.AbstractEventLoop) -> \
+        typing.Callable[[bytes], None]:
+    """
+    Returns a sink publishing text lines to the clients of an
+    `aprs.server.APRSISServer` running in `loop`, from another thread.
+    """
+    def _sink(data: bytes) -> None:
+        loop.call_soon_threadsafe(server.broadcast, [data])
+
+    return _sink
+
+
+class StreamSink(object):
+
+    """
+    Stream Sink Class.
+
+    Listens on a local TCP port and sends each event to every connected
+    client, either as a line or, with `kiss=True`, as a KISS data frame
+    (events already KISS framed are sent as-is). Clients may connect at any
+    time; clients that disconnect are dropped.
+    """
+
+    _logger = logging.getLogger(__name__)  # pylint: disable=R0801
+    if not _logger.handlers:  # pylint: disable=R0801
+        _logger.setLevel(aprs.LOG_LEVEL)  # pylint: disable=R0801
+        _console_handler = logging.StreamHandler()  # pylint: disable=R0801
+        _console_handler.setLevel(aprs.LOG_LEVEL)  # pylint: disable=R0801
+        _console_handler.setFormatter(aprs.LOG_FORMAT)  # pylint: disable=R0801
+        _logger.addHandler(_console_handler)  # pylint: disable=R0801
+        _logger.propagate = False  # pylint: disable=R0801
+
+    def __init__(self, host: str='127.0.0.1', port: int=0, kiss: bool=False,
+                 line_ending: bytes=b'\r\n') -> None:
+        self.kiss = kiss
+        self.line_ending = line_ending
+        self.clients: typing.List[socket.socket] = []
+        self._encoder = aprs.FrameEncoder(kiss=True)
+
+        self.listener = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        self.listener.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        self.listener.bind((host, port))
+        self.listener.listen(64)
+        self.listener.setblocking(False)
+        self.address = self.listener.getsockname()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args) -> None:
+        self.close()
+
+    def _accept(self) -> None:
+        while True:
+            try:
+                client, address = self.listener.accept()
+            except (BlockingIOError, InterruptedError):
+                return
+            client.setblocking(True)
+            client.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+            self._logger.info('Client connected from %s:%d', *address[:2])
+            self.clients.append(client)
+
+    def wait_clients(self, count: int=1, timeout: float=None) -> bool:
+        """Waits for `count` clients to connect. Returns False on timeout."""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            self._accept()
+            if len(self.clients) >= count:
+                return True
+            if deadline is not None and time.monotonic() >= deadline:
+                return False
+            time.sleep(0.001)
+
+    def encode(self, data: bytes) -> bytes:
+        """Returns an event as sent to clients."""
+        if not self.kiss:
+            return data + self.line_ending
+        if data[:1] == aprs.KISS_FEND:
+            return data
+        with self._encoder.encode_many([data]) as encoded:
+            return bytes(encoded)
+
+    def __call__(self, data: bytes) -> None:
+        self._accept()
+        if not self.clients:
+            return
+        data = self.encode(data)
+        for client in list(self.clients):
+            try:
+                client.sendall(data)
+            except OSError as ex:
+                self._logger.info('Client dropped: %s', ex)
+                self.clients.remove(client)
+                client.close()
+
+    def close(self) -> None:
+        """Disconnects all clients & stops listening."""
+        for client in self.clients:
+            client.close()
+        self.clients = []
+        self.listener.close()
+
+
+class Replay(object):
+
+    """
+    Replay Class.
+
+    Emits (timestamp, data) events to a sink with the same relative timing
+    as recorded, scaled by `speed`, against `time.perf_counter`. Each event
+    sleeps until just before it is due, then busy-waits the last
+    `REPLAY_SPIN` seconds. Events that are late (eg, the sink is slower
+    than the recorded rate) are emitted immediately, and the lag counted.
+
+    :param events: Iterable of (timestamp, data), in recorded order.
+    :param speed: Playback speed multiple; 0 replays flat-out.
+    """
+
+    _logger = logging.getLogger(__name__)  # pylint: disable=R0801
+    if not _logger.handlers:  # pylint: disable=R0801
+        _logger.setLevel(aprs.LOG_LEVEL)  # pylint: disable=R0801
+        _console_handler = logging.StreamHandler()  # pylint: disable=R0801
+        _console_handler.setLevel(aprs.LOG_LEVEL)  # pylint: disable=R0801
+        _console_handler.setFormatter(aprs.LOG_FORMAT)  # pylint: disable=R0801
+        _logger.addHandler(_console_handler)  # pylint: disable=R0801
+        _logger.propagate = False  # pylint: disable=R0801
+
+    def __init__(self, events: typing.Iterable[typing.Tuple[float, bytes]],
+                 speed: float=1.0, spin: float=REPLAY_SPIN,
+                 report_interval: float=REPORT_INTERVAL) -> None:
+        self.events = events
+        self.speed = speed
+        self.spin = spin
+        self.report_interval = report_interval
+        self._running = False
+
+        self.count = 0
+        self.late = 0
+        self.max_lag = 0.0
+        self.total_lag = 0.0
+        self.span = 0.0
+        self.elapsed = 0.0
+
+    def stop(self) -> None:
+        """Stops a running replay, eg from another thread."""
+        self._running = False
+
+    def run(self, sink: typing.Callable[[bytes], None],
+            limit: int=None) -> dict:
+        """
+        Replays the events into `sink`.
+
+        :param sink: Called with the data of each event.
+        :param limit: Stops after this many events.
+
+        :returns: Replay statistics, see `stats()`.
+        :rtype: dict
+        """
+        perf_counter = time.perf_counter
+        sleep = time.sleep
+        speed = self.speed
+        spin = self.spin
+        first = None
+        start = perf_counter()
+        next_report = start + self.report_interval
+        self._running = True
+
+        for timestamp, data in self.events:
+            if not self._running or self.count == limit:
+                break
+            if first is None:
+                first = timestamp
+                start = perf_counter()
+            if speed:
+                due = start + (timestamp - first) / speed
+                now = perf_counter()
+                if due > now:
+                    if due - now > spin:
+                        sleep(due - now - spin)
+                    while perf_counter() < due:
+                        pass
+                elif now - due > 0.001:
+                    lag = now - due
+                    self.late += 1
+                    self.total_lag += lag
+                    if lag > self.max_lag:
+                        self.max_lag = lag
+            sink(data)
+            self.count += 1
+            self.span = timestamp - first
+
+            if self.report_interval and perf_counter() >= next_report:
+                self.elapsed = perf_counter() - start
+                next_report += self.report_interval
+                stats = self.stats()
+                self._logger.info(
+                    'Replayed %d events, %.1f/s (target %.1f/s), '
+                    'max lag %.3fs', self.count, stats['achieved_rate'],
+                    stats['target_rate'], self.max_lag)
+
+        self.elapsed = perf_counter() - start
+        self._running = False
+        return self.stats()
+
+    def stats(self) -> dict:
+        """
+        Returns replay statistics: event counts, the recorded span & elapsed
+        seconds, achieved & target events/s (target is NaN flat-out), and
+        the number, mean & max lag of late events.
+        """
+        elapsed = self.elapsed or float('nan')
+        if self.speed and self.span:
+            target_rate = self.count / (self.span / self.speed)
+        else:
+            target_rate = float('nan')
+        return {
+            'events': self.count,
+            'span': self.span,
+            'elapsed': self.elapsed,
+            'speed': self.speed,
+            'achieved_rate': self.count / elapsed,
+            'target_rate': target_rate,
+            'late': self.late,
+            'mean_lag': self.total_lag / self.late if self.late else 0.0,
+            'max_lag': self.max_lag,
+        }
@@ -0,0 +1,394 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Python APRS Module APRS-IS Server Definitions.
+
+A local, asyncio APRS-IS stand-in for network-free load testing of
+`aprs.TCP` & its consumers, which doubles as a small local hub::
+
+    server = aprs.server.APRSISServer(
+        corpus=aprs.traffic.TrafficGenerator(seed=1).lines(100000),
+        rate=5000, port=14580, repeat=True)
+    server.run()
+
+    aprs_conn = aprs.TCP(b'W2GMD', b'12345', servers=[b'localhost:14580'],
+                         aprs_filter=b'r/37.7/-122.4/100 t/pm')
+
+Clients get the login banner, `logresp` & periodic '#' keepalives, then
+the corpus lines passing their filter (see `aprs.prefilter.aprsis_filter`),
+replayed at `rate` lines/second or, with a `rate` of 0, as fast as the
+slowest client reads. Frames sent by verified clients get a qAC
+q-construct and are relayed to the other clients.
+"""
+
+import asyncio
+import logging
+import time
+import typing
+
+import aprs  # pylint: disable=R0801
+import aprs.prefilter  # pylint: disable=R0801
+
+__author__ = 'Greg Albrecht W2GMD <oss@undef.net>'  # NOQA pylint: disable=R0801
+__copyright__ = 'Copyright 2017 Greg Albrecht and Contributors'  # NOQA pylint: disable=R0801
+__license__ = 'Apache License, Version 2.0'  # NOQA pylint: disable=R0801
+
+
+# Lines broadcast per replay step.
+REPLAY_BATCH = 1024
+
+# Client write buffer size (bytes) above which lines are dropped, or the
+# replay waits, for that client.
+HIGH_WATER = 1 << 20
+
+
+def passcode(callsign: typing.Union[str, bytes]) -> int:
+    """
+    Computes the APRS-IS passcode of a Callsign (the SSID is ignored).
+
+    >>> passcode(b'N0CALL-1')
+    13023
+    """
+    if isinstance(callsign, str):
+        callsign = bytes(callsign, 'UTF-8')
+    callsign = callsign.split(b'-')[0].upper()
+    code = 0x73e2
+    for index, char in enumerate(callsign):
+        code ^= char << 8 if index % 2 == 0 else char
+    return code & 0x7fff
+
+
+def _header(line: bytes) -> typing.Optional[tuple]:
+    """Returns (line, source_end, path_end), or None if not a Frame."""
+    source_end = line.find(b'>')
+    if source_end <= 0:
+        return None
+    path_end = line.find(b':', source_end)
+    if path_end < 0:
+        return None
+    return (line, source_end, path_end)
+
+
+class Session(asyncio.Protocol):
+
+    """
+    APRS-IS Server Session Class.
+
+    One client connection: login, filter & write flow control.
+    """
+
+    _logger = logging.getLogger(__name__)  # pylint: disable=R0801
+    if not _logger.handlers:  # pylint: disable=R0801
+        _logger.setLevel(aprs.LOG_LEVEL)  # pylint: disable=R0801
+        _console_handler = logging.StreamHandler()  # pylint: disable=R0801
+        _console_handler.setLevel(aprs.LOG_LEVEL)  # pylint: disable=R0801
+        _console_handler.setFormatter(aprs.LOG_FORMAT)  # pylint: disable=R0801
+        _logger.addHandler(_console_handler)  # pylint: disable=R0801
+        _logger.propagate = False  # pylint: disable=R0801
+
+    def __init__(self, server: 'APRSISServer') -> None:
+        self.server = server
+        self.transport = None
+        self.callsign: typing.Optional[bytes] = None
+        self.verified = False
+        self.aprs_filter = b''
+        self.predicate = None
+        self.paused = False
+        self._buffer = b''
+
+    def __repr__(self) -> str:
+        return '<Session %s>' % (self.callsign or b'-').decode()
+
+    def connection_made(self, transport) -> None:
+        self.transport = transport
+        transport.set_write_buffer_limits(high=HIGH_WATER)
+        transport.write(self.server.banner)
+        self.server.sessions.add(self)
+
+    def connection_lost(self, exc) -> None:
+        self.server.sessions.discard(self)
+        self.resume_writing()
+
+    def pause_writing(self) -> None:
+        self.paused = True
+        self.server.pause()
+
+    def resume_writing(self) -> None:
+        if self.paused:
+            self.paused = False
+            self.server.resume()
+
+    def data_received(self, data: bytes) -> None:
+        # `aprs.TCP` ends lines with '\n\r', APRS-IS clients with '\r\n'.
+        lines = (self._buffer + data).split(b'\n')
+        self._buffer = lines.pop()
+        for line in lines:
+            line = line.strip(b'\r')
+            if not line:
+                continue
+            elif self.callsign is None:
+                self.login(line)
+            elif line.startswith(b'#filter'):
+                self.set_filter(line[7:].strip())
+            elif not line.startswith(b'#'):
+                self.server.submit(self, line)
+
+    def login(self, line: bytes) -> None:
+        """Handles the 'user CALL pass CODE vers SW VER filter ...' line."""
+        tokens = line.split()
+        if len(tokens) < 2 or tokens[0].lower() != b'user':
+            self._logger.info('Invalid login "%s"', line)
+            self.transport.write(b'# invalid login\r\n')
+            self.transport.close()
+            return
+
+        self.callsign = tokens[1].upper()
+        lowered = [token.lower() for token in tokens]
+        if b'pass' in lowered:
+            code = tokens[lowered.index(b'pass') + 1:][:1]
+            self.verified = code == [b'%d' % passcode(self.callsign)]
+        if b'filter' in lowered:
+            self.set_filter(
+                b' '.join(tokens[lowered.index(b'filter') + 1:]))
+        else:
+            self.set_filter(b'')
+
+        self.transport.write(b'# logresp %s %s, server %s\r\n' % (
+            self.callsign,
+            b'verified' if self.verified else b'unverified',
+            self.server.server_id))
+        self._logger.info('Login %s verified=%s filter="%s"',
+                          self.callsign, self.verified, self.aprs_filter)
+
+    def set_filter(self, aprs_filter: bytes) -> None:
+        """Sets the APRS-IS filter for this Session."""
+        self.aprs_filter = aprs_filter
+        self.predicate = self.server.predicate(aprs_filter)
+
+    def write(self, data: bytes) -> bool:
+        """Writes lines, unless the client is behind. Returns True if sent."""
+        if self.paused:
+            return False
+        self.transport.write(data)
+        return True
+
+
+class APRSISServer(object):
+
+    """
+    APRS-IS Server Class.
+
+    :param corpus: Frame lines to replay, eg from `aprs.traffic`,
+                   `aprs.log_reader.LogReader` or a recorded feed. Lines
+                   starting with '#' & lines that aren't Frames are skipped.
+    :param rate: Lines/second to replay; 0 replays as fast as the slowest
+                 client reads, and clients falling behind a non-zero rate
+                 miss lines.
+    :param repeat: Replays the corpus in a loop.
+    :param min_clients: Holds the replay until this many clients are logged
+                        in.
+    :param on_frame: Called with each Frame line submitted by a client.
+    """
+
+    _logger = logging.getLogger(__name__)  # pylint: disable=R0801
+    if not _logger.handlers:  # pylint: disable=R0801
+        _logger.setLevel(aprs.LOG_LEVEL)  # pylint: disable=R0801
+        _console_handler = logging.StreamHandler()  # pylint: disable=R0801
+        _console_handler.setLevel(aprs.LOG_LEVEL)  # pylint: disable=R0801
+        _console_handler.setFormatter(aprs.LOG_FORMAT)  # pylint: disable=R0801
+        _logger.addHandler(_console_handler)  # pylint: disable=R0801
+        _logger.propagate = False  # pylint: disable=R0801
+
+    def __init__(self, corpus: typing.Iterable[bytes]=(), rate: float=0.0,
+                 host: str='127.0.0.1', port: int=aprs.APRSIS_FILTER_PORT,
+                 server_id: bytes=b'T2LOCAL', keepalive: float=20.0,
+                 repeat: bool=False, min_clients: int=0,
+                 on_frame: typing.Callable[[bytes], None]=None) -> None:
+        self.corpus = [
+            header for header in (_header(bytes(line).rstrip(b'\r\n'))
+                                  for line in corpus
+                                  if not bytes(line[:1]) == b'#')
+            if header is not None
+        ]
+        self.rate = rate
+        self.host = host
+        self.port = port
+        self.server_id = server_id
+        self.keepalive = keepalive
+        self.repeat = repeat
+        self.min_clients = min_clients
+        self.on_frame = on_frame
+        self.banner = b'# %s %s\r\n' % (aprs.APRSIS_SW_VERSION, server_id)
+
+        self.sessions: typing.Set[Session] = set()
+        self.replayed = 0
+        self.sent = 0
+        self.dropped = 0
+        self.submitted = 0
+
+        self._predicates: typing.Dict[bytes, object] = {}
+        self._paused = 0
+        self._writable = None
+        self._server = None
+        self._tasks: typing.List[asyncio.Task] = []
+
+    def __repr__(self) -> str:
+        return '<APRSISServer %s:%s clients=%d>' % (
+            self.host, self.port, len(self.sessions))
+
+    def predicate(self, aprs_filter: bytes):
+        """
+        Returns the (shared) Predicate for an APRS-IS filter, so clients with
+        the same filter are matched once per line.
+        """
+        predicate = self._predicates.get(aprs_filter)
+        if predicate is None:
+            predicate = aprs.prefilter.aprsis_filter(aprs_filter)
+            self._predicates[aprs_filter] = predicate
+        return predicate
+
+    def pause(self) -> None:
+        """Called when a client's write buffer fills."""
+        self._paused += 1
+        self._writable.clear()
+
+    def resume(self) -> None:
+        """Called when a client's write buffer drains."""
+        self._paused -= 1
+        if not self._paused:
+            self._writable.set()
+
+    def logged_in(self) -> typing.List[Session]:
+        """Returns the logged in Sessions."""
+        return [session for session in self.sessions
+                if session.predicate is not None]
+
+    def publish(self, lines: typing.Iterable[tuple],
+                exclude: Session=None) -> None:
+        """
+        Sends Frame lines to each logged in client whose filter they pass.
+
+        :param lines: (line, source_end, path_end) tuples of Frame lines
+                      ending in '\\r\\n', as in `corpus`.
+        :param exclude: Session not to send to, eg the submitter.
+        """
+        lines = list(lines)
+        matched: typing.Dict[int, tuple] = {}
+        for session in self.logged_in():
+            if session is exclude:
+                continue
+            predicate = session.predicate
+            match = matched.get(id(predicate))
+            if match is None:
+                func = predicate.func
+                match = [wire for wire, src, pth in lines
+                         if func(wire, src, pth)]
+                match = (b''.join(match), len(match))
+                matched[id(predicate)] = match
+            if not match[1]:
+                continue
+            if session.write(match[0]):
+                self.sent += match[1]
+            else:
+                self.dropped += match[1]
+
+    def broadcast(self, lines: typing.Iterable[bytes]) -> None:
+        """Publishes Frame lines (without line endings) to the clients."""
+        self.publish([(line + b'\r\n', src, pth) for line, src, pth in
+                      filter(None, map(_header, lines))])
+
+    def submit(self, session: Session, line: bytes) -> None:
+        """Handles a Frame line sent by a client."""
+        header = _header(line)
+        if header is None or not session.verified:
+            self._logger.debug('Dropped from %s: "%s"', session, line)
+            return
+        _, source_end, path_end = header
+        if line.find(b',qA', source_end, path_end) < 0:
+            line = b'%s,qAC,%s%s' % (
+                line[:path_end], self.server_id, line[path_end:])
+            path_end += len(self.server_id) + 5
+        self.submitted += 1
+        if self.on_frame is not None:
+            self.on_frame(line)
+        self.publish([(line + b'\r\n', source_end, path_end)], session)
+
+    async def _replay(self) -> None:
+        loop = asyncio.get_running_loop()
+        while len(self.logged_in()) < self.min_clients:
+            await asyncio.sleep(0.01)
+
+        corpus = self.corpus
+        start = loop.time()
+        index = 0
+        while corpus:
+            if index >= len(corpus):
+                if not self.repeat:
+                    break
+                index = 0
+            if self.rate:
+                elapsed = loop.time() - start
+                count = int(elapsed * self.rate) - self.replayed
+                if count <= 0:
+                    await asyncio.sleep(
+                        (self.replayed + 1) / self.rate - elapsed)
+                    continue
+                count = min(count, REPLAY_BATCH)
+            else:
+                await self._writable.wait()
+                count = REPLAY_BATCH
+            batch = corpus[index:index + count]
+            index += len(batch)
+            self.replayed += len(batch)
+            self.publish([(line + b'\r\n', src, pth)
+                          for line, src, pth in batch])
+            await asyncio.sleep(0)
+        self._logger.info('Replay done, %d lines', self.replayed)
+
+    async def _keepalive(self) -> None:
+        while True:
+            await asyncio.sleep(self.keepalive)
+            message = b'# %s %s %s %s:%d\r\n' % (
+                aprs.APRSIS_SW_VERSION,
+                time.strftime('%d %b %Y %H:%M:%S GMT',
+                              time.gmtime()).encode(),
+                self.server_id, self.host.encode(), self.port)
+            for session in list(self.sessions):
+                session.write(message)
+
+    async def start(self) -> None:
+        """Starts listening & replaying. `port` 0 picks a free port."""
+        loop = asyncio.get_running_loop()
+        self._writable = asyncio.Event()
+        self._writable.set()
+        self._server = await loop.create_server(
+            lambda: Session(self), self.host, self.port, backlog=4096)
+        self.port = self._server.sockets[0].getsockname()[1]
+        self._tasks = [loop.create_task(self._replay()),
+                       loop.create_task(self._keepalive())]
+        self._logger.info('Listening on %s:%d', self.host, self.port)
+
+    async def close(self) -> None:
+        """Stops the server & disconnects all clients."""
+        for task in self._tasks:
+            task.cancel()
+        self._server.close()
+        for session in list(self.sessions):
+            session.transport.close()
+        await self._server.wait_closed()
+
+    async def serve_forever(self) -> None:
+        """Starts & serves until cancelled."""
+        await self.start()
+        try:
+            await self._server.serve_forever()
+        finally:
+            await self.close()
+
+    def run(self) -> None:
+        """Serves in a new event loop until interrupted."""
+        try:
+            asyncio.run(self.serve_forever())
+        except KeyboardInterrupt:
+            pass
@@ -0,0 +1,300 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Python APRS Module Snapshot Definitions.
+
+Saves & restores Station state to a compact binary snapshot file, so a
+restarted process is warm without replaying the live feed.
+
+File layout (little-endian)::
+
+    Header:  magic (8s) | version (H) | pad (2x) | crc32 (I) | length (Q)
+    Payload: Sections of tag (4s) | length (Q) | data
+
+The CRC32 covers the whole payload. Sections are:
+
+    b'STNS': `aprs.StationStore` columns, least recently heard first.
+    b'FRMS': A named list of `aprs.Frame`s, eg a heard list or dupe window.
+
+Callsigns & Frames are stored in their `bytes(aprs.Callsign)` &
+`bytes(aprs.Frame)` plain-text representations.
+"""
+
+import array
+import logging
+import mmap
+import os
+import struct
+import sys
+import tempfile
+import threading
+import typing
+import zlib
+
+import aprs  # pylint: disable=R0801
+
+__author__ = 'Greg Albrecht W2GMD <oss@undef.net>'  # NOQA pylint: disable=R0801
+__copyright__ = 'Copyright 2017 Greg Albrecht and Contributors'  # NOQA pylint: disable=R0801
+__license__ = 'Apache License, Version 2.0'  # NOQA pylint: disable=R0801
+
+
+SNAPSHOT_MAGIC = b'APRSSNAP'
+SNAPSHOT_VERSION = 1
+
+_HEADER = struct.Struct('<8sH2xIQ')
+_SECTION = struct.Struct('<4sQ')
+_STATIONS = struct.Struct('<QQQ')
+_COUNT = struct.Struct('<Q')
+
+_logger = logging.getLogger(__name__)  # pylint: disable=R0801
+if not _logger.handlers:  # pylint: disable=R0801
+    _logger.setLevel(aprs.LOG_LEVEL)  # pylint: disable=R0801
+    _console_handler = logging.StreamHandler()  # pylint: disable=R0801
+    _console_handler.setLevel(aprs.LOG_LEVEL)  # pylint: disable=R0801
+    _console_handler.setFormatter(aprs.LOG_FORMAT)  # pylint: disable=R0801
+    _logger.addHandler(_console_handler)  # pylint: disable=R0801
+    _logger.propagate = False  # pylint: disable=R0801
+
+
+def _le_bytes(column: array.array) -> bytes:
+    """Returns the little-endian bytes of an array column."""
+    if sys.byteorder == 'big':  # pragma: no cover
+        column = array.array(column.typecode, column)
+        column.byteswap()
+    return column.tobytes()
+
+
+def _le_array(typecode: str, data) -> array.array:
+    """Returns an array column from little-endian bytes."""
+    column = array.array(typecode)
+    column.frombytes(data)
+    if sys.byteorder == 'big':  # pragma: no cover
+        column.byteswap()
+    return column
+
+
+def _pack_blobs(blobs: typing.Sequence[typing.Optional[bytes]]) -> bytes:
+    """
+    Packs a column of bytes (or None) as count, lengths (-1 for None) and
+    the concatenated data.
+    """
+    lengths = array.array('q', (-1 if b is None else len(b) for b in blobs))
+    return b''.join([
+        _COUNT.pack(len(blobs)),
+        _le_bytes(lengths),
+        b''.join(b for b in blobs if b is not None)
+    ])
+
+
+def _unpack_blobs(view: memoryview, offset: int) -> typing.Tuple[
+        typing.List[typing.Optional[bytes]], int]:
+    """
+    Unpacks a column packed by `_pack_blobs()` starting at `offset`.
+
+    :returns: The column, and the offset following it.
+    """
+    count, = _COUNT.unpack_from(view, offset)
+    offset += _COUNT.size
+    lengths = _le_array('q', view[offset:offset + count * 8])
+    offset += count * 8
+
+    blobs: typing.List[typing.Optional[bytes]] = []
+    append = blobs.append
+    for length in lengths:
+        if length < 0:
+            append(None)
+        else:
+            append(bytes(view[offset:offset + length]))
+            offset += length
+    return (blobs, offset)
+
+
+def _pack_stations(store) -> bytes:
+    (callsigns, lats, lngs, heard, symbols, statuses,
+     paths) = store.columns()
+    return b''.join([
+        _STATIONS.pack(len(callsigns), store.max_stations, store.evictions),
+        _le_bytes(lats),
+        _le_bytes(lngs),
+        _le_bytes(heard),
+        symbols,
+        _pack_blobs([callsign.encode() for callsign in callsigns]),
+        _pack_blobs(statuses),
+        _pack_blobs(paths),
+    ])
+
+
+def _unpack_stations(view: memoryview):
+    count, max_stations, evictions = _STATIONS.unpack_from(view, 0)
+    offset = _STATIONS.size
+
+    columns = []
+    for _ in range(3):
+        columns.append(_le_array('d', view[offset:offset + count * 8]))
+        offset += count * 8
+    lats, lngs, heard = columns
+    symbols = bytes(view[offset:offset + count * 2])
+    offset += count * 2
+
+    callsigns, offset = _unpack_blobs(view, offset)
+    statuses, offset = _unpack_blobs(view, offset)
+    paths, offset = _unpack_blobs(view, offset)
+    return aprs.StationStore.from_columns(
+        [callsign.decode() for callsign in callsigns], lats, lngs, heard,
+        symbols, statuses, paths, max_stations=max_stations,
+        evictions=evictions)
+
+
+def _pack_frames(name: str, frames: typing.Iterable) -> bytes:
+    return b''.join([
+        _pack_blobs([name.encode()]),
+        _pack_blobs([bytes(aprs.parse_frame(frame)) for frame in frames])
+    ])
+
+
+def _unpack_frames(view: memoryview) -> typing.Tuple[str, typing.List]:
+    name, offset = _unpack_blobs(view, 0)
+    frames, offset = _unpack_blobs(view, offset)
+    return (name[0].decode(),
+            [aprs.functions.parse_frame_text(frame) for frame in frames])
+
+
+def write_snapshot(path: str, store=None,
+                   frames: typing.Mapping[str, typing.Iterable]=None) -> int:
+    """
+    Atomically writes a Snapshot file. The Snapshot is written to a
+    temporary file in the same directory, synced, then renamed over `path`,
+    so readers only ever see a complete Snapshot.
+
+    :param path: Snapshot file path.
+    :param store: `aprs.StationStore` to save.
+    :param frames: Mapping of name to a list of `aprs.Frame`s to save.
+
+    :returns: Size of the Snapshot in bytes.
+    :rtype: int
+    """
+    sections = []
+    if store is not None:
+        sections.append((b'STNS', _pack_stations(store)))
+    for name, frame_list in (frames or {}).items():
+        sections.append((b'FRMS', _pack_frames(name, frame_list)))
+
+    payload = b''.join(
+        _SECTION.pack(tag, len(data)) + data for tag, data in sections)
+    header = _HEADER.pack(
+        SNAPSHOT_MAGIC, SNAPSHOT_VERSION, zlib.crc32(payload), len(payload))
+
+    dirname = os.path.dirname(os.path.abspath(path))
+    fd, tmp_path = tempfile.mkstemp(prefix='.snapshot-', dir=dirname)
+    try:
+        with os.fdopen(fd, 'wb') as tmp_file:
+            tmp_file.write(header)
+            tmp_file.write(payload)
+            tmp_file.flush()
+            os.fsync(tmp_file.fileno())
+        os.replace(tmp_path, path)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
+
+    _logger.debug('Wrote snapshot=%s bytes=%d', path,
+                  _HEADER.size + len(payload))
+    return _HEADER.size + len(payload)
+
+
+def read_snapshot(path: str) -> typing.Tuple[
+        typing.Any, typing.Dict[str, typing.List]]:
+    """
+    Reads a Snapshot file written by `write_snapshot()`, memory-mapping it
+    and verifying its version & checksum.
+
+    :returns: (`aprs.StationStore` or None, {name: [`aprs.Frame`, ...]})
+    :rtype: tuple
+
+    :raises aprs.SnapshotError: If the file is not a valid Snapshot.
+    """
+    store = None
+    frames: typing.Dict[str, typing.List] = {}
+
+    with open(path, 'rb') as snap_file:
+        if os.fstat(snap_file.fileno()).st_size < _HEADER.size:
+            raise aprs.SnapshotError('Truncated snapshot header: %s' % path)
+
+        with mmap.mmap(snap_file.fileno(), 0, access=mmap.ACCESS_READ) as mm, \
+                memoryview(mm) as view:
+            magic, version, crc, length = _HEADER.unpack_from(view, 0)
+            if magic != SNAPSHOT_MAGIC:
+                raise aprs.SnapshotError('Not a snapshot: %s' % path)
+            if version != SNAPSHOT_VERSION:
+                raise aprs.SnapshotError(
+                    'Unsupported snapshot version %d: %s' % (version, path))
+
+            with view[_HEADER.size:_HEADER.size + length] as payload:
+                if len(payload) != length or zlib.crc32(payload) != crc:
+                    raise aprs.SnapshotError(
+                        'Snapshot checksum mismatch: %s' % path)
+
+                offset = 0
+                while offset < length:
+                    tag, size = _SECTION.unpack_from(payload, offset)
+                    offset += _SECTION.size
+                    with payload[offset:offset + size] as data:
+                        if tag == b'STNS':
+                            store = _unpack_stations(data)
+                        elif tag == b'FRMS':
+                            name, frame_list = _unpack_frames(data)
+                            frames[name] = frame_list
+                        else:
+                            _logger.warning(
+                                'Skipping unknown section=%s', tag)
+                    offset += size
+
+    return (store, frames)
+
+
+class Snapshotter(threading.Thread):
+
+    """
+    Snapshotter Class.
+
+    Periodically writes a Snapshot of a `aprs.StationStore` (and any Frame
+    lists returned by `frames_func`) in a daemon thread.
+    """
+
+    _logger = _logger
+
+    def __init__(self, path: str, store, interval: float=60.0,
+                 frames_func=None) -> None:
+        super(Snapshotter, self).__init__(daemon=True)
+        self.path = path
+        self.store = store
+        self.interval = interval
+        self.frames_func = frames_func
+        self._stop_event = threading.Event()
+
+    def snapshot(self) -> int:
+        """
+        Writes a Snapshot now.
+        """
+        frames = self.frames_func() if self.frames_func else None
+        return write_snapshot(self.path, self.store, frames)
+
+    def run(self) -> None:
+        while not self._stop_event.wait(self.interval):
+            try:
+                self.snapshot()
+            except Exception as ex:  # NOQA pylint: disable=W0703
+                # Keep snapshotting: a failed Snapshot leaves the last good
+                # one in place.
+                self._logger.exception(ex)
+
+    def stop(self, final_snapshot: bool=True) -> None:
+        """
+        Stops the thread, optionally writing a final Snapshot.
+        """
+        self._stop_event.set()
+        if self.is_alive():
+            self.join()
+        if final_snapshot:
+            self.snapshot()
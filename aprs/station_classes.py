@@ -0,0 +1,336 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""Python APRS Module Station Class Definitions."""
+
+import array
+import collections
+import logging
+import math
+import sys
+import threading
+import time
+import typing
+
+import aprs  # pylint: disable=R0801
+
+__author__ = 'Greg Albrecht W2GMD <oss@undef.net>'  # NOQA pylint: disable=R0801
+__copyright__ = 'Copyright 2017 Greg Albrecht and Contributors'  # NOQA pylint: disable=R0801
+__license__ = 'Apache License, Version 2.0'  # NOQA pylint: disable=R0801
+
+
+NAN = float('nan')
+NO_SYMBOL = b'\x00\x00'
+
+
+class Station(object):
+
+    """
+    Station Class.
+
+    A snapshot of a `StationStore` record. Unknown positions are NaN, and
+    unknown status, symbol & path are None.
+    """
+
+    __slots__ = ['callsign', 'lat', 'lng', 'status', 'symbol', 'path',
+                 'heard']
+
+    def __init__(self, callsign: str, lat: float=NAN, lng: float=NAN,
+                 status: bytes=None, symbol: bytes=None, path: bytes=None,
+                 heard: float=0.0) -> None:
+        self.callsign = callsign
+        self.lat = lat
+        self.lng = lng
+        self.status = status
+        self.symbol = symbol
+        self.path = path
+        self.heard = heard
+
+    def __repr__(self) -> str:
+        return 'Station(%s lat=%r lng=%r symbol=%r heard=%r)' % (
+            self.callsign, self.lat, self.lng, self.symbol, self.heard)
+
+
+class StationStore(object):
+
+    """
+    Station Store Class.
+
+    Keeps the latest position, status, symbol, path & last-heard time of
+    every Station seen, in array-backed columns indexed by a slot number
+    rather than one Python object per Station. Callsigns are interned.
+
+    The Store holds at most `max_stations` Stations; once full, the least
+    recently heard Station is evicted to make room for a new one.
+
+    Updates & reads are locked, so a Store can be shared with other
+    threads, eg an `aprs.snapshot.Snapshotter`.
+    """
+
+    _logger = logging.getLogger(__name__)  # pylint: disable=R0801
+    if not _logger.handlers:  # pylint: disable=R0801
+        _logger.setLevel(aprs.LOG_LEVEL)  # pylint: disable=R0801
+        _console_handler = logging.StreamHandler()  # pylint: disable=R0801
+        _console_handler.setLevel(aprs.LOG_LEVEL)  # pylint: disable=R0801
+        _console_handler.setFormatter(aprs.LOG_FORMAT)  # pylint: disable=R0801
+        _logger.addHandler(_console_handler)  # pylint: disable=R0801
+        _logger.propagate = False  # pylint: disable=R0801
+
+    def __init__(self, max_stations: int=100000) -> None:
+        if max_stations < 1:
+            raise ValueError('max_stations must be at least 1.')
+        self.max_stations = max_stations
+        self.evictions = 0
+        self._lock = threading.Lock()
+
+        # callsign -> slot, least recently heard first.
+        self._slots: typing.MutableMapping[str, int] = \
+            collections.OrderedDict()
+
+        # Columns, indexed by slot.
+        self._callsigns: typing.List[str] = []
+        self._lats = array.array('d')
+        self._lngs = array.array('d')
+        self._heard = array.array('d')
+        self._symbols = bytearray()
+        self._statuses: typing.List[typing.Optional[bytes]] = []
+        self._paths: typing.List[typing.Optional[bytes]] = []
+
+    def __len__(self) -> int:
+        return len(self._slots)
+
+    def __contains__(self, callsign) -> bool:
+        return str(callsign) in self._slots
+
+    def __iter__(self) -> typing.Iterator[str]:
+        """Iterates Callsigns, least recently heard first."""
+        with self._lock:
+            return iter(list(self._slots))
+
+    def _allocate(self, callsign: str) -> int:
+        if len(self._callsigns) < self.max_stations:
+            slot = len(self._callsigns)
+            self._callsigns.append(callsign)
+            self._lats.append(NAN)
+            self._lngs.append(NAN)
+            self._heard.append(0.0)
+            self._symbols += NO_SYMBOL
+            self._statuses.append(None)
+            self._paths.append(None)
+        else:
+            _, slot = self._slots.popitem(last=False)
+            self.evictions += 1
+            self._callsigns[slot] = callsign
+            self._lats[slot] = NAN
+            self._lngs[slot] = NAN
+            self._symbols[slot * 2:slot * 2 + 2] = NO_SYMBOL
+            self._statuses[slot] = None
+            self._paths[slot] = None
+        self._slots[callsign] = slot
+        return slot
+
+    def update(self, callsign, lat: float=None, lng: float=None,
+               status: bytes=None, symbol: bytes=None, path: bytes=None,
+               heard: float=None) -> None:
+        """
+        Records a Station as heard, updating any of the given fields. If
+        the Station was last heard after `heard`, only its empty fields are
+        filled in.
+
+        :param callsign: Station Callsign, as `str` or `aprs.Callsign`.
+        :param heard: Time heard, as a UNIX timestamp. Defaults to now.
+        """
+        callsign = sys.intern(str(callsign))
+        if heard is None:
+            heard = time.time()
+        if symbol is not None:
+            symbol = symbol[:2].ljust(2)
+        if status is not None:
+            status = bytes(status)
+        if path is not None:
+            path = bytes(path)
+
+        with self._lock:
+            slot = self._slots.get(callsign)
+            if slot is None:
+                slot = self._allocate(callsign)
+                newer = True
+            else:
+                newer = heard >= self._heard[slot]
+
+            if newer:
+                self._slots.move_to_end(callsign)
+                self._heard[slot] = heard
+            else:
+                # Frames replayed from archives may be older than the last
+                # heard, and mustn't make a Station look recently heard or
+                # replace its newer fields, only fill in those still empty.
+                if not math.isnan(self._lats[slot]):
+                    lat = lng = None
+                if self._symbols[slot * 2:slot * 2 + 2] != NO_SYMBOL:
+                    symbol = None
+                if self._statuses[slot] is not None:
+                    status = None
+                if self._paths[slot] is not None:
+                    path = None
+
+            if lat is not None and lng is not None:
+                self._lats[slot] = lat
+                self._lngs[slot] = lng
+            if symbol is not None:
+                self._symbols[slot * 2:slot * 2 + 2] = symbol
+            if status is not None:
+                self._statuses[slot] = status
+            if path is not None:
+                self._paths[slot] = path
+
+    def update_frame(self, frame, heard: float=None) -> None:
+        """
+        Records the Source Station of a Frame as heard, updating its path,
+        and its position & symbol or status if the Frame carries them.
+        """
+        info = bytes(frame.info)
+        lat = lng = symbol = status = None
+
+        position = aprs.parse_position(info)
+        if position is not None:
+            lat, lng = position
+            symbol = aprs.parse_symbol(info)
+        elif info[0:1] == b'>':
+            status = info[1:]
+
+        self.update(
+            frame.source,
+            lat=lat,
+            lng=lng,
+            status=status,
+            symbol=symbol,
+            path=b','.join(bytes(p) for p in frame.path),
+            heard=heard
+        )
+
+    def remove(self, callsign) -> None:
+        """
+        Removes a Station from the Store.
+        """
+        with self._lock:
+            self._remove(str(callsign))
+
+    def _remove(self, callsign: str) -> None:
+        slot = self._slots.pop(callsign)
+        last = len(self._callsigns) - 1
+        if slot != last:
+            # Move the last record into the hole to keep the columns dense.
+            moved = self._callsigns[last]
+            self._callsigns[slot] = moved
+            self._lats[slot] = self._lats[last]
+            self._lngs[slot] = self._lngs[last]
+            self._heard[slot] = self._heard[last]
+            self._symbols[slot * 2:slot * 2 + 2] = \
+                self._symbols[last * 2:last * 2 + 2]
+            self._statuses[slot] = self._statuses[last]
+            self._paths[slot] = self._paths[last]
+            self._slots[moved] = slot
+        self._callsigns.pop()
+        self._lats.pop()
+        self._lngs.pop()
+        self._heard.pop()
+        del self._symbols[-2:]
+        self._statuses.pop()
+        self._paths.pop()
+
+    def get(self, callsign) -> typing.Optional[Station]:
+        """
+        Returns a `Station` snapshot of a Station's record, or None.
+        """
+        callsign = str(callsign)
+        with self._lock:
+            slot = self._slots.get(callsign)
+            if slot is None:
+                return None
+            symbol = bytes(self._symbols[slot * 2:slot * 2 + 2])
+            return Station(
+                callsign=self._callsigns[slot],
+                lat=self._lats[slot],
+                lng=self._lngs[slot],
+                status=self._statuses[slot],
+                symbol=None if symbol == NO_SYMBOL else symbol,
+                path=self._paths[slot],
+                heard=self._heard[slot]
+            )
+
+    def __getitem__(self, callsign) -> Station:
+        station = self.get(callsign)
+        if station is None:
+            raise KeyError(callsign)
+        return station
+
+    def last_heard(self, callsign) -> float:
+        """
+        Returns the time a Station was last heard, as a UNIX timestamp.
+        """
+        with self._lock:
+            return self._heard[self._slots[str(callsign)]]
+
+    def expire(self, before: float) -> int:
+        """
+        Removes every Station last heard before `before`.
+
+        Every Station is checked, as Stations first heard in old Frames,
+        eg from an archive, are queued behind more recently heard ones.
+
+        :returns: Number of Stations removed.
+        :rtype: int
+        """
+        with self._lock:
+            heard = self._heard
+            expired = [callsign for callsign, slot in self._slots.items()
+                       if heard[slot] < before]
+            for callsign in expired:
+                self._remove(callsign)
+        return len(expired)
+
+    def columns(self) -> typing.Tuple[
+            typing.List[str], array.array, array.array, array.array, bytes,
+            typing.List[typing.Optional[bytes]],
+            typing.List[typing.Optional[bytes]]]:
+        """
+        Returns a consistent copy of every Station's record, least recently
+        heard first, as columns: callsigns, lats, lngs, heard, symbols (two
+        bytes per Station), statuses & paths.
+        """
+        with self._lock:
+            order = list(self._slots.values())
+            symbols = self._symbols
+            return (
+                [self._callsigns[slot] for slot in order],
+                array.array('d', (self._lats[slot] for slot in order)),
+                array.array('d', (self._lngs[slot] for slot in order)),
+                array.array('d', (self._heard[slot] for slot in order)),
+                b''.join(symbols[slot * 2:slot * 2 + 2] for slot in order),
+                [self._statuses[slot] for slot in order],
+                [self._paths[slot] for slot in order],
+            )
+
+    @classmethod
+    def from_columns(cls, callsigns: typing.List[str], lats: array.array,
+                     lngs: array.array, heard: array.array, symbols: bytes,
+                     statuses: typing.List[typing.Optional[bytes]],
+                     paths: typing.List[typing.Optional[bytes]],
+                     max_stations: int=100000,
+                     evictions: int=0) -> 'StationStore':
+        """
+        Returns a Store holding the records returned by `columns()`.
+        """
+        store = cls(max_stations=max_stations)
+        store.evictions = evictions
+        store._callsigns = [sys.intern(callsign) for callsign in callsigns]
+        store._lats = array.array('d', lats)
+        store._lngs = array.array('d', lngs)
+        store._heard = array.array('d', heard)
+        store._symbols = bytearray(symbols)
+        store._statuses = list(statuses)
+        store._paths = list(paths)
+        store._slots = collections.OrderedDict(
+            zip(store._callsigns, range(len(store._callsigns))))
+        return store
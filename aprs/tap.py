@@ -0,0 +1,126 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Python APRS Module Packet Tap Definitions.
+
+A fixed-size, in-memory ring of the last raw Frames an Interface received,
+with their receive times & Interface tags, for debugging in production
+without the cost of logging each Frame::
+
+    aprs_conn.tap = aprs.PacketTap(4096)
+    aprs_conn.tap.install_signal()  # kill -USR1 <pid> dumps the ring
+    aprs_conn.receive(callback)
+
+The ring is dumped on demand with `dump()`, on a signal, and by the
+Interface when its receive loop fails. Frames can also be streamed to a
+binary file as they are received.
+
+Dumps & streams have one Frame per line::
+
+    <UNIX time> <tag> <frame>
+
+with any backslashes, CRs & LFs in the Frame escaped.
+"""
+
+import signal
+import sys
+import time
+import typing
+
+__author__ = 'Greg Albrecht W2GMD <oss@undef.net>'  # NOQA pylint: disable=R0801
+__copyright__ = 'Copyright 2017 Greg Albrecht and Contributors'  # NOQA pylint: disable=R0801
+__license__ = 'Apache License, Version 2.0'  # NOQA pylint: disable=R0801
+
+
+def _escape(data: bytes) -> bytes:
+    if b'\n' in data or b'\r' in data or b'\\' in data:
+        return data.replace(b'\\', b'\\\\').replace(
+            b'\n', b'\\n').replace(b'\r', b'\\r')
+    return data
+
+
+class PacketTap(object):
+
+    """
+    Packet Tap Class.
+
+    :param size: Number of Frames kept.
+    :param stream: Binary file to also write every Frame to, eg
+                   `open('frames.log', 'ab', buffering=1 << 20)`.
+    :param dump_path: File `dump()` appends to by default, instead of
+                      stderr.
+    """
+
+    __slots__ = ['size', 'stream', 'dump_path', 'count', '_frames',
+                 '_times', '_tags']
+
+    def __init__(self, size: int=1024, stream: typing.BinaryIO=None,
+                 dump_path: str=None) -> None:
+        self.size = size
+        self.stream = stream
+        self.dump_path = dump_path
+        self.count = 0
+        self._frames: typing.List[bytes] = [None] * size
+        self._times = [0.0] * size
+        self._tags: typing.List[bytes] = [None] * size
+
+    def __repr__(self) -> str:
+        return '<PacketTap %d/%d>' % (min(self.count, self.size), self.size)
+
+    def __len__(self) -> int:
+        return min(self.count, self.size)
+
+    def record(self, frame: bytes, tag: bytes=b'-') -> None:
+        """Records a received Frame."""
+        index = self.count % self.size
+        timestamp = time.time()
+        self._frames[index] = frame
+        self._times[index] = timestamp
+        self._tags[index] = tag
+        self.count += 1
+        if self.stream is not None:
+            self.stream.write(
+                b'%.6f %s %s\n' % (timestamp, tag, _escape(bytes(frame))))
+
+    def snapshot(self) -> typing.List[typing.Tuple[float, bytes, bytes]]:
+        """Returns the (time, tag, frame) of the kept Frames, oldest first."""
+        if self.count <= self.size:
+            indexes = range(self.count)
+        else:
+            start = self.count % self.size
+            indexes = list(range(start, self.size)) + list(range(start))
+        return [(self._times[index], self._tags[index], self._frames[index])
+                for index in indexes]
+
+    def dump(self, out: typing.BinaryIO=None) -> int:
+        """
+        Writes the kept Frames to `out`, by default appending to `dump_path`
+        or writing to stderr.
+
+        :returns: Number of Frames written.
+        :rtype: int
+        """
+        if out is None and self.dump_path:
+            with open(self.dump_path, 'ab') as dump_file:
+                return self.dump(dump_file)
+        out = out or sys.stderr.buffer
+        frames = self.snapshot()
+        out.write(b''.join(
+            b'%.6f %s %s\n' % (timestamp, tag, _escape(bytes(frame)))
+            for timestamp, tag, frame in frames))
+        out.flush()
+        return len(frames)
+
+    def install_signal(self, signum: int=getattr(signal, 'SIGUSR1', None)
+                       ) -> None:
+        """
+        Dumps the kept Frames whenever the process receives `signum`.
+
+        :raises ValueError: If `signum` is None, eg SIGUSR1 on Windows.
+        """
+        if signum is None:
+            raise ValueError(
+                'No signal to install on: SIGUSR1 is not available on this '
+                'platform, pass signum.')
+        signal.signal(signum, lambda *args: self.dump())
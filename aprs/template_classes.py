@@ -0,0 +1,154 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""Python APRS Module Frame Template Class Definitions."""
+
+import array
+import logging
+import typing
+
+import aprs  # pylint: disable=R0801
+
+__author__ = 'Greg Albrecht W2GMD <oss@undef.net>'  # NOQA pylint: disable=R0801
+__copyright__ = 'Copyright 2017 Greg Albrecht and Contributors'  # NOQA pylint: disable=R0801
+__license__ = 'Apache License, Version 2.0'  # NOQA pylint: disable=R0801
+
+
+class FrameTemplate(object):
+
+    """
+    Frame Template Class.
+
+    Pre-encodes the Source, Destination & Path of Frames originated from a
+    fixed station, in both text & AX.25 form, so each Frame only needs its
+    Information Field appended and, for AX.25, an FCS update from the
+    pre-computed header state.
+
+    Rendered Frames are byte-identical to `aprs.Frame.__bytes__` and
+    `aprs.Frame.encode_ax25` of the same Frame.
+    """
+
+    __slots__ = ['source', 'destination', 'path', '_text_header',
+                 '_ax25_header', '_header_fcs']
+
+    _logger = logging.getLogger(__name__)  # pylint: disable=R0801
+    if not _logger.handlers:  # pylint: disable=R0801
+        _logger.setLevel(aprs.LOG_LEVEL)  # pylint: disable=R0801
+        _console_handler = logging.StreamHandler()  # pylint: disable=R0801
+        _console_handler.setLevel(aprs.LOG_LEVEL)  # pylint: disable=R0801
+        _console_handler.setFormatter(aprs.LOG_FORMAT)  # pylint: disable=R0801
+        _logger.addHandler(_console_handler)  # pylint: disable=R0801
+        _logger.propagate = False  # pylint: disable=R0801
+
+    def __init__(self, source: bytes, destination: bytes=aprs.DEFAULT_TOCALL,
+                 path: typing.List[bytes]=[]) -> None:
+        parse_callsign_text = aprs.functions.parse_callsign_text
+        self.source = parse_callsign_text(_to_bytes(source))
+        self.destination = parse_callsign_text(_to_bytes(destination))
+        self.path = [parse_callsign_text(_to_bytes(pth)) for pth in path]
+
+        full_path = [bytes(self.destination)]
+        full_path.extend([bytes(pth) for pth in self.path])
+        self._text_header = b'%s>%s:' % (
+            bytes(self.source), b','.join(full_path))
+
+        encoded_header = [aprs.AX25_FLAG, self.destination.encode_ax25(),
+                          self.source.encode_ax25()]
+        encoded_header.extend([pth.encode_ax25() for pth in self.path])
+        encoded_header.append(aprs.ADDR_INFO_DELIM)
+        self._ax25_header = b''.join(encoded_header)
+
+        # Run the FCS over the header as `aprs.Frame.encode_ax25` does, and
+        # keep its state to continue from for each Information Field.
+        fcs = aprs.FCS()
+        for bit in encoded_header:
+            fcs.update_bit(bit)
+        self._header_fcs = fcs.fcs
+
+    def __repr__(self) -> str:
+        return '<FrameTemplate %s>' % self._text_header.decode()
+
+    def _digest(self, info: bytes) -> bytes:
+        fcs = aprs.FCS()
+        fcs.fcs = self._header_fcs
+        fcs.update_bit(info)
+        return fcs.digest()
+
+    def frame(self, info: typing.Union[str, bytes]):
+        """
+        Returns an `aprs.Frame` from this template, sharing its (already
+        parsed) Callsigns.
+        """
+        return aprs.Frame(self.source, self.destination, list(self.path),
+                          _to_bytes(info))
+
+    def render(self, info: typing.Union[str, bytes]) -> bytes:
+        """Renders a plain-text Frame."""
+        return self._text_header + _to_bytes(info)
+
+    def encode_ax25(self, info: typing.Union[str, bytes]) -> bytes:
+        """Renders an AX.25 encoded Frame."""
+        info = _to_bytes(info)
+        return b''.join([self._ax25_header, info, self._digest(info),
+                         aprs.AX25_FLAG])
+
+    def render_many(self, infos: typing.Sequence[bytes],
+                    buffer: bytearray=None, ax25: bool=False,
+                    line_ending: bytes=b'\r\n') -> tuple:
+        """
+        Renders many Frames back-to-back into one buffer.
+
+        :param infos: Information Fields, one per Frame.
+        :param buffer: Buffer to reuse; grown if too small.
+        :param ax25: If True, renders AX.25 encoded Frames, otherwise
+                     plain-text Frames each followed by `line_ending`.
+
+        :returns: (buffer, offsets), where Frame n occupies
+                  buffer[offsets[n]:offsets[n + 1]], and
+                  buffer[:offsets[-1]] holds all the Frames.
+        :rtype: tuple
+        """
+        infos = [_to_bytes(info) for info in infos]
+        if ax25:
+            header = self._ax25_header
+            trailer_size = 3
+        else:
+            header = self._text_header
+            trailer_size = len(line_ending)
+        header_size = len(header)
+
+        offsets = array.array('Q', [0])
+        total = 0
+        for info in infos:
+            total += header_size + len(info) + trailer_size
+            offsets.append(total)
+
+        if buffer is None:
+            buffer = bytearray(total)
+        elif len(buffer) < total:
+            buffer.extend(bytes(total - len(buffer)))
+
+        view = memoryview(buffer)
+        position = 0
+        for info in infos:
+            end = position + header_size
+            view[position:end] = header
+            position = end
+            end += len(info)
+            view[position:end] = info
+            position = end
+            if ax25:
+                end += 3
+                view[position:end] = self._digest(info) + aprs.AX25_FLAG
+            else:
+                end += trailer_size
+                view[position:end] = line_ending
+            position = end
+        view.release()
+        return (buffer, offsets)
+
+
+def _to_bytes(value: typing.Union[str, bytes]) -> bytes:
+    if isinstance(value, str):
+        return bytes(value, 'UTF-8')
+    return bytes(value)
@@ -0,0 +1,103 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Python APRS Module Receive Tracing Definitions.
+
+Opt-in, sampled timing of each stage a received Frame goes through in an
+Interface's receive loop::
+
+    aprs_conn.tracer = aprs.tracing.Tracer(sample_rate=0.01)
+    aprs_conn.receive(callback)
+    ...
+    aprs_conn.tracer.summary()
+
+Stages, in nanoseconds of `time.monotonic_ns`:
+
+* read: blocked in `recv` for the chunk holding the Frame (network idle
+  time included).
+* split: splitting the chunk into lines.
+* queue: waiting behind the earlier lines of the same chunk.
+* parse: the `frame_handler`, eg `aprs.parse_frame`.
+* callback: the receive callback.
+* total: from the chunk being received to the callback returning.
+
+Durations are recorded as `aprs_receive_stage_seconds` Histograms in an
+`aprs.metrics.MetricsRegistry`, labelled by Interface & stage.
+"""
+
+import typing
+
+import aprs  # pylint: disable=R0801
+
+__author__ = 'Greg Albrecht W2GMD <oss@undef.net>'  # NOQA pylint: disable=R0801
+__copyright__ = 'Copyright 2017 Greg Albrecht and Contributors'  # NOQA pylint: disable=R0801
+__license__ = 'Apache License, Version 2.0'  # NOQA pylint: disable=R0801
+
+
+TRACE_STAGES = ('read', 'split', 'queue', 'parse', 'callback', 'total')
+
+
+class Tracer(object):
+
+    """
+    Receive Tracer Class.
+
+    Samples one in every `1 / sample_rate` Frames, deterministically, so the
+    untraced Frames only pay for a counter decrement.
+
+    :param sample_rate: Fraction of Frames to trace, (0, 1].
+    :param interface: `interface` label of the Histograms.
+    :param registry: Registry for the Histograms, default
+                     `aprs.metrics.REGISTRY`.
+    """
+
+    __slots__ = ['interval', 'interface', 'stages', 'traced', '_countdown']
+
+    def __init__(self, sample_rate: float=1.0, interface: str='tcp',
+                 registry=None,
+                 buckets: typing.Sequence[float]=aprs.metrics.LATENCY_BUCKETS
+                 ) -> None:
+        if not 0 < sample_rate <= 1:
+            raise ValueError('sample_rate must be in (0, 1]')
+        registry = registry or aprs.metrics.REGISTRY
+        self.interval = max(1, int(round(1 / sample_rate)))
+        self.interface = interface
+        self.stages = {
+            stage: registry.histogram(
+                'aprs_receive_stage_seconds',
+                'Time spent per receive stage, for sampled Frames.',
+                buckets=buckets, interface=interface, stage=stage)
+            for stage in TRACE_STAGES
+        }
+        self.traced = 0
+        self._countdown = 1
+
+    def __repr__(self) -> str:
+        return '<Tracer %s 1/%d>' % (self.interface, self.interval)
+
+    def sample(self) -> bool:
+        """Returns True if the next Frame is to be traced."""
+        self._countdown -= 1
+        if self._countdown:
+            return False
+        self._countdown = self.interval
+        self.traced += 1
+        return True
+
+    def record(self, stage: str, nanoseconds: int) -> None:
+        """Records the duration of a stage for a traced Frame."""
+        self.stages[stage].observe(nanoseconds / 1e9)
+
+    def summary(self) -> dict:
+        """
+        Returns the Histogram of each stage, as
+        `aprs.metrics.Histogram.value`, with its mean in seconds.
+        """
+        summary = {}
+        for stage, histogram in self.stages.items():
+            value = histogram.value
+            value['mean'] = (value['sum'] / value['count']
+                             if value['count'] else float('nan'))
+            summary[stage] = value
+        return summary
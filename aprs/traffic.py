@@ -0,0 +1,435 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Python APRS Module Synthetic Traffic Definitions.
+
+Generates deterministic, seeded APRS traffic for load testing and
+benchmarks: a population of stations (mobiles, fixed stations, weather
+stations & iGates) sending positions, Mic-E, compressed positions,
+messages, telemetry, weather, status and objects over realistic
+tocall & path distributions::
+
+    generator = aprs.traffic.TrafficGenerator(seed=1)
+    feed = generator.feed(1000000)
+
+Each station's Frames are built once, as a small set of variants, with
+`aprs.FrameTemplate`, `aprs.Frame` & `aprs.PositionFrame`, and encoded as
+text, AX.25 (as heard on-air, without q-constructs) and KISS. Generating
+traffic then only draws (station, variant) pairs, so the same seed always
+yields the same traffic and output runs at millions of Frames per second.
+"""
+
+import math
+import random
+import typing
+
+import aprs  # pylint: disable=R0801
+
+__author__ = 'Greg Albrecht W2GMD <oss@undef.net>'  # NOQA pylint: disable=R0801
+__copyright__ = 'Copyright 2017 Greg Albrecht and Contributors'  # NOQA pylint: disable=R0801
+__license__ = 'Apache License, Version 2.0'  # NOQA pylint: disable=R0801
+
+
+# (kind, share of stations, SSIDs, tocalls, Frame types & weights)
+STATION_KINDS = [
+    ('mobile', 0.35, [9, 7, 5, 14, 15, 8], [b'APDR16', b'APOTC1', b'APK102'],
+     {'mic_e': 0.6, 'compressed': 0.25, 'position': 0.1, 'status': 0.05}),
+    ('fixed', 0.3, [0, 0, 0, 1, 2, 3, 4], [b'APX219', b'APU25N', b'APRS'],
+     {'position': 0.6, 'status': 0.15, 'message': 0.15, 'object': 0.1}),
+    ('weather', 0.15, [13, 0, 1, 3], [b'APRS', b'APMI06', b'APN391'],
+     {'weather': 0.9, 'telemetry': 0.1}),
+    ('igate', 0.2, [10, 1, 3, 10], [b'APRX28', b'APMI06', b'APWW11'],
+     {'position': 0.5, 'telemetry': 0.3, 'status': 0.2}),
+]
+
+# Symbol (table, code) of each station kind.
+KIND_SYMBOLS = {
+    'mobile': (b'/', b'>'),
+    'fixed': (b'/', b'-'),
+    'weather': (b'/', b'_'),
+    'igate': (b'I', b'#'),
+}
+
+# On-air paths & weights. '<digi>' is replaced by a digipeater Callsign.
+RF_PATHS = [
+    ([b'WIDE1-1', b'WIDE2-1'], 0.5),
+    ([b'WIDE2-2'], 0.15),
+    ([b'WIDE2-1'], 0.15),
+    ([b'<digi>*', b'WIDE2-1'], 0.15),
+    ([b'WIDE1-1'], 0.05),
+]
+
+APRSIS_SERVERS = [b'T2TEST', b'T2USANE', b'T2SWEDEN', b'T2CAEAST', b'T2UK',
+                  b'T2JAPAN', b'T2BRAZIL', b'T2NZ']
+
+# (Callsign prefixes, share of stations, (lat, lng) population centres)
+REGIONS = [
+    ([b'K', b'W', b'N', b'KB', b'KC', b'KD', b'KE', b'KF', b'KG', b'KI',
+      b'KJ', b'KK', b'AE'], 0.6,
+     [(37.75, -122.45), (40.71, -74.0), (34.05, -118.25), (41.88, -87.63),
+      (47.61, -122.33), (29.76, -95.37), (39.74, -104.99), (33.75, -84.39)]),
+    ([b'VE'], 0.06, [(43.65, -79.38), (49.28, -123.12), (45.5, -73.57)]),
+    ([b'DL', b'DO', b'DK'], 0.1, [(52.52, 13.4), (48.14, 11.58)]),
+    ([b'G', b'M'], 0.05, [(51.51, -0.13), (53.48, -2.24)]),
+    ([b'JA', b'JH'], 0.07, [(35.68, 139.69), (34.69, 135.5)]),
+    ([b'VK'], 0.05, [(-33.87, 151.21), (-37.81, 144.96)]),
+    ([b'PY'], 0.04, [(-23.55, -46.63)]),
+    ([b'ZL'], 0.03, [(-36.85, 174.76)]),
+]
+
+STATUS_TEXTS = [b'On the air', b'Mobile on 144.390', b'QRV 146.520',
+                b'Monitoring', b'Home', b'En route', b'Net control',
+                b'Solar powered 13.8V']
+
+MESSAGE_TEXTS = [b'Hello from the road', b'QSL?', b'73', b'Test message',
+                 b'Are you on the net tonight?', b'ack', b'On my way']
+
+OBJECT_NAMES = [b'145.230-R', b'LEADER', b'AID-1', b'NET', b'CHECKPT2',
+                b'EOC', b'REPEATER']
+
+
+def _base91(value: int, width: int) -> bytes:
+    """Encodes a non-negative int as `width` base-91 characters."""
+    chars = bytearray(width)
+    for pos in range(width - 1, -1, -1):
+        value, digit = divmod(value, 91)
+        chars[pos] = digit + 33
+    return bytes(chars)
+
+
+def compressed_position(lat: float, lng: float, table: bytes=b'/',
+                        symbol: bytes=b'>', course: int=0,
+                        speed: int=0) -> bytes:
+    """
+    Returns a compressed (base-91) position report Information Field.
+
+    >>> lat, lng = aprs.parse_position(compressed_position(49.5, -72.75))
+    >>> '%.4f %.4f' % (lat, lng)
+    '49.5000 -72.7500'
+    """
+    lat_value = int(round(380926 * (90 - lat)))
+    lng_value = int(round(190463 * (180 + lng)))
+    speed_value = int(round(math.log(speed + 1) / math.log(1.08)))
+    return b''.join([
+        b'!', table, _base91(lat_value, 4), _base91(lng_value, 4), symbol,
+        bytes([course // 4 + 33, speed_value + 33]),
+        b'[',  # Compression Type: current GPS fix, RMC, software.
+    ])
+
+
+def mic_e(lat: float, lng: float, table: bytes=b'/', symbol: bytes=b'>',
+          course: int=0, speed: int=0,
+          status: bytes=b'') -> typing.Tuple[bytes, bytes]:
+    """
+    Returns the (Destination, Information Field) of a Mic-E position report
+    with the 'En Route' message code.
+    """
+    lat_digits = b'%02d%04d' % (
+        int(abs(lat)), int(round((abs(lat) % 1) * 6000)) % 6000)
+    lng_deg = int(abs(lng))
+    lng_min = (abs(lng) - lng_deg) * 60
+    lng_min_whole = int(lng_min)
+    lng_hundredths = int(round((lng_min - lng_min_whole) * 100)) % 100
+
+    # Destination: latitude digits, with message bits A & B set, N/S,
+    # longitude offset & W/E flags encoded in the digits' character set.
+    long_offset = lng_deg < 10 or lng_deg >= 100
+    flags = [True, True, False, lat >= 0, long_offset, lng < 0]
+    destination = bytes(
+        digit + (ord('P') - ord('0') if flag else 0)
+        for digit, flag in zip(lat_digits, flags))
+
+    if lng_deg < 10:
+        lng_d = lng_deg + 90
+    elif lng_deg >= 100:
+        lng_d = lng_deg - 100 + (80 if lng_deg < 110 else 0)
+    else:
+        lng_d = lng_deg
+    info = b''.join([
+        b'`',
+        bytes([
+            lng_d + 28,
+            (lng_min_whole if lng_min_whole >= 10 else lng_min_whole + 60) +
+            28,
+            lng_hundredths + 28,
+            speed // 10 + 28,
+            (speed % 10) * 10 + course // 100 + 28,
+            course % 100 + 28,
+        ]),
+        symbol, table, status
+    ])
+    return (destination, info)
+
+
+class Station(object):
+
+    """
+    Synthetic Station Class.
+
+    Holds the pre-built Frame variants of one station, in text, AX.25 &
+    KISS form.
+    """
+
+    __slots__ = ['callsign', 'kind', 'rf', 'cwop', 'region', 'home',
+                 'weight', 'lines', 'ax25', 'kiss']
+
+    def __init__(self, callsign: bytes, kind: str, rf: bool, cwop: bool,
+                 region: int, home: typing.Tuple[float, float],
+                 weight: float) -> None:
+        self.callsign = callsign
+        self.kind = kind
+        self.rf = rf
+        self.cwop = cwop
+        self.region = region
+        self.home = home
+        self.weight = weight
+        self.lines: typing.List[bytes] = []
+        self.ax25: typing.List[bytes] = []
+        self.kiss: typing.List[bytes] = []
+
+    def __repr__(self) -> str:
+        return '<Station %s %s>' % (self.callsign.decode(), self.kind)
+
+
+class TrafficGenerator(object):
+
+    """
+    Synthetic APRS Traffic Generator Class.
+
+    :param seed: Random seed; the same seed generates the same traffic.
+    :param stations: Number of stations.
+    :param variants: Number of distinct Frames built per station.
+    """
+
+    def __init__(self, seed: int=0, stations: int=1000,
+                 variants: int=16) -> None:
+        self.seed = seed
+        self.variants = variants
+        self._random = random.Random(seed)
+        self._callsigns: typing.Set[bytes] = set()
+        self._kiss_encoder = aprs.FrameEncoder(kiss=True)
+
+        self.stations = [self._new_station() for _ in range(stations)]
+        # iGates & digipeaters relay the stations in their region.
+        self.igates: typing.Dict[int, typing.List[bytes]] = {}
+        for station in self.stations:
+            if station.kind == 'igate':
+                self.igates.setdefault(station.region, []).append(
+                    station.callsign)
+        for station in self.stations:
+            self._build(station)
+
+        self._text_pool: typing.List[int] = []
+        self._text_weights: typing.List[float] = []
+        self._rf_pool: typing.List[int] = []
+        self._rf_weights: typing.List[float] = []
+        for index, station in enumerate(self.stations):
+            self._text_pool.append(index)
+            self._text_weights.append(station.weight)
+            if station.rf:
+                self._rf_pool.append(index)
+                self._rf_weights.append(station.weight)
+        self._text_cum = _cumulative(self._text_weights)
+        self._rf_cum = _cumulative(self._rf_weights)
+
+    def _choice(self, weighted: typing.Sequence[tuple]):
+        values = [value for value, _ in weighted]
+        weights = [weight for _, weight in weighted]
+        return self._random.choices(values, weights)[0]
+
+    def _new_callsign(self, cwop: bool) -> typing.Tuple[bytes, int, tuple]:
+        """Returns a new unique (Callsign, region, population centre)."""
+        rand = self._random
+        region = self._choice(
+            [(index, spec[1]) for index, spec in enumerate(REGIONS)])
+        prefixes, _, centres = REGIONS[region]
+        while True:
+            if cwop:
+                callsign = b'%s%04d' % (
+                    rand.choice([b'CW', b'DW', b'EW', b'FW']),
+                    rand.randrange(10000))
+            else:
+                suffix = bytes(rand.choice(b'ABCDEFGHIJKLMNOPQRSTUVWXYZ')
+                               for _ in range(rand.choice([2, 3, 3])))
+                callsign = b'%s%d%s' % (
+                    rand.choice(prefixes), rand.randrange(10), suffix)
+                callsign = callsign[:6]
+            if callsign not in self._callsigns:
+                self._callsigns.add(callsign)
+                return (callsign, region, rand.choice(centres))
+
+    def _new_station(self) -> Station:
+        rand = self._random
+        kind, _, ssids, _, _ = self._choice(
+            [(spec, spec[1]) for spec in STATION_KINDS])
+        # Half of weather stations are Citizen Weather Observer Program
+        # stations, which only report over APRS-IS.
+        cwop = kind == 'weather' and rand.random() < 0.5
+        callsign, region, centre = self._new_callsign(cwop)
+        ssid = rand.choice(ssids)
+        if ssid and not cwop:
+            callsign = b'%s-%d' % (callsign, ssid)
+        rf = not cwop and kind != 'igate' and rand.random() < 0.8
+        home = (centre[0] + rand.gauss(0, 0.3),
+                centre[1] + rand.gauss(0, 0.3))
+        # A few very busy stations & a long tail, as on APRS-IS.
+        return Station(callsign, kind, rf, cwop, region, home,
+                       rand.paretovariate(1.2))
+
+    def _path(self, station: Station) -> typing.Tuple[list, list]:
+        """Returns the (on-air, APRS-IS) Paths for a Frame."""
+        rand = self._random
+        if station.rf:
+            igates = self.igates.get(station.region) or [b'W2GMD-10']
+            rf_path = list(self._choice(RF_PATHS))
+            if rf_path[0] == b'<digi>*':
+                rf_path[0] = rand.choice(igates).split(b'-')[0] + b'*'
+            return (rf_path,
+                    rf_path + [rand.choice([b'qAR', b'qAR', b'qAO']),
+                               rand.choice(igates)])
+        if station.cwop:
+            return ([], [b'TCPXX*', b'qAX', b'CWOP-%d' % rand.randrange(1, 8)])
+        return ([], [b'TCPIP*', b'qAC', rand.choice(APRSIS_SERVERS)])
+
+    def _timestamp(self) -> bytes:
+        rand = self._random
+        return b'%02d%02d%02dz' % (
+            rand.randrange(1, 29), rand.randrange(24), rand.randrange(60))
+
+    def _info(self, frame_type: str, lat: float, lng: float,
+              tx_count: int) -> typing.Tuple[typing.Optional[bytes], bytes]:
+        """Returns the (Mic-E Destination or None, Information Field)."""
+        rand = self._random
+        enc_lat = bytes(aprs.dec2dm_lat(lat), 'UTF-8')
+        enc_lng = bytes(aprs.dec2dm_lng(lng), 'UTF-8')
+        course = rand.randrange(360)
+        speed = rand.randrange(80)
+        if frame_type == 'mic_e':
+            return mic_e(lat, lng, b'/', rand.choice([b'>', b'k', b'j', b'v']),
+                         course, speed, rand.choice([b'', b']=', b'`_%']))
+        elif frame_type == 'compressed':
+            return (None, compressed_position(
+                lat, lng, b'/', rand.choice([b'>', b'k', b'[']), course,
+                speed))
+        elif frame_type == 'weather':
+            return (None, b'@%s%s/%s_%03d/%03dg%03dt%03dr%03dp%03dP%03dh%02db'
+                    b'%05d' % (
+                        self._timestamp(), enc_lat, enc_lng, course,
+                        speed // 4, speed // 2, rand.randrange(20, 100),
+                        rand.randrange(5), rand.randrange(20),
+                        rand.randrange(20), rand.randrange(10, 100),
+                        rand.randrange(9900, 10300)))
+        elif frame_type == 'telemetry':
+            return (None, b'T#%03d,%d,%d,%d,%d,%d,%s' % (
+                tx_count % 1000, rand.randrange(256), rand.randrange(256),
+                rand.randrange(256), rand.randrange(256),
+                rand.randrange(256),
+                bytes(rand.choice(b'01') for _ in range(8))))
+        elif frame_type == 'status':
+            return (None, b'>' + rand.choice(STATUS_TEXTS))
+        elif frame_type == 'message':
+            return (None, b':%-9s:%s{%d' % (
+                rand.choice(self.stations).callsign,
+                rand.choice(MESSAGE_TEXTS), tx_count % 100))
+        elif frame_type == 'object':
+            return (None, b';%-9s*%s%s/%sr%s' % (
+                rand.choice(OBJECT_NAMES), self._timestamp(), enc_lat,
+                enc_lng, rand.choice(STATUS_TEXTS)))
+        return (None, None)
+
+    def _build(self, station: Station) -> None:
+        """Builds the Frame variants of a station."""
+        rand = self._random
+        _, _, _, tocalls, frame_types = next(
+            spec for spec in STATION_KINDS if spec[0] == station.kind)
+        tocall = rand.choice(tocalls)
+        table, symbol = KIND_SYMBOLS[station.kind]
+        home = station.home
+
+        lines = []
+        on_air = []
+        for tx_count in range(self.variants):
+            frame_type = self._choice(list(frame_types.items()))
+            lat = home[0]
+            lng = home[1]
+            if station.kind == 'mobile':
+                lat += rand.gauss(0, 0.05)
+                lng += rand.gauss(0, 0.05)
+            rf_path, path = self._path(station)
+
+            if frame_type == 'position':
+                template = aprs.FrameTemplate(station.callsign, tocall, path)
+                frame = aprs.PositionFrame(
+                    template.source, template.destination, template.path,
+                    table, symbol, rand.choice(STATUS_TEXTS), lat, lng, 0)
+                info = bytes(frame.info)
+                destination = tocall
+            else:
+                mic_e_destination, info = self._info(
+                    frame_type, lat, lng, tx_count)
+                destination = mic_e_destination or tocall
+                template = aprs.FrameTemplate(
+                    station.callsign, destination, path)
+                frame = template.frame(info)
+
+            lines.append(bytes(frame))
+            if station.rf:
+                on_air.append(aprs.FrameTemplate(
+                    station.callsign, destination, rf_path).frame(info))
+
+        station.lines = lines
+        if on_air:
+            with self._kiss_encoder.encode_many(on_air) as encoded:
+                offsets = self._kiss_encoder.offsets
+                station.kiss = [bytes(encoded[start:end]) for start, end in
+                                zip(offsets, offsets[1:])]
+            station.ax25 = [frame.encode_ax25() for frame in on_air]
+
+    def _draw(self, count: int, rf: bool) -> typing.List[Station]:
+        rand = self._random
+        if rf:
+            indexes = rand.choices(self._rf_pool, cum_weights=self._rf_cum,
+                                   k=count)
+        else:
+            indexes = rand.choices(self._text_pool,
+                                   cum_weights=self._text_cum, k=count)
+        stations = self.stations
+        return [stations[index] for index in indexes]
+
+    def _variant_indexes(self, count: int) -> typing.List[int]:
+        return self._random.choices(range(self.variants), k=count)
+
+    def lines(self, count: int) -> typing.List[bytes]:
+        """Returns `count` APRS-IS text Frames, without line endings."""
+        return [station.lines[variant] for station, variant in zip(
+            self._draw(count, False), self._variant_indexes(count))]
+
+    def feed(self, count: int) -> bytes:
+        """Returns `count` APRS-IS text Frames as sent on the wire."""
+        return b'\r\n'.join(self.lines(count)) + b'\r\n'
+
+    def ax25(self, count: int) -> typing.List[bytes]:
+        """Returns `count` AX.25 encoded on-air Frames from RF stations."""
+        return [station.ax25[variant] for station, variant in zip(
+            self._draw(count, True), self._variant_indexes(count))]
+
+    def kiss(self, count: int) -> typing.List[bytes]:
+        """Returns `count` KISS framed on-air Frames from RF stations."""
+        return [station.kiss[variant] for station, variant in zip(
+            self._draw(count, True), self._variant_indexes(count))]
+
+    def frames(self, count: int) -> typing.Iterator:
+        """Yields `count` APRS-IS Frames as new `aprs.Frame` objects."""
+        parse_frame_text = aprs.functions.parse_frame_text
+        for line in self.lines(count):
+            yield parse_frame_text(line)
+
+
+def _cumulative(weights: typing.List[float]) -> typing.List[float]:
+    total = 0.0
+    cumulative = []
+    for weight in weights:
+        total += weight
+        cumulative.append(total)
+    return cumulative
@@ -0,0 +1,64 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Python APRS Module Benchmarks.
+
+Benchmarks are written for airspeed velocity (asv), see `asv.conf.json`::
+
+    asv run
+    asv compare master HEAD
+
+Corpora are built from `aprsis_sample.log`, a recorded APRS-IS feed.
+"""
+
+import os
+
+import aprs
+
+__author__ = 'Greg Albrecht W2GMD <oss@undef.net>'  # NOQA pylint: disable=R0801
+__copyright__ = 'Copyright 2017 Greg Albrecht and Contributors'  # NOQA pylint: disable=R0801
+__license__ = 'Apache License, Version 2.0'  # NOQA pylint: disable=R0801
+
+
+SAMPLE_FEED = os.path.join(os.path.dirname(__file__), 'aprsis_sample.log')
+
+
+def _repeat(items: list, count: int) -> list:
+    return (items * (count // len(items) + 1))[:count]
+
+
+def _sample() -> list:
+    with open(SAMPLE_FEED, 'rb') as feed:
+        return [line.rstrip(b'\r\n') for line in feed
+                if not line.startswith(b'#')]
+
+
+def sample_lines(count: int) -> list:
+    """
+    Returns `count` frame lines from the sample feed, repeated as needed.
+    """
+    return _repeat(_sample(), count)
+
+
+def sample_ax25(count: int) -> list:
+    """
+    Returns `count` AX.25 encoded frames from the sample feed, skipping
+    frames that don't survive an AX.25 round trip (eg, APRS-IS Callsigns
+    longer than 6 characters).
+    """
+    encoded = []
+    for line in _sample():
+        frame = aprs.parse_frame(line)
+        encoded_frame = frame.encode_ax25()
+        if str(aprs.parse_frame(encoded_frame).source) == str(frame.source):
+            encoded.append(encoded_frame)
+    return _repeat(encoded, count)
+
+
+def sample_feed(count: int) -> bytes:
+    """
+    Returns `count` frame lines from the sample feed as APRS-IS would send
+    them on the wire.
+    """
+    return b'\r\n'.join(sample_lines(count)) + b'\r\n'
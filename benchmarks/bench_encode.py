@@ -0,0 +1,63 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""Python APRS Module Encoding & FCS Benchmarks."""
+
+import aprs
+
+from . import sample_lines
+
+__author__ = 'Greg Albrecht W2GMD <oss@undef.net>'  # NOQA pylint: disable=R0801
+__copyright__ = 'Copyright 2017 Greg Albrecht and Contributors'  # NOQA pylint: disable=R0801
+__license__ = 'Apache License, Version 2.0'  # NOQA pylint: disable=R0801
+
+
+class EncodeSuite(object):
+
+    """
+    `aprs.Frame.encode_ax25` over 1000 frames of the sample feed. Frames are
+    re-parsed before each sample, so the first encode of each is uncached.
+    """
+
+    number = 1
+    repeat = 20
+
+    def setup(self):
+        self.frames = [aprs.parse_frame(line) for line in sample_lines(1000)]
+
+    def time_encode_ax25(self):
+        for frame in self.frames:
+            frame.encode_ax25()
+
+    def time_encode_text(self):
+        for frame in self.frames:
+            bytes(frame)
+
+
+class EncodeCachedSuite(object):
+
+    """Re-encoding 1000 already encoded frames, as when re-transmitting."""
+
+    def setup(self):
+        self.frames = [aprs.parse_frame(line) for line in sample_lines(1000)]
+        for frame in self.frames:
+            frame.encode_ax25()
+
+    def time_encode_ax25_cached(self):
+        for frame in self.frames:
+            frame.encode_ax25()
+
+
+class FCSSuite(object):
+
+    """`aprs.FCS` over 100 frames of the sample feed."""
+
+    def setup(self):
+        # `FCS.update` takes characters, not bytes.
+        self.frames = [line.decode('latin-1') for line in sample_lines(100)]
+
+    def time_fcs(self):
+        for frame in self.frames:
+            fcs = aprs.FCS()
+            fcs.update(frame)
+            fcs.digest()
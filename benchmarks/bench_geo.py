@@ -0,0 +1,38 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""Python APRS Module Geo & PositionFrame Benchmarks."""
+
+import random
+
+import aprs
+
+__author__ = 'Greg Albrecht W2GMD <oss@undef.net>'  # NOQA pylint: disable=R0801
+__copyright__ = 'Copyright 2017 Greg Albrecht and Contributors'  # NOQA pylint: disable=R0801
+__license__ = 'Apache License, Version 2.0'  # NOQA pylint: disable=R0801
+
+
+class GeoSuite(object):
+
+    """Coordinate encoding & PositionFrame construction for 1000 points."""
+
+    def setup(self):
+        rand = random.Random(1)
+        self.points = [(rand.uniform(-90, 90), rand.uniform(-180, 180))
+                       for _ in range(1000)]
+
+    def time_dec2dm_lat(self):
+        dec2dm_lat = aprs.dec2dm_lat
+        for lat, _ in self.points:
+            dec2dm_lat(lat)
+
+    def time_dec2dm_lng(self):
+        dec2dm_lng = aprs.dec2dm_lng
+        for _, lng in self.points:
+            dec2dm_lng(lng)
+
+    def time_position_frame(self):
+        for lat, lng in self.points:
+            aprs.PositionFrame(
+                b'W2GMD-6', b'APRS', [b'WIDE1-1'], b'/', b'>', b'test',
+                lat, lng, 0)
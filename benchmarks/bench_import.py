@@ -0,0 +1,22 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""Python APRS Module Import Benchmarks."""
+
+__author__ = 'Greg Albrecht W2GMD <oss@undef.net>'  # NOQA pylint: disable=R0801
+__copyright__ = 'Copyright 2017 Greg Albrecht and Contributors'  # NOQA pylint: disable=R0801
+__license__ = 'Apache License, Version 2.0'  # NOQA pylint: disable=R0801
+
+
+class ImportSuite(object):
+
+    """Importing `aprs` in a fresh interpreter, as a CLI or worker does."""
+
+    def timeraw_import_aprs(self):
+        return 'import aprs'
+
+    def timeraw_import_parse_frame(self):
+        return "import aprs; aprs.parse_frame(b'W2GMD>APRS:>test')"
+
+    def timeraw_import_tcp(self):
+        return "import aprs; aprs.TCP(b'W2GMD', b'-1')"
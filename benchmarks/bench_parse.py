@@ -0,0 +1,72 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""Python APRS Module Parsing Benchmarks."""
+
+import aprs
+
+from . import sample_ax25, sample_lines
+
+__author__ = 'Greg Albrecht W2GMD <oss@undef.net>'  # NOQA pylint: disable=R0801
+__copyright__ = 'Copyright 2017 Greg Albrecht and Contributors'  # NOQA pylint: disable=R0801
+__license__ = 'Apache License, Version 2.0'  # NOQA pylint: disable=R0801
+
+
+class ParseFrameSuite(object):
+
+    """`aprs.parse_frame` over 1000 frames of the sample feed."""
+
+    def setup(self):
+        self.lines = sample_lines(1000)
+        self.encoded = sample_ax25(1000)
+
+    def time_parse_frame_text(self):
+        parse_frame = aprs.parse_frame
+        for line in self.lines:
+            parse_frame(line)
+
+    def time_parse_frame_ax25(self):
+        parse_frame = aprs.parse_frame
+        for encoded in self.encoded:
+            parse_frame(encoded)
+
+
+class ParseCallsignSuite(object):
+
+    """Callsign parsing over 1000 Source Callsigns of the sample feed."""
+
+    def setup(self):
+        self.callsigns = [line[:line.index(b'>')]
+                          for line in sample_lines(1000)]
+        self.encoded = [encoded[8:15] for encoded in sample_ax25(1000)]
+
+    def time_parse_callsign_text(self):
+        parse_callsign = aprs.parse_callsign
+        for callsign in self.callsigns:
+            parse_callsign(callsign)
+
+    def time_parse_callsign_ax25(self):
+        parse_callsign_ax25 = aprs.parse_callsign_ax25
+        for encoded in self.encoded:
+            parse_callsign_ax25(encoded)
+
+
+class BulkParseSuite(object):
+
+    """Parsing 1000 frames of the sample feed, one in ten corrupted."""
+
+    def setup(self):
+        self.lines = [line.replace(b'>', b'') if index % 10 == 0 else line
+                      for index, line in enumerate(sample_lines(1000))]
+
+    def time_parse_frame_catching(self):
+        parse_frame = aprs.parse_frame
+        for line in self.lines:
+            try:
+                parse_frame(line)
+            except ValueError:
+                pass
+
+    def time_bulk_parser(self):
+        for _ in aprs.BulkParser().parse(self.lines):
+            pass
@@ -0,0 +1,46 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""Python APRS Module Prefilter Benchmarks."""
+
+import aprs
+import aprs.prefilter
+
+from . import sample_lines
+
+__author__ = 'Greg Albrecht W2GMD <oss@undef.net>'  # NOQA pylint: disable=R0801
+__copyright__ = 'Copyright 2017 Greg Albrecht and Contributors'  # NOQA pylint: disable=R0801
+__license__ = 'Apache License, Version 2.0'  # NOQA pylint: disable=R0801
+
+
+class PrefilterSuite(object):
+
+    """
+    Compares filtering a feed for RF-gated (qAR) position reports by full
+    parse then filter, against prefilter then parse.
+    """
+
+    def setup(self):
+        self.lines = sample_lines(10000)
+        self.prefilter = aprs.prefilter.Prefilter(
+            aprs.prefilter.path_contains(b'qAR') &
+            aprs.prefilter.data_type(b'!', b'=', b'/', b'@'))
+
+    def time_parse_then_filter(self):
+        for line in self.lines:
+            try:
+                frame = aprs.parse_frame(line)
+            except (ValueError, IndexError, UnicodeDecodeError):
+                continue
+            info = bytes(frame.info)
+            if (info[0:1] in (b'!', b'=', b'/', b'@') and
+                    any(str(path_call) == 'qAR' for path_call in frame.path)):
+                pass
+
+    def time_prefilter_then_parse(self):
+        for _ in self.prefilter.frames(self.lines):
+            pass
+
+    def time_prefilter_only(self):
+        for _ in self.prefilter.filter(self.lines):
+            pass
@@ -0,0 +1,74 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""Python APRS Module Receive Benchmarks."""
+
+import socket
+import threading
+
+import aprs
+
+from . import sample_feed
+
+__author__ = 'Greg Albrecht W2GMD <oss@undef.net>'  # NOQA pylint: disable=R0801
+__copyright__ = 'Copyright 2017 Greg Albrecht and Contributors'  # NOQA pylint: disable=R0801
+__license__ = 'Apache License, Version 2.0'  # NOQA pylint: disable=R0801
+
+
+class LoopbackServer(threading.Thread):
+
+    """
+    Minimal APRS-IS server on localhost for one client: sends a banner,
+    answers the login, then replays `feed` when `go` is set and hangs up.
+    """
+
+    def __init__(self, feed: bytes) -> None:
+        super(LoopbackServer, self).__init__(daemon=True)
+        self.feed = feed
+        self.go = threading.Event()
+        self.listener = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        self.listener.bind(('127.0.0.1', 0))
+        self.listener.listen(1)
+        self.port = self.listener.getsockname()[1]
+
+    def run(self) -> None:
+        conn, _ = self.listener.accept()
+        with conn:
+            conn.sendall(b'# aprsc 2.1.4-g408ed49\r\n')
+            conn.recv(1024)
+            conn.sendall(b'# logresp BENCH unverified, server LOOPBACK\r\n')
+            self.go.wait()
+            conn.sendall(self.feed)
+        self.listener.close()
+
+
+class ReceiveSuite(object):
+
+    """
+    `aprs.TCP.receive` of 10000 frames of the sample feed from a loopback
+    server, with and without frame parsing.
+    """
+
+    number = 1
+    repeat = 10
+
+    def setup(self):
+        self.server = LoopbackServer(sample_feed(10000))
+        self.server.start()
+        self.aprs_conn = aprs.TCP(
+            b'BENCH', b'-1', [b'127.0.0.1:%d' % self.server.port])
+        self.aprs_conn.start()
+        self.frames = []
+
+    def teardown(self):
+        self.aprs_conn.interface.close()
+        self.server.join()
+
+    def time_receive_frames(self):
+        self.server.go.set()
+        self.aprs_conn.receive(callback=self.frames.append)
+
+    def time_receive_lines(self):
+        self.server.go.set()
+        self.aprs_conn.receive(callback=self.frames.append,
+                               frame_handler=None)
@@ -47,16 +47,23 @@ setuptools.setup(
     url='https://github.com/ampledata/aprs',
     zip_safe=False,
     include_package_data=True,
+    python_requires='>=3.7',
     tests_require=[
         'coverage >= 4.4.1',
         'nose >= 1.3.7',
-        'httpretty >= 0.8.14'
+        'httpretty >= 0.8.14',
+        'numpy >= 1.13.0'
     ],
     install_requires=[
         'kiss > 6.9',
         'requests >= 2.7.0',
         'bitarray >= 0.8.1'
     ],
+    extras_require={
+        'numpy': ['numpy >= 1.13.0'],
+        'zstd': ['zstandard >= 0.8.0'],
+        'arrow': ['pyarrow >= 0.8.0']
+    },
     classifiers=[
         'Topic :: Communications :: Ham Radio',
         'Programming Language :: Python',
@@ -0,0 +1,108 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""Python APRS Module Analytics Tests."""
+
+import gzip
+import os
+import shutil
+import tempfile
+import unittest  # pylint: disable=R0801
+
+import aprs.analytics
+
+from .context import aprs  # pylint: disable=R0801
+from .context import aprs_test_classes  # pylint: disable=R0801
+
+__author__ = 'Greg Albrecht W2GMD <oss@undef.net>'  # NOQA pylint: disable=R0801
+__copyright__ = 'Copyright 2017 Greg Albrecht and Contributors'  # NOQA pylint: disable=R0801
+__license__ = 'Apache License, Version 2.0'  # NOQA pylint: disable=R0801
+
+
+def destination(frame):
+    """Example user map function: key Frames by Destination."""
+    return str(frame.destination)
+
+
+class AnalyticsTestCase(aprs_test_classes.APRSTestClass):  # NOQA pylint: disable=R0904
+
+    """Tests for `aprs.analytics`."""
+
+    def setUp(self):  # pylint: disable=C0103
+        super(AnalyticsTestCase, self).setUp()
+        self.tmp_dir = tempfile.mkdtemp()
+        lines = [b'# aprsc 2.1.4-g408ed49']
+        for i in range(1000):
+            lines.append(
+                b'W2GMD-%d>APRS%d,WIDE1-1*,WIDE2-1:%s3745.00N/12227.00W-%d' %
+                (i % 4, i % 2, b'!' if i % 5 else b'>', i))
+            lines.append(b'KF4MKT>APRS,N0CALL-1*,W2GMD*:T#%03d,1,2,3' % i)
+        lines.append(b'garbage')
+        self.data = b'\r\n'.join(lines) + b'\r\n'
+
+        self.plain = os.path.join(self.tmp_dir, 'aprs.log')
+        with open(self.plain, 'wb') as archive:
+            archive.write(self.data)
+        self.gzipped = os.path.join(self.tmp_dir, 'aprs.log.gz')
+        with open(self.gzipped, 'wb') as archive:
+            archive.write(gzip.compress(self.data))
+
+        self.reducers = {
+            'stations': aprs.analytics.StationCounts(),
+            'types': aprs.analytics.DataTypeHistogram(),
+            'paths': aprs.analytics.PathStats(),
+            'destinations': aprs.analytics.FunctionReducer(destination),
+        }
+
+    def tearDown(self):  # pylint: disable=C0103
+        super(AnalyticsTestCase, self).tearDown()
+        shutil.rmtree(self.tmp_dir)
+
+    def test_split_file(self):
+        """Tests chunks start on line boundaries and cover the file."""
+        chunks = aprs.analytics.split_file(self.plain, chunk_size=1000)
+        self.assertGreater(len(chunks), 10)
+        self.assertEqual(chunks[0][1], 0)
+        self.assertEqual(chunks[-1][2], len(self.data))
+        for (_, _, end), (_, start, _) in zip(chunks, chunks[1:]):
+            self.assertEqual(end, start)
+            self.assertEqual(self.data[start - 1:start], b'\n')
+        self.assertEqual(
+            aprs.analytics.split_file(self.gzipped), [(self.gzipped, 0, -1)])
+
+    def _check_results(self, results):
+        self.assertEqual(results['_frames'], 2000 * 2)
+        self.assertEqual(results['_errors'], 2)
+        self.assertEqual(results['stations']['KF4MKT'], 2000)
+        self.assertEqual(results['stations']['W2GMD-3'], 500)
+        self.assertEqual(results['types'][b'telemetry'], 2000)
+        self.assertEqual(results['types'][b'status'], 400)
+        self.assertEqual(results['types'][b'position_nots_nomsg'], 1600)
+        self.assertEqual(results['paths']['digipeaters'],
+                         {'WIDE1-1': 2000, 'N0CALL-1': 2000, 'W2GMD': 2000})
+        self.assertEqual(results['paths']['path_lengths'], {2: 4000})
+        self.assertEqual(results['destinations'],
+                         {'APRS': 2000, 'APRS0': 1000, 'APRS1': 1000})
+
+    def test_run_inline(self):
+        """Tests running Reducers in this process."""
+        self._check_results(aprs.analytics.run(
+            [self.plain, self.gzipped], self.reducers, processes=1,
+            chunk_size=1000))
+
+    def test_run_pool(self):
+        """Tests running Reducers in a process pool."""
+        self._check_results(aprs.analytics.run(
+            [self.plain, self.gzipped], self.reducers, processes=2,
+            chunk_size=4096))
+
+    def test_reserved_names(self):
+        """Tests Reducers can't be named after the totals."""
+        with self.assertRaises(ValueError):
+            aprs.analytics.run(
+                [self.plain], {'_frames': aprs.analytics.StationCounts()},
+                processes=1)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -112,6 +112,56 @@ class FrameTestCase(aprs_test_classes.APRSTestClass):  # pylint: disable=R0904
 
         decoded_frame = aprs.Frame(encoded_frame)
 
+    def test_encode_cache(self):
+        """
+        Tests the cached AX.25 encoding is cleared by Frame changes.
+        """
+        aprs_frame = aprs.parse_frame('W2GMD-1>APRY07,WIDE1-1:>test_cache')
+        encoded_frame = aprs_frame.encode_ax25()
+        self.assertIs(aprs_frame.encode_ax25(), encoded_frame)
+
+        aprs_frame.set_info(b'>test_cache 2')
+        self.assertEqual(
+            bytes(aprs_frame), b'W2GMD-1>APRY07,WIDE1-1:>test_cache 2')
+        self.assertNotEqual(aprs_frame.encode_ax25(), encoded_frame)
+        self.assertEqual(
+            aprs_frame.encode_ax25()[24:-3], b'>test_cache 2')
+
+        aprs_frame.update_path(b'W2GMD*')
+        self.assertEqual(
+            bytes(aprs_frame),
+            b'W2GMD-1>APRY07,WIDE1-1,W2GMD*:>test_cache 2')
+        aprs_frame.set_path([b'WIDE2-2'])
+        aprs_frame.set_source(b'KF4MKT')
+        self.assertEqual(
+            bytes(aprs_frame), b'KF4MKT>APRY07,WIDE2-2:>test_cache 2')
+        self.assertEqual(
+            aprs_frame.encode_ax25(),
+            aprs.parse_frame(
+                'KF4MKT>APRY07,WIDE2-2:>test_cache 2').encode_ax25())
+
+    def test_encode_cache_path_callsign(self):
+        """
+        Tests the cached AX.25 encoding follows Callsigns changed in place.
+        """
+        aprs_frame = aprs.parse_frame('W2GMD-6>APRS,WIDE1-1:>test')
+        self.assertEqual(bytes(aprs_frame), b'W2GMD-6>APRS,WIDE1-1:>test')
+        encoded_frame = aprs_frame.encode_ax25()
+
+        aprs_frame.path[0].set_digi(True)
+        self.assertEqual(bytes(aprs_frame), b'W2GMD-6>APRS,WIDE1-1*:>test')
+        self.assertEqual(
+            aprs_frame.encode_ax25(),
+            aprs.parse_frame('W2GMD-6>APRS,WIDE1-1*:>test').encode_ax25())
+        self.assertNotEqual(aprs_frame.encode_ax25(), encoded_frame)
+
+        aprs_frame.path.append(aprs.parse_callsign(b'W2GMD*'))
+        self.assertEqual(
+            bytes(aprs_frame), b'W2GMD-6>APRS,WIDE1-1*,W2GMD*:>test')
+        self.assertEqual(
+            aprs_frame.encode_ax25(),
+            aprs.parse_frame(
+                'W2GMD-6>APRS,WIDE1-1*,W2GMD*:>test').encode_ax25())
 
 
 if __name__ == '__main__':
@@ -0,0 +1,107 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""Python APRS Module Archive Reader Tests."""
+
+import gzip
+import os
+import shutil
+import tempfile
+import unittest  # pylint: disable=R0801
+
+import aprs.archive
+
+from .context import aprs  # pylint: disable=R0801
+from .context import aprs_test_classes  # pylint: disable=R0801
+
+try:
+    import zstandard
+except ImportError:  # pragma: no cover
+    zstandard = None
+
+__author__ = 'Greg Albrecht W2GMD <oss@undef.net>'  # NOQA pylint: disable=R0801
+__copyright__ = 'Copyright 2017 Greg Albrecht and Contributors'  # NOQA pylint: disable=R0801
+__license__ = 'Apache License, Version 2.0'  # NOQA pylint: disable=R0801
+
+
+ARCHIVE_LINES = [
+    b'# aprsc 2.1.4-g408ed49',
+    b'# logresp W2GMD verified, server T2TEST',
+    b'W2GMD-6>APRS,TCPIP*,qAC,T2TEST:>test_archive 0',
+    b'not a frame',
+    b'# aprsc 2.1.4-g408ed49 19 Oct 2026 02:00:00 GMT T2TEST',
+] + [
+    b'KF4MKT-%d>APRS,TCPIP*,qAC,T2TEST:>test_archive %d' % (i % 16, i)
+    for i in range(1, 200)
+]
+
+
+class ArchiveReaderTestCase(aprs_test_classes.APRSTestClass):  # NOQA pylint: disable=R0904
+
+    """Tests for `aprs.archive.ArchiveReader`."""
+
+    def setUp(self):  # pylint: disable=C0103
+        super(ArchiveReaderTestCase, self).setUp()
+        self.tmp_dir = tempfile.mkdtemp()
+        self.data = b'\r\n'.join(ARCHIVE_LINES) + b'\r\n'
+
+    def tearDown(self):  # pylint: disable=C0103
+        super(ArchiveReaderTestCase, self).tearDown()
+        shutil.rmtree(self.tmp_dir)
+
+    def _write(self, name, data):
+        path = os.path.join(self.tmp_dir, name)
+        with open(path, 'wb') as archive:
+            archive.write(data)
+        return path
+
+    def _check_archive(self, path):
+        reader = aprs.archive.ArchiveReader(path, block_size=64)
+        lines = list(reader)
+        self.assertEqual(
+            lines, [l for l in ARCHIVE_LINES if not l.startswith(b'#')])
+        self.assertEqual(reader.comments, 3)
+        self.assertEqual(reader.bytes_read, len(self.data))
+
+        reader = aprs.archive.ArchiveReader(path, block_size=100)
+        frames = list(reader.read_frames())
+        self.assertEqual(len(frames), 200)
+        self.assertEqual(reader.errors, 1)
+        self.assertEqual(
+            str(frames[-1]), 'KF4MKT-7>APRS,TCPIP*,qAC,T2TEST:>test_archive 199')
+        stats = reader.throughput()
+        self.assertEqual(stats['lines'], 201)
+        self.assertGreater(stats['lines_per_sec'], 0)
+
+    def test_plain(self):
+        """Tests reading an uncompressed archive."""
+        self._check_archive(self._write('aprs.log', self.data))
+
+    def test_gzip(self):
+        """Tests reading a gzip compressed archive."""
+        self._check_archive(
+            self._write('aprs.log.gz', gzip.compress(self.data)))
+
+    @unittest.skipIf(zstandard is None, 'zstandard is not installed.')
+    def test_zstd(self):
+        """Tests reading a zstd compressed archive."""
+        self._check_archive(self._write(
+            'aprs.log.zst', zstandard.ZstdCompressor().compress(self.data)))
+
+    def test_resume(self):
+        """Tests resuming from the offset of the last line read."""
+        for path in (self._write('aprs.log', self.data),
+                     self._write('aprs.log.gz', gzip.compress(self.data))):
+            reader = aprs.archive.ArchiveReader(path, block_size=50)
+            lines = reader.read_lines()
+            first = [next(lines) for _ in range(10)]
+            lines.close()
+
+            resumed = aprs.archive.ArchiveReader(path, offset=reader.offset)
+            self.assertEqual(
+                first + list(resumed),
+                [l for l in ARCHIVE_LINES if not l.startswith(b'#')])
+
+
+if __name__ == '__main__':
+    unittest.main()
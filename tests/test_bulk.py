@@ -0,0 +1,104 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""Python APRS Module Bulk Parsing Tests."""
+
+import unittest  # pylint: disable=R0801
+
+from .context import aprs  # pylint: disable=R0801
+from .context import aprs_test_classes  # pylint: disable=R0801
+
+__author__ = 'Greg Albrecht W2GMD <oss@undef.net>'  # NOQA pylint: disable=R0801
+__copyright__ = 'Copyright 2017 Greg Albrecht and Contributors'  # NOQA pylint: disable=R0801
+__license__ = 'Apache License, Version 2.0'  # NOQA pylint: disable=R0801
+
+
+class BulkParsingTestCase(aprs_test_classes.APRSTestClass):  # NOQA pylint: disable=R0904
+
+    """Tests for `aprs.try_parse_frame` & `aprs.BulkParser`."""
+
+    def test_try_parse_frame_text(self):
+        """Tests text Frames parse as `parse_frame` does, or give errors."""
+        raw_frame = b'W2GMD-1>APRS,WIDE1-1,WIDE2-1:>test'
+        frame, error, offset = aprs.try_parse_frame(raw_frame)
+        self.assertEqual((error, offset), (aprs.PARSE_OK, 0))
+        self.assertEqual(bytes(frame), bytes(aprs.parse_frame(raw_frame)))
+        self.assertEqual(frame.path, aprs.parse_frame(raw_frame).path)
+
+        for raw_frame, error, offset in [
+                (b'', aprs.PARSE_EMPTY, 0),
+                (1234, aprs.PARSE_BAD_TYPE, 0),
+                (b'W2GMD', aprs.PARSE_NO_DESTINATION, 5),
+                (b'W2GMD>APRS', aprs.PARSE_NO_INFO, 10),
+                (b'>APRS:>test', aprs.PARSE_BAD_SOURCE, 0),
+                (b'W2:GMD>APRS', aprs.PARSE_BAD_SOURCE, 2),
+                (b'W2GMD-1-2>APRS:>test', aprs.PARSE_BAD_SOURCE, 0),
+                (b'W2GMD>:>test', aprs.PARSE_BAD_DESTINATION, 6),
+                (b'W2GMD>APRS,WIDE1-1,,:>test', aprs.PARSE_BAD_PATH, 19),
+                (b'W2GMD>APRS,WIDE1-1-1:>test', aprs.PARSE_BAD_PATH, 11)]:
+            self.assertEqual(aprs.try_parse_frame(raw_frame),
+                             (None, error, offset), raw_frame)
+
+    def test_try_parse_frame_ax25(self):
+        """Tests AX.25 Frames parse as `parse_frame` does, or give errors."""
+        frame = aprs.parse_frame(b'W2GMD-1>APRS,WIDE1-1:>test')
+        frame.set_info(b'>test\x03\xf0test')
+        encoded = frame.encode_ax25()
+        frame, error, _ = aprs.try_parse_frame(encoded)
+        self.assertEqual(error, aprs.PARSE_OK)
+        self.assertEqual(bytes(frame), bytes(aprs.parse_frame(encoded)))
+        self.assertIn(b'\x03\xf0test', bytes(frame.info))
+
+        self.assertEqual(aprs.try_parse_frame(encoded[:10] + b'\x03\xf0>x'),
+                         (None, aprs.PARSE_TRUNCATED, 10))
+        for index, error in [(2, aprs.PARSE_BAD_DESTINATION),
+                             (9, aprs.PARSE_BAD_SOURCE),
+                             (16, aprs.PARSE_BAD_PATH)]:
+            bad = bytearray(encoded)
+            bad[index] |= 1
+            self.assertEqual(aprs.try_parse_frame(bytes(bad)),
+                             (None, error, index))
+
+    def test_try_parse_frame_stricter(self):
+        """Tests text Frames `parse_frame` returns garbled are rejected."""
+        for raw_frame, error in [
+                (b'>APRS:>test', aprs.PARSE_BAD_SOURCE),
+                (b'W2:GMD>APRS', aprs.PARSE_BAD_SOURCE),
+                (b'W2GMD>:>test', aprs.PARSE_BAD_DESTINATION),
+                (b'W2GMD>APRS,:>test', aprs.PARSE_BAD_PATH),
+                (b'W2GMD>APRS,,WIDE1-1:>test', aprs.PARSE_BAD_PATH)]:
+            self.assertIsInstance(aprs.parse_frame(raw_frame), aprs.Frame)
+            self.assertEqual(aprs.try_parse_frame(raw_frame)[:2],
+                             (None, error), raw_frame)
+
+    def test_bulk_parser(self):
+        """Tests BulkParser yields good Frames & keeps rejects."""
+        parser = aprs.BulkParser(max_rejects=2)
+        frames = list(parser.parse([
+            b'W2GMD>APRS:>one\r\n', b'W2GMD>APRS\r\n', b'garbage',
+            b'W2GMD-1-2>APRS:>bad', 'W2GMD>APRS:>two']))
+        self.assertEqual([bytes(frame.info) for frame in frames],
+                         [b'>one', b'>two'])
+        self.assertEqual(parser.counts, {
+            'ok': 2, 'no_info': 1, 'no_destination': 1, 'bad_source': 1})
+        self.assertEqual(parser.rejected, 3)
+        self.assertEqual(list(parser.rejects), [
+            (b'garbage', 'no_destination', 7),
+            (b'W2GMD-1-2>APRS:>bad', 'bad_source', 0)])
+        parser.reset()
+        self.assertEqual((parser.counts, len(parser.rejects)), ({}, 0))
+
+    def test_bulk_parser_types(self):
+        """Tests BulkParser strips memoryviews & rejects bad types."""
+        parser = aprs.BulkParser()
+        frames = list(parser.parse([
+            memoryview(b'W2GMD>APRS:>x\n'), None, 42]))
+        self.assertEqual([bytes(frame) for frame in frames],
+                         [b'W2GMD>APRS:>x'])
+        self.assertEqual(parser.counts, {'ok': 1, 'bad_type': 2})
+        self.assertEqual([reject[1] for reject in parser.rejects],
+                         ['bad_type', 'bad_type'])
+
+
+if __name__ == '__main__':
+    unittest.main()
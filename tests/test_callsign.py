@@ -111,5 +111,65 @@ class CallsignTestCase(aprs_test_classes.APRSTestClass):  # NOQA pylint: disable
         self.assertEqual(decoded_callsign.callsign, b'W2GMD')
         self.assertEqual(decoded_callsign.ssid, b'0')
 
+    def test_encode_cache(self):
+        """
+        Tests cached Callsign encodings are cleared by Callsign changes.
+        """
+        callsign_obj = aprs.functions.parse_callsign_text(b'W2GMD-1')
+        self.assertEqual(callsign_obj.encode_ax25(), b'\xaed\x8e\x9a\x88@b')
+        self.assertEqual(bytes(callsign_obj), b'W2GMD-1')
+        callsign_obj.set_digi(True)
+        self.assertEqual(callsign_obj.encode_ax25(), b'\xaed\x8e\x9a\x88@\xe2')
+        self.assertEqual(bytes(callsign_obj), b'W2GMD-1*')
+        self.assertEqual(str(callsign_obj), 'W2GMD-1*')
+        callsign_obj.set_ssid(0)
+        self.assertEqual(str(callsign_obj), 'W2GMD*')
+
+    def test_packed(self):
+        """
+        Tests packing Callsigns into ints.
+        """
+        callsign_obj = aprs.functions.parse_callsign_text(b'W2GMD-6*')
+        packed = callsign_obj.packed
+        self.assertEqual(packed, aprs.pack_callsign(b'W2GMD', 6, True))
+        self.assertLess(packed, 1 << 37)
+        self.assertEqual(str(aprs.unpack_callsign(packed)), 'W2GMD-6*')
+
+        callsign_obj.set_digi(False)
+        self.assertEqual(callsign_obj.packed, packed - 1)
+
+        for callsign, ssid in ((b'KF4MKT7', 0), (b'qAC', 0), (b'W2GMD', 16)):
+            self.assertRaises(
+                ValueError, aprs.pack_callsign, callsign, ssid)
+        self.assertIsNone(
+            aprs.functions.parse_callsign_text(b'T2TEST-WX').packed)
+
+    def test_equality(self):
+        """
+        Tests comparing, hashing & sorting Callsigns.
+        """
+        parse = aprs.functions.parse_callsign_text
+        self.assertEqual(parse(b'W2GMD-0'), parse(b'W2GMD'))
+        self.assertEqual(
+            parse(b'W2GMD-1'),
+            aprs.parse_callsign_ax25(b'\xaed\x8e\x9a\x88@b'))
+        self.assertNotEqual(parse(b'W2GMD-1'), parse(b'W2GMD-2'))
+        self.assertNotEqual(parse(b'W2GMD'), parse(b'W2GMD*'))
+        self.assertEqual(parse(b'qAC'), parse(b'qAC-0'))
+        self.assertNotEqual(parse(b'qAC'), parse(b'QAC'))
+
+        stations = {parse(b'W2GMD-6'): 1, parse(b'qAR'): 2}
+        self.assertEqual(stations[parse(b'W2GMD-6')], 1)
+        self.assertEqual(stations[parse(b'qAR')], 2)
+
+        callsigns = [b'W2GMD-6', b'KF4MKT', b'qAR', b'W2GMD', b'W2GMD-10',
+                     b'APRS', b'TCPIP*', b'W2GMD-WX', b'A1', b'A']
+        self.assertEqual(
+            [bytes(callsign) for callsign in
+             sorted(parse(callsign) for callsign in callsigns)],
+            [b'A', b'A1', b'APRS', b'KF4MKT', b'TCPIP*', b'W2GMD',
+             b'W2GMD-6', b'W2GMD-10', b'W2GMD-WX', b'qAR'])
+
+
 if __name__ == '__main__':
     unittest.main()
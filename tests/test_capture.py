@@ -0,0 +1,108 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""Python APRS Module Frame Capture Tests."""
+
+import os
+import shutil
+import tempfile
+import unittest  # pylint: disable=R0801
+
+import aprs.capture
+
+from .context import aprs  # pylint: disable=R0801
+from .context import aprs_test_classes  # pylint: disable=R0801
+
+__author__ = 'Greg Albrecht W2GMD <oss@undef.net>'  # NOQA pylint: disable=R0801
+__copyright__ = 'Copyright 2017 Greg Albrecht and Contributors'  # NOQA pylint: disable=R0801
+__license__ = 'Apache License, Version 2.0'  # NOQA pylint: disable=R0801
+
+
+class CaptureTestCase(aprs_test_classes.APRSTestClass):  # NOQA pylint: disable=R0904
+
+    """Tests for `aprs.capture`."""
+
+    def setUp(self):  # pylint: disable=C0103
+        super(CaptureTestCase, self).setUp()
+        self.tmp_dir = tempfile.mkdtemp()
+        self.path = os.path.join(self.tmp_dir, 'aprs.cap')
+
+        with aprs.capture.CaptureWriter(self.path, bucket_seconds=60) as cap:
+            for i in range(300):
+                source = ['W2GMD-6', 'KF4MKT', 'N0CALL'][i % 3]
+                cap.write(
+                    aprs.parse_frame(
+                        '%s>APRS,TCPIP*:>test_capture %d' % (source, i)),
+                    timestamp=1000.0 + i * 10,
+                    interface=i % 2)
+
+    def tearDown(self):  # pylint: disable=C0103
+        super(CaptureTestCase, self).tearDown()
+        shutil.rmtree(self.tmp_dir)
+
+    def test_iterate(self):
+        """Tests reading every record back lazily, in capture order."""
+        with aprs.capture.CaptureReader(self.path) as reader:
+            self.assertEqual(len(reader), 300)
+            records = list(reader)
+        self.assertEqual(records[4].timestamp, 1040.0)
+        self.assertEqual(records[4].interface, 0)
+        self.assertEqual(
+            str(records[4].frame()), 'KF4MKT>APRS,TCPIP*:>test_capture 4')
+
+    def test_between(self):
+        """Tests finding records by receive time."""
+        with aprs.capture.CaptureReader(self.path) as reader:
+            records = list(reader.between(1055.0, 1200.0))
+        self.assertEqual(
+            [r.timestamp for r in records],
+            [1000.0 + i * 10 for i in range(6, 20)])
+
+    def test_between_open(self):
+        """Tests finding records by receive time with an open bound."""
+        with aprs.capture.CaptureReader(self.path) as reader:
+            after = [r.timestamp for r in reader.between(3950.0)]
+            before = [r.timestamp for r in reader.between(end=1030.0)]
+            infinite = list(reader.between(float('-inf'), float('inf')))
+        self.assertEqual(after, [1000.0 + i * 10 for i in range(295, 300)])
+        self.assertEqual(before, [1000.0, 1010.0, 1020.0])
+        self.assertEqual(len(infinite), 300)
+
+    def test_by_source(self):
+        """Tests finding records by source callsign."""
+        with aprs.capture.CaptureReader(self.path) as reader:
+            records = list(reader.by_source('KF4MKT'))
+            self.assertEqual(len(records), 100)
+            self.assertTrue(all(
+                r.data.startswith(b'KF4MKT>') for r in records))
+
+            callsign = aprs.parse_callsign('W2GMD-6')
+            records = list(reader.by_source(callsign, 1000.0, 1100.0))
+            self.assertEqual(len(records), 4)
+            self.assertEqual(list(reader.by_source('W2GMD-7')), [])
+
+    def test_append_and_recover(self):
+        """Tests appending to a capture, and recovering from a crash."""
+        with aprs.capture.CaptureWriter(self.path) as cap:
+            cap.write(b'W2GMD-7>APRS:>appended', timestamp=5000.0)
+
+        # Simulate a crash: a stale index and a partially written record.
+        os.unlink(self.path + '.idx')
+        with open(self.path, 'ab') as cap_file:
+            cap_file.write(b'\x00' * 5)
+
+        with aprs.capture.CaptureReader(self.path) as reader:
+            self.assertEqual(len(reader), 301)
+            self.assertEqual(
+                [r.timestamp for r in reader.by_source('W2GMD-7')], [5000.0])
+
+        with aprs.capture.CaptureWriter(self.path) as cap:
+            cap.write(b'W2GMD-7>APRS:>after crash', timestamp=5001.0)
+        with aprs.capture.CaptureReader(self.path) as reader:
+            self.assertEqual(
+                [bytes(r.data) for r in reader.between(5000.0, 6000.0)],
+                [b'W2GMD-7>APRS:>appended', b'W2GMD-7>APRS:>after crash'])
+
+
+if __name__ == '__main__':
+    unittest.main()
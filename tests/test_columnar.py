@@ -0,0 +1,101 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""Python APRS Module Columnar Export Tests."""
+
+import math
+import unittest  # pylint: disable=R0801
+
+import aprs.columnar
+
+from .context import aprs  # pylint: disable=R0801
+from .context import aprs_test_classes  # pylint: disable=R0801
+
+try:
+    import pyarrow
+except ImportError:  # pragma: no cover
+    pyarrow = None
+
+__author__ = 'Greg Albrecht W2GMD <oss@undef.net>'  # NOQA pylint: disable=R0801
+__copyright__ = 'Copyright 2017 Greg Albrecht and Contributors'  # NOQA pylint: disable=R0801
+__license__ = 'Apache License, Version 2.0'  # NOQA pylint: disable=R0801
+
+
+class ColumnExporterTestCase(aprs_test_classes.APRSTestClass):  # NOQA pylint: disable=R0904
+
+    """Tests for `aprs.columnar.ColumnExporter`."""
+
+    def setUp(self):  # pylint: disable=C0103
+        super(ColumnExporterTestCase, self).setUp()
+        self.frames = [
+            aprs.parse_frame(
+                'W2GMD-%d>APRS,WIDE1-1*,WIDE2-1:!3745.00N/12227.00W-' % i)
+            if i % 2 else
+            aprs.parse_frame('KF4MKT>APRS,TCPIP*:>status %d' % i)
+            for i in range(10)
+        ]
+        self.timestamps = [1792375200.0 + i for i in range(10)]
+
+    def test_chunks(self):
+        """Tests chunking & dictionary-encoding."""
+        exporter = aprs.columnar.ColumnExporter(chunk_size=4)
+        chunks = list(exporter.chunks(self.frames, self.timestamps))
+        self.assertEqual([len(chunk) for chunk in chunks], [4, 4, 2])
+
+        self.assertEqual(
+            exporter.callsigns[:4], ['KF4MKT', 'W2GMD-1', 'W2GMD-3', 'APRS'])
+        self.assertEqual(exporter.paths, ['TCPIP*', 'WIDE1-1*,WIDE2-1'])
+        self.assertEqual(list(chunks[0]['source']), [0, 1, 0, 2])
+        self.assertEqual(list(chunks[0]['destination']), [3] * 4)
+        self.assertEqual(
+            list(exporter.decode(chunks[2], 'source')), ['KF4MKT', 'W2GMD-9'])
+        self.assertEqual(
+            list(exporter.decode(chunks[2], 'path')),
+            ['TCPIP*', 'WIDE1-1*,WIDE2-1'])
+
+        self.assertEqual(list(chunks[0]['data_type']), [b'>', b'!'] * 2)
+        self.assertTrue(math.isnan(chunks[0]['lat'][0]))
+        self.assertAlmostEqual(chunks[0]['lat'][1], 37.75)
+        self.assertAlmostEqual(chunks[0]['lng'][1], -122.45)
+        self.assertEqual(chunks[2]['timestamp'][1], 1792375209.0)
+
+    def test_to_numpy(self):
+        """Tests exporting without timestamps to one array."""
+        exporter = aprs.columnar.ColumnExporter(chunk_size=3)
+        records = exporter.to_numpy(self.frames)
+        self.assertEqual(records.dtype, aprs.columnar.FRAME_DTYPE)
+        self.assertEqual(len(records), 10)
+        self.assertTrue(all(math.isnan(ts) for ts in records['timestamp']))
+        self.assertEqual(len(exporter.to_numpy([])), 0)
+
+        with self.assertRaises(ValueError):
+            exporter.to_numpy(self.frames, self.timestamps[:-1])
+        with self.assertRaises(ValueError):
+            exporter.to_numpy(self.frames[:-1], self.timestamps)
+
+    @unittest.skipIf(pyarrow is None, 'pyarrow is not installed.')
+    def test_arrow(self):
+        """Tests exporting Arrow record batches."""
+        exporter = aprs.columnar.ColumnExporter(chunk_size=8)
+        batches = list(exporter.arrow_batches(self.frames, self.timestamps))
+        table = pyarrow.Table.from_batches(batches)
+        self.assertEqual(table.num_rows, 10)
+        self.assertTrue(
+            pyarrow.types.is_dictionary(table.schema.field('source').type))
+        rows = table.to_pylist()
+        self.assertEqual(rows[1]['source'], 'W2GMD-1')
+        self.assertEqual(rows[1]['path'], 'WIDE1-1*,WIDE2-1')
+        self.assertEqual(rows[9]['destination'], 'APRS')
+        self.assertEqual(rows[0]['data_type'], b'>')
+        self.assertIsNone(rows[0]['lat'])
+        self.assertAlmostEqual(rows[1]['lat'], 37.75)
+
+        # Each batch only carries the values it uses.
+        self.assertEqual(
+            sorted(batches[1].column(0).dictionary.to_pylist()),
+            ['APRS', 'KF4MKT', 'W2GMD-9'])
+        self.assertEqual(rows[8]['source'], 'KF4MKT')
+
+
+if __name__ == '__main__':
+    unittest.main()
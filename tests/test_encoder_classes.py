@@ -0,0 +1,68 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""Python APRS Module Frame Encoder Tests."""
+
+import unittest  # pylint: disable=R0801
+
+from .context import aprs  # pylint: disable=R0801
+from .context import aprs_test_classes  # pylint: disable=R0801
+
+__author__ = 'Greg Albrecht W2GMD <oss@undef.net>'  # NOQA pylint: disable=R0801
+__copyright__ = 'Copyright 2017 Greg Albrecht and Contributors'  # NOQA pylint: disable=R0801
+__license__ = 'Apache License, Version 2.0'  # NOQA pylint: disable=R0801
+
+
+class FrameEncoderTestCase(aprs_test_classes.APRSTestClass):  # NOQA pylint: disable=R0904
+
+    """Tests for `aprs.FrameEncoder`."""
+
+    def setUp(self):  # pylint: disable=C0103
+        super(FrameEncoderTestCase, self).setUp()
+        self.frames = [
+            aprs.parse_frame(b'W2GMD-%d>APRS,WIDE1-1:>test %d' % (i, i))
+            for i in range(10)
+        ]
+
+    def test_ax25(self):
+        """Tests encoding many Frames as AX.25 into a reused buffer."""
+        encoder = aprs.FrameEncoder(size=16)
+        with encoder.encode_many(self.frames) as data:
+            self.assertEqual(
+                bytes(data),
+                b''.join(frame.encode_ax25() for frame in self.frames))
+            offsets = encoder.offsets
+            self.assertEqual(len(offsets), 11)
+            self.assertEqual(
+                bytes(data[offsets[3]:offsets[4]]),
+                self.frames[3].encode_ax25())
+        buffer = encoder.buffer
+
+        with encoder.encode_many(self.frames[:2]) as data:
+            self.assertIs(encoder.buffer, buffer)
+            self.assertEqual(len(data), encoder.offsets[-1])
+
+        # A held view forces a new buffer rather than resizing.
+        held = encoder.encode_many(self.frames[:1])
+        with encoder.encode_many(self.frames * 2) as data:
+            self.assertIsNot(encoder.buffer, buffer)
+            self.assertEqual(len(data), 2 * len(buffer))
+        self.assertEqual(bytes(held), self.frames[0].encode_ax25())
+        held.release()
+
+    def test_kiss(self):
+        """Tests KISS framing & escaping."""
+        frame = aprs.parse_frame(b'W2GMD-1>APRS:>test \xc0\xdb')
+        encoder = aprs.FrameEncoder(kiss=True)
+        with encoder.encode_many([frame, 'W2GMD-2>APRS:>test']) as data:
+            kiss_frame = bytes(data[:encoder.offsets[1]])
+        self.assertEqual(kiss_frame[:2], b'\xc0\x00')
+        self.assertEqual(kiss_frame[-1:], b'\xc0')
+        self.assertEqual(kiss_frame[-8:-1], b'test \xdb\xdc\xdb\xdd'[-7:])
+        self.assertEqual(
+            kiss_frame[2:16], frame.encode_ax25()[1:15])
+        self.assertNotIn(b'\xc0', kiss_frame[1:-1])
+
+
+if __name__ == '__main__':
+    unittest.main()
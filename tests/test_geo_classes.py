@@ -0,0 +1,157 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""Python APRS Module Geo Class Tests."""
+
+import random
+import unittest  # pylint: disable=R0801
+
+import aprs.geo_classes
+
+from .context import aprs  # pylint: disable=R0801
+from .context import aprs_test_classes  # pylint: disable=R0801
+
+__author__ = 'Greg Albrecht W2GMD <oss@undef.net>'  # NOQA pylint: disable=R0801
+__copyright__ = 'Copyright 2017 Greg Albrecht and Contributors'  # NOQA pylint: disable=R0801
+__license__ = 'Apache License, Version 2.0'  # NOQA pylint: disable=R0801
+
+
+class StationIndexTestCase(aprs_test_classes.APRSTestClass):  # NOQA pylint: disable=R0904
+
+    """Tests for `aprs.geo_classes.StationIndex`."""
+
+    def setUp(self):  # pylint: disable=C0103
+        super(StationIndexTestCase, self).setUp()
+        self.index = aprs.geo_classes.StationIndex(cell_size=0.5, capacity=4)
+        self.index.update('W2GMD-6', 37.7418096, -122.38833)
+        self.index.update('KF4MKT', 37.8044, -122.2712)
+        self.index.update('W2GMD-1', 40.7128, -74.006)
+        self.index.update('ZL2ABC', -41.2865, 174.7762)
+
+    def test_update_moves_station(self):
+        """Tests that updating a Station replaces its last position."""
+        self.index.update('W2GMD-1', 37.75, -122.4)
+        self.assertEqual(len(self.index), 4)
+        self.assertEqual(self.index.position('W2GMD-1'), (37.75, -122.4))
+        self.assertEqual(self.index.in_box((40, -75, 41, -73)), [])
+
+    def test_update_frame(self):
+        """Tests indexing the Source of a decoded Position Frame."""
+        frame = aprs.parse_frame(
+            'N0CALL>APRS,TCPIP*:=3745.00N/12227.00W-test_update_frame')
+        self.assertTrue(self.index.update_frame(frame))
+        self.assertIn('N0CALL', self.index)
+        self.assertEqual(self.index.position('N0CALL'), (37.75, -122.45))
+
+        status = aprs.parse_frame('N0CALL-1>APRS:>status')
+        self.assertFalse(self.index.update_frame(status))
+        self.assertNotIn('N0CALL-1', self.index)
+
+    def test_in_radius(self):
+        """Tests radius queries return the nearest Stations first."""
+        found = self.index.in_radius(37.7418096, -122.38833, 20)
+        self.assertEqual([call for call, _ in found], ['W2GMD-6', 'KF4MKT'])
+        self.assertAlmostEqual(found[0][1], 0.0)
+
+    def test_remove(self):
+        """Tests removing a Station and reusing its slot."""
+        self.index.remove('KF4MKT')
+        self.assertNotIn('KF4MKT', self.index)
+        self.assertEqual(
+            self.index.in_radius(37.7418096, -122.38833, 20)[0][0], 'W2GMD-6')
+        self.index.update('N0CALL', 37.8044, -122.2712)
+        self.assertEqual(len(self.index), 4)
+
+    def test_nearest_matches_brute_force(self):
+        """Tests k-nearest & radius queries against a brute-force scan."""
+        rand = random.Random(1)
+        index = aprs.geo_classes.StationIndex()
+        positions = {}
+        for i in range(2000):
+            pos = (rand.uniform(-89, 89), rand.uniform(-180, 180))
+            positions['N%dCALL' % i] = pos
+            index.update('N%dCALL' % i, *pos)
+
+        for lat, lng in ((0, 179.9), (45.5, -122.7), (-88.9, 10)):
+            expected = sorted(
+                (aprs.distance(lat, lng, *pos), call)
+                for call, pos in positions.items())
+            nearest = index.nearest(lat, lng, 5)
+            self.assertEqual(
+                [call for call, _ in nearest],
+                [call for _, call in expected[:5]])
+
+            in_radius = index.in_radius(lat, lng, 1500)
+            self.assertEqual(
+                sorted(call for call, _ in in_radius),
+                sorted(call for dist, call in expected if dist <= 1500))
+
+        with self.assertRaises(ValueError):
+            index.nearest(0, 0, units='furlongs')
+
+
+class GeofenceEngineTestCase(aprs_test_classes.APRSTestClass):  # NOQA pylint: disable=R0904
+
+    """Tests for `aprs.geo_classes.GeofenceEngine`."""
+
+    def setUp(self):  # pylint: disable=C0103
+        super(GeofenceEngineTestCase, self).setUp()
+        self.events = []
+        self.engine = aprs.geo_classes.GeofenceEngine(
+            cell_size=0.25, callback=self.events.append)
+        # A concave 'L' shape around San Francisco.
+        self.engine.add_polygon('sf', [
+            (37.70, -122.52), (37.70, -122.35), (37.75, -122.35),
+            (37.75, -122.45), (37.82, -122.45), (37.82, -122.52)])
+        self.engine.add_circle('oakland', 37.8044, -122.2712, 5)
+
+    def test_polygon_contains(self):
+        """Tests Polygon containment, including the concave corner."""
+        fence = self.engine.fences['sf']
+        self.assertTrue(fence.contains(37.72, -122.40))
+        self.assertTrue(fence.contains(37.80, -122.50))
+        self.assertFalse(fence.contains(37.80, -122.40))
+        self.assertFalse(fence.contains(37.72, -122.30))
+
+    def test_enter_exit_events(self):
+        """Tests enter & exit events as a Station moves between fences."""
+        enter = aprs.geo_classes.GeofenceEvent.ENTER
+        exit_ = aprs.geo_classes.GeofenceEvent.EXIT
+
+        self.assertEqual(self.engine.check('W2GMD-9', 37.0, -122.0), [])
+        self.engine.check('W2GMD-9', 37.72, -122.40)
+        self.assertEqual(self.engine.inside('W2GMD-9'), {'sf'})
+        self.engine.check('W2GMD-9', 37.73, -122.41)
+        self.engine.check('W2GMD-9', 37.80, -122.27)
+        self.engine.check('W2GMD-9', 37.0, -122.0)
+
+        self.assertEqual(self.events, [
+            aprs.geo_classes.GeofenceEvent(enter, 'W2GMD-9', 'sf'),
+            aprs.geo_classes.GeofenceEvent(exit_, 'W2GMD-9', 'sf'),
+            aprs.geo_classes.GeofenceEvent(enter, 'W2GMD-9', 'oakland'),
+            aprs.geo_classes.GeofenceEvent(exit_, 'W2GMD-9', 'oakland'),
+        ])
+        self.assertEqual(self.engine.inside('W2GMD-9'), frozenset())
+
+    def test_handle_frame(self):
+        """Tests consuming Frames from a receive callback."""
+        frame = aprs.parse_frame(
+            'W2GMD-9>APRS,TCPIP*:!3743.20N/12224.00W>test_handle_frame')
+        events = self.engine.handle_frame(frame)
+        self.assertEqual([(e.event, e.fence) for e in events],
+                         [('enter', 'sf')])
+        self.assertEqual(
+            self.engine.handle_frame(aprs.parse_frame('W2GMD-9>APRS:>hi')),
+            [])
+
+    def test_remove(self):
+        """Tests removing a Geofence."""
+        self.engine.check('W2GMD-9', 37.72, -122.40)
+        self.engine.remove('sf')
+        self.assertEqual(len(self.engine), 1)
+        self.assertEqual(self.engine.inside('W2GMD-9'), frozenset())
+        self.assertEqual(self.engine.locate(37.72, -122.40), frozenset())
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -45,6 +45,8 @@ dddmm.hhW (i.e. degrees, minutes and hundredths of a minute west).
 
 import unittest  # pylint: disable=R0801
 
+import numpy
+
 from .context import aprs  # pylint: disable=R0801
 from .context import aprs_test_classes  # pylint: disable=R0801
 
@@ -188,6 +190,52 @@ class APRSGeoTestCase(aprs_test_classes.APRSTestClass):  # NOQA pylint: disable=
         self.assertTrue(lng_deg <= 180)
         self.assertTrue(aprs_lng.endswith('E'))
 
+    def test_distance_array(self):
+        """Test scalar-to-array and array-to-array Great-Circle distance."""
+        lats = numpy.array([37.7418096, 40.7128, -33.8688])
+        lngs = numpy.array([-122.38833, -74.006, 151.2093])
+
+        distances = aprs.distance(37.7418096, -122.38833, lats, lngs)
+        self.assertEqual(distances.shape, (3,))
+        self.assertAlmostEqual(distances[0], 0.0)
+        for i in range(3):
+            self.assertAlmostEqual(
+                distances[i],
+                aprs.distance(37.7418096, -122.38833, lats[i], lngs[i]))
+
+        pairwise = aprs.distance(lats, lngs, lats[::-1], lngs[::-1], 'nm')
+        self.assertAlmostEqual(pairwise[0], pairwise[2])
+        self.assertAlmostEqual(pairwise[1], 0.0)
+
+    def test_distance_bad_units(self):
+        """Test that unknown distance units are rejected."""
+        with self.assertRaises(ValueError):
+            aprs.distance(0, 0, 1, 1, 'furlongs')
+
+    def test_bearing_array(self):
+        """Test Initial Bearing for cardinal directions."""
+        bearings = aprs.bearing(
+            0, 0, numpy.array([1, 0, -1, 0]), numpy.array([0, 1, 0, -1]))
+        numpy.testing.assert_allclose(bearings, [0, 90, 180, 270])
+
+    def test_bounding_box_pole(self):
+        """Test that a Bounding Box reaching a pole spans all longitudes."""
+        box = aprs.bounding_box(89.95, 10, 50)
+        self.assertEqual(box[1], -180.0)
+        self.assertEqual(box[2], 90.0)
+        self.assertEqual(box[3], 180.0)
+        self.assertTrue(aprs.in_bounding_box(89.99, -170, box))
+
+    def test_in_range_antimeridian(self):
+        """Test radius filtering across the anti-meridian."""
+        lats = numpy.array([0.0, 0.0, 0.0, 1.0])
+        lngs = numpy.array([179.95, -179.95, 179.0, 179.99])
+        mask = aprs.in_range(0, 179.99, lats, lngs, 20)
+        self.assertEqual(mask.tolist(), [True, True, False, False])
+        self.assertEqual(
+            aprs.in_range(0, 179.99, lats, lngs, 20, 'nm').tolist(),
+            [True, True, False, False])
+
 
 if __name__ == '__main__':
     unittest.main()
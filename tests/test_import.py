@@ -0,0 +1,76 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""Python APRS Module Import Tests."""
+
+import os
+import subprocess
+import sys
+import unittest  # pylint: disable=R0801
+
+from .context import aprs  # pylint: disable=R0801
+from .context import aprs_test_classes  # pylint: disable=R0801
+
+__author__ = 'Greg Albrecht W2GMD <oss@undef.net>'  # NOQA pylint: disable=R0801
+__copyright__ = 'Copyright 2017 Greg Albrecht and Contributors'  # NOQA pylint: disable=R0801
+__license__ = 'Apache License, Version 2.0'  # NOQA pylint: disable=R0801
+
+
+HEAVY_MODULES = ['requests', 'bitarray', 'numpy', 'pkg_resources',
+                 'http.server', 'aprs.classes', 'aprs.functions']
+
+
+def _imported(code: str) -> list:
+    """Returns the `HEAVY_MODULES` imported by `code` in a fresh Python."""
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    return subprocess.check_output(
+        [sys.executable, '-c',
+         code + '; import sys; print(" ".join(name for name in %r '
+         'if name in sys.modules))' % (HEAVY_MODULES,)],
+        cwd=root, env=dict(os.environ, PYTHONPATH=root)).decode().split()
+
+
+class ImportTestCase(aprs_test_classes.APRSTestClass):  # NOQA pylint: disable=R0904
+
+    """Tests for lazily loaded `aprs` attributes & submodules."""
+
+    def test_import(self):
+        """Tests `import aprs` imports none of the heavy dependencies."""
+        self.assertEqual(_imported('import aprs'), [])
+        self.assertEqual(
+            _imported("import aprs; aprs.parse_frame(b'W2GMD>APRS:>test')"),
+            ['aprs.classes', 'aprs.functions'])
+
+    def test_lazy_attributes(self):
+        """Tests lazily loaded attributes, submodules & `dir()`."""
+        from aprs import Frame  # pylint: disable=C0415
+        self.assertIs(Frame, aprs.classes.Frame)
+        self.assertIs(aprs.in_range, aprs.geo_util.in_range)
+        self.assertIn('FCS', dir(aprs))
+        self.assertIn('tracing', dir(aprs))
+        with self.assertRaises(AttributeError):
+            aprs.NoSuchAttribute  # pylint: disable=W0104
+
+    def test_star_import(self):
+        """Tests `from aprs import *` exports the public names."""
+        namespace = {}
+        exec('from aprs import *', namespace)  # pylint: disable=W0122
+        for name in ('Frame', 'Callsign', 'TCP', 'parse_frame', 'FCS',
+                     'PARSE_OK', 'BadCallsignError', 'APRSIS_SERVERS'):
+            self.assertIs(namespace[name], getattr(aprs, name))
+        self.assertNotIn('importlib', namespace)
+
+    def test_version_fallback(self):
+        """Tests reading the version without importlib.metadata."""
+        root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+        version = subprocess.check_output(
+            [sys.executable, '-c',
+             "import sys; sys.modules['importlib.metadata'] = None; "
+             "import aprs; print(aprs.classes._version())"],
+            cwd=root, env=dict(os.environ, PYTHONPATH=root),
+            stderr=subprocess.DEVNULL).decode().strip()
+        self.assertEqual(version, repr(aprs.classes._version()))  # NOQA pylint: disable=W0212
+
+
+if __name__ == '__main__':
+    unittest.main()
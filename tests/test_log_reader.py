@@ -0,0 +1,133 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""Python APRS Module Text Log Reader Tests."""
+
+import math
+import os
+import shutil
+import tempfile
+import unittest  # pylint: disable=R0801
+
+import aprs.log_reader
+
+from .context import aprs  # pylint: disable=R0801
+from .context import aprs_test_classes  # pylint: disable=R0801
+
+__author__ = 'Greg Albrecht W2GMD <oss@undef.net>'  # NOQA pylint: disable=R0801
+__copyright__ = 'Copyright 2017 Greg Albrecht and Contributors'  # NOQA pylint: disable=R0801
+__license__ = 'Apache License, Version 2.0'  # NOQA pylint: disable=R0801
+
+
+class LogReaderTestCase(aprs_test_classes.APRSTestClass):  # NOQA pylint: disable=R0904
+
+    """Tests for `aprs.log_reader.LogReader`."""
+
+    def setUp(self):  # pylint: disable=C0103
+        super(LogReaderTestCase, self).setUp()
+        self.tmp_dir = tempfile.mkdtemp()
+        self.path = os.path.join(self.tmp_dir, 'aprs.log')
+        self.lines = [
+            b'W2GMD-%d>APRS,TCPIP*:>test_log_reader %d' % (i % 16, i)
+            for i in range(500)
+        ]
+
+    def tearDown(self):  # pylint: disable=C0103
+        super(LogReaderTestCase, self).tearDown()
+        shutil.rmtree(self.tmp_dir)
+
+    def _write(self, data, mode='wb'):
+        with open(self.path, mode) as log_file:
+            log_file.write(data)
+
+    def test_random_access(self):
+        """Tests nth Frame access, skipping comments & blank lines."""
+        self._write(b'# logresp W2GMD verified\r\n\r\n' +
+                    b'\r\n'.join(self.lines) + b'\r\n')
+        with aprs.log_reader.LogReader(self.path) as reader:
+            self.assertEqual(len(reader), 500)
+            line = reader[123]
+            self.assertEqual(line.tobytes(), self.lines[123])
+            line.release()
+            frame = reader.frame(-1)
+            self.assertEqual(str(frame.source), 'W2GMD-3')
+            self.assertEqual(bytes(frame.info), b'>test_log_reader 499')
+        self.assertTrue(os.path.exists(self.path + '.lidx'))
+
+    def test_persisted_index(self):
+        """Tests reusing & extending a saved index, and rebuilding it."""
+        self._write(b'\n'.join(self.lines[:300]) + b'\n' + self.lines[300])
+        with aprs.log_reader.LogReader(self.path) as reader:
+            # The partially written last line isn't indexed.
+            self.assertEqual(len(reader), 300)
+
+        self._write(b'\n' + b'\n'.join(self.lines[301:]) + b'\n', 'ab')
+        with aprs.log_reader.LogReader(self.path) as reader:
+            self.assertEqual(reader.indexed_length, os.path.getsize(self.path))
+            self.assertEqual(len(reader), 500)
+            self.assertEqual(
+                [bytes(line) for line in reader], self.lines)
+
+        # A rewritten log invalidates the index.
+        self._write(b'\n'.join(self.lines[250:]) + b'\n')
+        with aprs.log_reader.LogReader(self.path) as reader:
+            self.assertEqual(len(reader), 250)
+            self.assertEqual(bytes(reader[0]), self.lines[250])
+
+    def test_timestamps(self):
+        """Tests the timestamp column & searching by time."""
+        self._write(b''.join(
+            b'%.2f %s\n' % (1792375200 + i * 0.5, line)
+            for i, line in enumerate(self.lines)))
+        with aprs.log_reader.LogReader(self.path, timestamps=True) as reader:
+            self.assertEqual(reader.timestamp(10), 1792375205.0)
+            self.assertEqual(bytes(reader[10]), self.lines[10])
+            self.assertEqual(reader.search(1792375205.2), 11)
+            self.assertEqual(
+                reader.between(1792375210, 1792375212), range(20, 24))
+            self.assertEqual(reader.search(0), 0)
+            self.assertEqual(reader.search(2e9), 500)
+
+        with aprs.log_reader.LogReader(self.path, timestamps=True) as reader:
+            self.assertEqual(reader.timestamp(499), 1792375449.5)
+
+    def test_malformed_timestamp(self):
+        """Tests a malformed timestamp is indexed as NaN."""
+        self._write(b'1792375200.0 %s\nnot-a-time %s\n1792375201.0 %s\n' % (
+            self.lines[0], self.lines[1], self.lines[2]))
+        with aprs.log_reader.LogReader(self.path, timestamps=True) as reader:
+            self.assertEqual(len(reader), 3)
+            self.assertTrue(math.isnan(reader.timestamp(1)))
+            self.assertEqual(bytes(reader[1]),
+                             b'not-a-time ' + self.lines[1])
+            self.assertEqual(reader.timestamp(2), 1792375201.0)
+
+    def test_refresh_truncated_and_rotated(self):
+        """Tests refreshing rebuilds the index of a truncated or rotated
+        log, while views of the old log are held."""
+        self._write(b'\n'.join(self.lines[:100]) + b'\n')
+        with aprs.log_reader.LogReader(self.path) as reader:
+            held = reader[99]
+
+            self._write(b'\n'.join(self.lines[200:202]) + b'\n')
+            reader.refresh()
+            self.assertEqual([bytes(line) for line in reader],
+                             self.lines[200:202])
+
+            os.rename(self.path, self.path + '.1')
+            self._write(b'\n'.join(self.lines[300:303]) + b'\n')
+            reader.refresh()
+            self.assertEqual([bytes(line) for line in reader],
+                             self.lines[300:303])
+
+            self._write(b'\n'.join(self.lines[400:401]) + b'\n', 'ab')
+            self.assertEqual(reader.refresh(), 1)
+            self.assertEqual(bytes(reader[-1]), self.lines[400])
+            held.release()
+
+        with aprs.log_reader.LogReader(self.path) as reader:
+            self.assertEqual(len(reader), 4)
+
+
+if __name__ == '__main__':
+    unittest.main()
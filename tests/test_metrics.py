@@ -0,0 +1,131 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""Python APRS Module Metrics Tests."""
+
+import asyncio
+import threading
+import unittest  # pylint: disable=R0801
+import urllib.request
+
+from .context import aprs  # pylint: disable=R0801
+from .context import aprs_test_classes  # pylint: disable=R0801
+
+import aprs.server  # pylint: disable=C0411,C0413
+
+__author__ = 'Greg Albrecht W2GMD <oss@undef.net>'  # NOQA pylint: disable=R0801
+__copyright__ = 'Copyright 2017 Greg Albrecht and Contributors'  # NOQA pylint: disable=R0801
+__license__ = 'Apache License, Version 2.0'  # NOQA pylint: disable=R0801
+
+
+class MetricsTestCase(aprs_test_classes.APRSTestClass):  # NOQA pylint: disable=R0904
+
+    """Tests for `aprs.metrics`."""
+
+    def setUp(self):  # pylint: disable=C0103
+        super(MetricsTestCase, self).setUp()
+        self.registry = aprs.MetricsRegistry()
+
+    def test_counter_threads(self):
+        """Tests Counters summed over per-thread cells."""
+        counter = self.registry.counter('test_total', 'Test.', kind='a')
+        self.assertIs(self.registry.counter('test_total', kind='a'), counter)
+
+        def _count():
+            for _ in range(10000):
+                counter.inc()
+
+        threads = [threading.Thread(target=_count) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        counter.inc(5)
+        self.assertEqual(counter.value, 40005)
+        self.assertEqual(len(counter._cells.cells), 5)  # NOQA pylint: disable=W0212
+
+        with self.assertRaises(ValueError):
+            self.registry.gauge('test_total', kind='a')
+
+    def test_exposition(self):
+        """Tests the dict & Prometheus text exposition."""
+        self.registry.gauge('test_depth', 'Depth.').set(3)
+        histogram = self.registry.histogram(
+            'test_seconds', 'Latency.', buckets=(0.1, 1.0), stage='parse')
+        for value in (0.05, 0.5, 0.5, 2.0):
+            histogram.observe(value)
+
+        values = self.registry.as_dict()
+        self.assertEqual(values['test_depth'], 3)
+        self.assertEqual(values['test_seconds{stage="parse"}'], {
+            'count': 4, 'sum': 3.05,
+            'buckets': {0.1: 1, 1.0: 3, float('inf'): 4}})
+
+        text = self.registry.prometheus()
+        self.assertIn('# TYPE test_seconds histogram\n', text)
+        self.assertIn('test_seconds_bucket{stage="parse",le="1.0"} 3\n', text)
+        self.assertIn('test_seconds_bucket{stage="parse",le="+Inf"} 4\n',
+                      text)
+        self.assertIn('test_seconds_count{stage="parse"} 4\n', text)
+        self.assertIn(
+            '# HELP test_depth Depth.\n# TYPE test_depth gauge\n'
+            'test_depth 3\n', text)
+
+        server = self.registry.serve(0, '127.0.0.1')
+        try:
+            with urllib.request.urlopen('http://127.0.0.1:%d/metrics' %
+                                        server.server_address[1]) as resp:
+                self.assertEqual(resp.read().decode(), text)
+        finally:
+            server.shutdown()
+            server.server_close()
+
+    def test_tcp(self):
+        """Tests `aprs.TCP` metrics against a local APRS-IS server."""
+        loop = asyncio.new_event_loop()
+        thread = threading.Thread(target=loop.run_forever)
+        thread.start()
+        server = aprs.server.APRSISServer(
+            [b'W2GMD-1>APRS:>test', b'W2GMD-2>APRS:bad'], port=0,
+            min_clients=1, keepalive=0.01)
+        asyncio.run_coroutine_threadsafe(server.start(), loop).result(5)
+
+        aprs_conn = aprs.TCP(
+            b'N0CALL', b'13023',
+            servers=[b'127.0.0.1:%d' % server.port], aprs_filter=b'p/W2GMD')
+        metrics = aprs.metrics.InterfaceMetrics('tcp', self.registry)
+        aprs_conn.metrics = metrics
+        aprs_conn.start()
+        aprs_conn.send(b'N0CALL>APRS:>hello')
+
+        frames = []
+
+        def _frame_handler(line):
+            if line.endswith(b'bad'):
+                raise ValueError(line)
+            return aprs.parse_frame(line)
+
+        with self.assertRaises(ValueError):
+            aprs_conn.receive(callback=frames.append,
+                              frame_handler=_frame_handler)
+        aprs_conn.interface.close()
+        asyncio.run_coroutine_threadsafe(server.close(), loop).result(5)
+        loop.call_soon_threadsafe(loop.stop)
+        thread.join()
+        loop.close()
+
+        values = self.registry.as_dict()
+        self.assertEqual(len(frames), 1)
+        self.assertEqual(metrics.frames_received.value, 1)
+        self.assertEqual(metrics.callback_latency.count, 1)
+        self.assertEqual(metrics.frames_sent.value, 1)
+        self.assertEqual(metrics.bytes_sent.value, 20)
+        self.assertGreater(metrics.bytes_received.value, 40)
+        self.assertEqual(metrics.reconnects.value, 0)
+        self.assertEqual(
+            values['aprs_parse_errors_total{error="ValueError",'
+                   'interface="tcp"}'], 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,105 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""Python APRS Module Prefilter Tests."""
+
+import unittest  # pylint: disable=R0801
+
+import aprs.prefilter
+
+from .context import aprs  # pylint: disable=R0801
+from .context import aprs_test_classes  # pylint: disable=R0801
+
+__author__ = 'Greg Albrecht W2GMD <oss@undef.net>'  # NOQA pylint: disable=R0801
+__copyright__ = 'Copyright 2017 Greg Albrecht and Contributors'  # NOQA pylint: disable=R0801
+__license__ = 'Apache License, Version 2.0'  # NOQA pylint: disable=R0801
+
+
+LINES = [
+    b'W2GMD-6>APOTC1,WIDE1-1,qAR,W2GMD-1:!3745.75NI12228.05W#test',
+    b'W2GMD-1>APRS,TCPIP*,qAC,T2TEST:>status',
+    b'KF4MKT>APRX24,WIDE1-1*,WIDE2-1,qARX,N0CALL:T#001,1,2,3,4,5,00000000',
+    b'KF4MKT-9>SW5PXY,W2GMD*,WIDE2,qAR,KF4MKT:`2\\\\l}B>/]"4%}=',
+    b'garbage line: without a source',
+]
+
+
+class PrefilterTestCase(aprs_test_classes.APRSTestClass):  # NOQA pylint: disable=R0904
+
+    """Tests for `aprs.prefilter`."""
+
+    def _passing(self, predicate):
+        prefilter = aprs.prefilter.Prefilter(predicate)
+        return [LINES.index(line) for line in prefilter.filter(LINES)]
+
+    def test_predicates(self):
+        """Tests each header predicate."""
+        prefilter = aprs.prefilter
+        self.assertEqual(self._passing(prefilter.source_prefix(b'W2GMD')),
+                         [0, 1])
+        self.assertEqual(
+            self._passing(prefilter.source_is(b'KF4MKT', b'W2GMD-1')), [1, 2])
+        self.assertEqual(
+            self._passing(prefilter.tocall_prefix(b'APRS', b'APRX')), [1, 2])
+        self.assertEqual(self._passing(prefilter.path_contains(b'qAR')),
+                         [0, 3])
+        self.assertEqual(self._passing(prefilter.path_contains(b'WIDE2')),
+                         [3])
+        self.assertEqual(self._passing(prefilter.path_contains(b'W2GMD')),
+                         [3])
+        self.assertEqual(
+            self._passing(prefilter.digipeated_by(b'WIDE1-1')), [2])
+        self.assertEqual(
+            self._passing(prefilter.digipeated_by(b'WIDE2-1', b'WIDE2')), [])
+        self.assertEqual(
+            self._passing(prefilter.digipeated_by(b'W2GMD', b'TCP*')), [1, 3])
+        self.assertEqual(self._passing(prefilter.data_type(b'!', b'`')),
+                         [0, 3])
+        self.assertEqual(self._passing(prefilter.info_contains(b'status')),
+                         [1])
+
+    def test_compose(self):
+        """Tests composing predicates."""
+        prefilter = aprs.prefilter
+        predicate = (
+            (prefilter.path_contains(b'qAR') |
+             prefilter.tocall_prefix(b'APRX')) &
+            ~prefilter.source_prefix(b'W2GMD'))
+        self.assertEqual(self._passing(predicate), [2, 3])
+        self.assertIn('path_contains', repr(predicate))
+
+    def test_aprsis_filter(self):
+        """Tests APRS-IS filter strings."""
+        aprsis_filter = aprs.prefilter.aprsis_filter
+        self.assertEqual(self._passing(aprsis_filter(b'p/W2GMD')), [0, 1])
+        self.assertEqual(
+            self._passing(aprsis_filter('b/KF4MKT* -b/KF4MKT-9')), [2])
+        self.assertEqual(self._passing(aprsis_filter(b'd/W2GMD')), [3])
+        self.assertEqual(self._passing(aprsis_filter(b'd/wide1*')), [2])
+        self.assertEqual(self._passing(aprsis_filter(b't/st')), [1, 2])
+        self.assertEqual(self._passing(aprsis_filter(b't/p')), [0, 3])
+        self.assertEqual(
+            self._passing(aprsis_filter(b'r/37.76/-122.47/5')), [0])
+        self.assertEqual(
+            self._passing(aprsis_filter(b'r/40.7/-74.0/5 x/bad r/1/2')), [])
+        self.assertEqual(self._passing(aprsis_filter(b'')), [])
+
+    def test_frames(self):
+        """Tests parsing & callbacks for passing lines only."""
+        prefilter = aprs.prefilter.Prefilter(
+            aprs.prefilter.source_prefix(b'KF4MKT'))
+        frames = list(prefilter.frames(memoryview(line) for line in LINES))
+        self.assertEqual([str(frame.source) for frame in frames],
+                         ['KF4MKT', 'KF4MKT-9'])
+        self.assertEqual(prefilter.scanned, 5)
+        self.assertEqual(prefilter.passed, 2)
+
+        received = []
+        callback = prefilter.wrap(received.append)
+        for line in LINES:
+            callback(line)
+        self.assertEqual(str(received[0]), LINES[2].decode())
+
+
+if __name__ == '__main__':
+    unittest.main()
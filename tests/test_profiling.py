@@ -0,0 +1,113 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""Python APRS Module Profiling Tests."""
+
+import io
+import os
+import subprocess
+import sys
+import threading
+import unittest  # pylint: disable=R0801
+
+from .context import aprs  # pylint: disable=R0801
+from .context import aprs_test_classes  # pylint: disable=R0801
+
+__author__ = 'Greg Albrecht W2GMD <oss@undef.net>'  # NOQA pylint: disable=R0801
+__copyright__ = 'Copyright 2017 Greg Albrecht and Contributors'  # NOQA pylint: disable=R0801
+__license__ = 'Apache License, Version 2.0'  # NOQA pylint: disable=R0801
+
+
+def _blocked(event):
+    event.wait()
+
+
+class ProfilingTestCase(aprs_test_classes.APRSTestClass):  # NOQA pylint: disable=R0904
+
+    """Tests for `aprs.profiling`."""
+
+    def test_profiler(self):
+        """Tests counting & timing wrapped calls."""
+        profiler = aprs.Profiler()
+        parse_frame = profiler.wrap(aprs.functions.parse_frame)
+        self.assertEqual(parse_frame.__doc__,
+                         aprs.functions.parse_frame.__doc__)
+        for _ in range(10):
+            parse_frame(b'W2GMD>APRS:>test')
+
+        (name, stats), = profiler.summary()
+        self.assertEqual(name, 'aprs.functions.parse_frame')
+        self.assertEqual(stats['calls'], 10)
+        self.assertGreater(stats['total'], 0)
+        self.assertAlmostEqual(stats['mean'] * 10, stats['total'])
+
+        out = io.StringIO()
+        profiler.dump(out)
+        self.assertIn('aprs.functions.parse_frame', out.getvalue())
+        profiler.reset()
+        self.assertEqual(profiler.summary(), [])
+
+        for _ in range(5):
+            parse_frame(b'W2GMD>APRS:>test')
+        (name, stats), = profiler.summary()
+        self.assertEqual(stats['calls'], 5)
+
+    def test_sampling_profiler(self):
+        """Tests counting stack samples of registered functions."""
+        profiler = aprs.profiling.SamplingProfiler()
+        self.assertIs(profiler.wrap(_blocked), _blocked)
+        event = threading.Event()
+        thread = threading.Thread(target=_blocked, args=(event,))
+        thread.start()
+        try:
+            for _ in range(3):
+                profiler.sample()
+        finally:
+            event.set()
+            thread.join()
+        (name, stats), = profiler.summary()
+        self.assertTrue(name.endswith('_blocked'))
+        self.assertEqual(stats['samples'], 3)
+        self.assertEqual(stats['self_samples'], 3)
+        self.assertAlmostEqual(stats['total'], 0.015)
+
+    def test_environment(self):
+        """Tests enabling profiling via APRS_PROFILE."""
+        env = dict(os.environ, APRS_PROFILE='1')
+        env.pop('APRS_PROFILE_OUTPUT', None)
+        result = subprocess.run(
+            [sys.executable, '-c',
+             'import aprs; aprs.parse_frame(b"W2GMD>APRS:>test")'],
+            cwd=os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+            env=env, stdout=subprocess.PIPE, stderr=subprocess.PIPE,
+            check=True)
+        summary = result.stderr.decode()
+        self.assertIn('aprs profile', summary)
+        self.assertIn('aprs.functions.parse_frame', summary)
+        self.assertIn('aprs.functions.parse_callsign', summary)
+
+    def test_environment_off(self):
+        """Tests APRS_PROFILE=0 & a bad APRS_PROFILE_INTERVAL."""
+        cwd = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+        for profile in ('0', 'False', 'off'):
+            env = dict(os.environ, APRS_PROFILE=profile)
+            result = subprocess.run(
+                [sys.executable, '-c',
+                 'import aprs; print(aprs.profiling.PROFILER)'],
+                cwd=cwd, env=env, stdout=subprocess.PIPE,
+                stderr=subprocess.PIPE, check=True)
+            self.assertEqual(result.stdout.strip(), b'None')
+            self.assertNotIn(b'aprs profile', result.stderr)
+
+        env = dict(os.environ, APRS_PROFILE='sample',
+                   APRS_PROFILE_INTERVAL='5ms')
+        result = subprocess.run(
+            [sys.executable, '-c',
+             'import aprs; print(aprs.profiling.PROFILER.interval)'],
+            cwd=cwd, env=env, stdout=subprocess.PIPE, stderr=subprocess.PIPE,
+            check=True)
+        self.assertEqual(result.stdout.strip(), b'0.005')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,118 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""Python APRS Module Replay Tests."""
+
+import gzip
+import os
+import shutil
+import socket
+import tempfile
+import unittest  # pylint: disable=R0801
+
+import aprs.replay
+
+from .context import aprs  # pylint: disable=R0801
+from .context import aprs_test_classes  # pylint: disable=R0801
+
+__author__ = 'Greg Albrecht W2GMD <oss@undef.net>'  # NOQA pylint: disable=R0801
+__copyright__ = 'Copyright 2017 Greg Albrecht and Contributors'  # NOQA pylint: disable=R0801
+__license__ = 'Apache License, Version 2.0'  # NOQA pylint: disable=R0801
+
+
+class ReplayTestCase(aprs_test_classes.APRSTestClass):  # NOQA pylint: disable=R0904
+
+    """Tests for `aprs.replay`."""
+
+    def setUp(self):  # pylint: disable=C0103
+        super(ReplayTestCase, self).setUp()
+        self.tmp_dir = tempfile.mkdtemp()
+        self.lines = [b'W2GMD-%d>APRS,TCPIP*:>replay %d' % (i % 9 + 1, i)
+                      for i in range(50)]
+        # 50 lines over 0.245 seconds.
+        self.events = [(1000.0 + i * 0.005, line)
+                       for i, line in enumerate(self.lines)]
+
+    def tearDown(self):  # pylint: disable=C0103
+        super(ReplayTestCase, self).tearDown()
+        shutil.rmtree(self.tmp_dir)
+
+    def test_log_events(self):
+        """Tests reading a timestamped, compressed APRS-IS log."""
+        path = os.path.join(self.tmp_dir, 'aprs.log.gz')
+        with gzip.open(path, 'wb') as log:
+            log.write(b'# logresp\r\n')
+            for timestamp, line in self.events[:3]:
+                log.write(b'%.3f %s\r\n' % (timestamp, line))
+            log.write(self.lines[3] + b'\r\n')
+        self.assertEqual(
+            list(aprs.replay.log_events(path)),
+            self.events[:3] + [(self.events[2][0], self.lines[3])])
+
+    def test_capture_events(self):
+        """Tests reading a capture of KISS Frames."""
+        path = os.path.join(self.tmp_dir, 'aprs.cap')
+        encoder = aprs.FrameEncoder(kiss=True)
+        with aprs.capture.CaptureWriter(path) as capture:
+            for timestamp, line in self.events:
+                with encoder.encode_many([line]) as kiss_frame:
+                    capture.write(bytes(kiss_frame), timestamp)
+        events = list(aprs.replay.capture_events(path))
+        self.assertEqual([event[0] for event in events],
+                         [event[0] for event in self.events])
+        self.assertEqual(events[0][1][:2], b'\xc0\x00')
+        self.assertEqual(len(list(aprs.replay.capture_events(
+            path, start=1000.1, end=1000.2))), 20)
+        self.assertEqual(
+            len(list(aprs.replay.capture_events(path, start=1000.1))),
+            len([event for event in self.events if event[0] >= 1000.1]))
+        self.assertEqual(
+            len(list(aprs.replay.capture_events(path, end=1000.1))),
+            len([event for event in self.events if event[0] < 1000.1]))
+
+    def test_paced(self):
+        """Tests replaying at 2x speed into a callback."""
+        frames = []
+        replay = aprs.replay.Replay(self.events, speed=2)
+        stats = replay.run(aprs.replay.callback_sink(frames.append))
+        self.assertEqual([bytes(frame) for frame in frames], self.lines)
+        self.assertEqual(stats['events'], 50)
+        self.assertAlmostEqual(stats['span'], 0.245)
+        self.assertAlmostEqual(stats['elapsed'], 0.1225, delta=0.03)
+        self.assertAlmostEqual(
+            stats['achieved_rate'], stats['target_rate'],
+            delta=stats['target_rate'] * 0.2)
+
+    def test_flat_out(self):
+        """Tests replaying flat-out, with a limit."""
+        received = []
+        replay = aprs.replay.Replay(self.events, speed=0)
+        stats = replay.run(
+            aprs.replay.callback_sink(received.append, None), limit=10)
+        self.assertEqual(received, self.lines[:10])
+        self.assertLess(stats['elapsed'], 0.1)
+        self.assertNotEqual(stats['target_rate'], stats['target_rate'])
+
+    def test_kiss_stream(self):
+        """Tests replaying text Frames to a KISS TCP port."""
+        with aprs.replay.StreamSink(kiss=True) as sink:
+            client = socket.create_connection(sink.address)
+            self.assertTrue(sink.wait_clients(1, timeout=5))
+            aprs.replay.Replay(self.events[:2], speed=0).run(sink)
+            client.close()
+        expected = b''.join(sink.encode(line) for line in self.lines[:2])
+        self.assertEqual(expected.count(aprs.KISS_FEND), 4)
+
+        with aprs.replay.StreamSink() as sink:
+            client = socket.create_connection(sink.address)
+            client.settimeout(5)
+            sink.wait_clients(1, timeout=5)
+            aprs.replay.Replay(self.events[:2], speed=0).run(sink)
+            reader = client.makefile('rb')
+            self.assertEqual(reader.readline(), self.lines[0] + b'\r\n')
+            self.assertEqual(reader.readline(), self.lines[1] + b'\r\n')
+            client.close()
+
+
+if __name__ == '__main__':
+    unittest.main()
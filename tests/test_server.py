@@ -0,0 +1,139 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""Python APRS Module APRS-IS Server Tests."""
+
+import asyncio
+import socket
+import threading
+import time
+import unittest  # pylint: disable=R0801
+
+from .context import aprs  # pylint: disable=R0801
+from .context import aprs_test_classes  # pylint: disable=R0801
+
+import aprs.server  # pylint: disable=C0411,C0413
+
+__author__ = 'Greg Albrecht W2GMD <oss@undef.net>'  # NOQA pylint: disable=R0801
+__copyright__ = 'Copyright 2017 Greg Albrecht and Contributors'  # NOQA pylint: disable=R0801
+__license__ = 'Apache License, Version 2.0'  # NOQA pylint: disable=R0801
+
+
+CORPUS = [
+    b'# recorded feed',
+    b'W2GMD-6>APOTC1,WIDE1-1,qAR,W2GMD-1:!3745.75NI12228.05W#test',
+    b'W2GMD-1>APRS,TCPIP*,qAC,T2TEST:>status',
+    b'KF4MKT>APRX24,WIDE1-1*,qAR,N0CALL:!4043.00N/07400.00W-NYC',
+    b'not a frame',
+]
+
+
+class APRSISServerTestCase(aprs_test_classes.APRSTestClass):  # NOQA pylint: disable=R0904
+
+    """Tests for `aprs.server.APRSISServer`."""
+
+    def setUp(self):  # pylint: disable=C0103
+        super(APRSISServerTestCase, self).setUp()
+        self.loop = asyncio.new_event_loop()
+        self.thread = threading.Thread(target=self.loop.run_forever)
+        self.thread.start()
+        self.submitted = []
+        self.server = None
+        self.clients = []
+
+    def tearDown(self):  # pylint: disable=C0103
+        for client in self.clients:
+            client.close()
+        if self.server is not None:
+            self._run(self.server.close())
+        self.loop.call_soon_threadsafe(self.loop.stop)
+        self.thread.join()
+        self.loop.close()
+        super(APRSISServerTestCase, self).tearDown()
+
+    def _run(self, coro):
+        return asyncio.run_coroutine_threadsafe(coro, self.loop).result(5)
+
+    def _serve(self, **kwargs):
+        self.server = aprs.server.APRSISServer(
+            port=0, on_frame=self.submitted.append, **kwargs)
+        self._run(self.server.start())
+
+    def _connect(self, login: bytes):
+        client = socket.create_connection(('127.0.0.1', self.server.port))
+        client.settimeout(5)
+        self.clients.append(client)
+        reader = client.makefile('rb')
+        self.assertTrue(reader.readline().startswith(b'# '))
+        client.sendall(login + b'\n\r')
+        return client, reader
+
+    def test_passcode(self):
+        """Tests APRS-IS passcodes."""
+        self.assertEqual(aprs.server.passcode('N0CALL'), 13023)
+        self.assertEqual(aprs.server.passcode(b'n0call-9'), 13023)
+
+    def test_login_and_filter(self):
+        """Tests logresp & replaying the lines passing a client's filter."""
+        self._serve(corpus=CORPUS, min_clients=2)
+        _, reader = self._connect(
+            b'user N0CALL pass 13023 vers test 1.0 filter r/40.7/-74.0/50')
+        self.assertEqual(
+            reader.readline(),
+            b'# logresp N0CALL verified, server T2LOCAL\r\n')
+        _, other = self._connect(b'user W2GMD pass -1 filter t/s -p/KF4')
+        self.assertEqual(
+            other.readline(),
+            b'# logresp W2GMD unverified, server T2LOCAL\r\n')
+
+        self.assertEqual(reader.readline(), CORPUS[3] + b'\r\n')
+        self.assertEqual(other.readline(), CORPUS[2] + b'\r\n')
+        self._run(asyncio.sleep(0))
+        self.assertEqual(self.server.replayed, 3)
+        self.assertEqual(self.server.sent, 2)
+
+    def test_submit(self):
+        """Tests relaying client Frames with a q-construct."""
+        self._serve()
+        sender, reader = self._connect(b'user N0CALL pass 13023')
+        reader.readline()
+        _, other = self._connect(b'user W2GMD pass -1 filter b/N0CALL')
+        other.readline()
+
+        sender.sendall(b'N0CALL>APRS:>hello\n\r')
+        self.assertEqual(other.readline(),
+                         b'N0CALL>APRS,qAC,T2LOCAL:>hello\r\n')
+        self.assertEqual(self.submitted, [b'N0CALL>APRS,qAC,T2LOCAL:>hello'])
+
+        # Unverified clients can't submit.
+        self.clients[1].sendall(b'W2GMD>APRS:>hello\r\n')
+        sender.sendall(b'#filter p/W2GMD\r\nN0CALL>APRS:>again\r\n')
+        self.assertEqual(other.readline(),
+                         b'N0CALL>APRS,qAC,T2LOCAL:>again\r\n')
+        self.assertEqual(self.server.submitted, 2)
+
+    def test_tcp_client(self):
+        """Tests `aprs.TCP` against the server, with a paced replay."""
+        self._serve(corpus=CORPUS[1:2], rate=200, repeat=True,
+                    keepalive=0.05)
+        aprs_conn = aprs.TCP(
+            b'N0CALL', b'13023',
+            servers=[b'127.0.0.1:%d' % self.server.port],
+            aprs_filter=b'p/W2GMD')
+        aprs_conn.start()
+        frames = []
+
+        def _callback(frame):
+            frames.append(frame)
+            if len(frames) == 20:
+                aprs_conn.interface.close()
+
+        start = time.time()
+        with self.assertRaises(OSError):
+            aprs_conn.receive(callback=_callback)
+        self.assertGreater(time.time() - start, 0.05)
+        self.assertEqual(str(frames[-1]), CORPUS[1].decode())
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,134 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""Python APRS Module Snapshot Tests."""
+
+import os
+import shutil
+import tempfile
+import threading
+import unittest  # pylint: disable=R0801
+
+import aprs.snapshot
+
+from .context import aprs  # pylint: disable=R0801
+from .context import aprs_test_classes  # pylint: disable=R0801
+
+__author__ = 'Greg Albrecht W2GMD <oss@undef.net>'  # NOQA pylint: disable=R0801
+__copyright__ = 'Copyright 2017 Greg Albrecht and Contributors'  # NOQA pylint: disable=R0801
+__license__ = 'Apache License, Version 2.0'  # NOQA pylint: disable=R0801
+
+
+class SnapshotTestCase(aprs_test_classes.APRSTestClass):  # NOQA pylint: disable=R0904
+
+    """Tests for `aprs.snapshot`."""
+
+    def setUp(self):  # pylint: disable=C0103
+        super(SnapshotTestCase, self).setUp()
+        self.tmp_dir = tempfile.mkdtemp()
+        self.path = os.path.join(self.tmp_dir, 'aprs.snap')
+
+        self.store = aprs.StationStore(max_stations=10)
+        self.store.update_frame(aprs.parse_frame(
+            'W2GMD-6>APRS,WIDE1-1*:=3745.00N/12227.00W-test_snapshot'),
+            heard=10.0)
+        self.store.update('N0CALL', status=b'\xffbinary', heard=11.0)
+        self.store.update('W2GMD-6', heard=12.0)
+        self.frames = [
+            aprs.parse_frame('W2GMD-1>APRS,TCPIP*:>test_snapshot'),
+            aprs.parse_frame(
+                'W2GMD-6>APRX24,WIDE1-1:T#939,10.9,4.5,57.0,1.0,18.0,000000')
+        ]
+
+    def tearDown(self):  # pylint: disable=C0103
+        super(SnapshotTestCase, self).tearDown()
+        shutil.rmtree(self.tmp_dir)
+
+    def test_round_trip(self):
+        """Tests writing & reading a Snapshot of a Store and Frame lists."""
+        size = aprs.snapshot.write_snapshot(
+            self.path, self.store, {'heard': self.frames, 'dupes': []})
+        self.assertEqual(os.path.getsize(self.path), size)
+        self.assertEqual(os.listdir(self.tmp_dir), ['aprs.snap'])
+
+        store, frames = aprs.snapshot.read_snapshot(self.path)
+        self.assertEqual(list(store), ['N0CALL', 'W2GMD-6'])
+        self.assertEqual(store.max_stations, 10)
+
+        station = store['W2GMD-6']
+        self.assertEqual((station.lat, station.lng), (37.75, -122.45))
+        self.assertEqual(station.symbol, b'/-')
+        self.assertEqual(station.path, b'WIDE1-1*')
+        self.assertEqual(station.heard, 12.0)
+        self.assertEqual(store['N0CALL'].status, b'\xffbinary')
+        self.assertIsNone(store['N0CALL'].path)
+
+        self.assertEqual(sorted(frames), ['dupes', 'heard'])
+        self.assertEqual([bytes(f) for f in frames['heard']],
+                         [bytes(f) for f in self.frames])
+
+        # The restored Store keeps working, evicting the oldest Station.
+        for i in range(9):
+            store.update('K%dTST' % i)
+        self.assertNotIn('N0CALL', store)
+
+    def test_corrupt_snapshot(self):
+        """Tests that a corrupted or foreign file is rejected."""
+        aprs.snapshot.write_snapshot(self.path, self.store)
+        with open(self.path, 'r+b') as snap_file:
+            snap_file.seek(-1, os.SEEK_END)
+            last = snap_file.read(1)
+            snap_file.seek(-1, os.SEEK_END)
+            snap_file.write(bytes([last[0] ^ 0xFF]))
+
+        with self.assertRaises(aprs.SnapshotError):
+            aprs.snapshot.read_snapshot(self.path)
+
+        with open(self.path, 'wb') as snap_file:
+            snap_file.write(b'W2GMD>APRS:>not a snapshot at all')
+        with self.assertRaises(aprs.SnapshotError):
+            aprs.snapshot.read_snapshot(self.path)
+
+    def test_snapshotter(self):
+        """Tests the periodic Snapshotter writes a final Snapshot."""
+        snapshotter = aprs.snapshot.Snapshotter(
+            self.path, self.store, interval=3600,
+            frames_func=lambda: {'heard': self.frames})
+        snapshotter.start()
+        snapshotter.stop()
+        store, frames = aprs.snapshot.read_snapshot(self.path)
+        self.assertEqual(len(store), 2)
+        self.assertEqual(len(frames['heard']), 2)
+
+    def test_concurrent_updates(self):
+        """Tests Snapshots of a Store being updated by another thread."""
+        store = aprs.StationStore(max_stations=50)
+        done = threading.Event()
+
+        def _churn():
+            i = 0
+            while not done.is_set():
+                store.update('N%dCALL' % (i % 80), lat=i, lng=-i,
+                             status=b'%d' % i, heard=i)
+                if i % 3 == 0:
+                    store.expire(i - 40)
+                i += 1
+
+        thread = threading.Thread(target=_churn)
+        thread.start()
+        try:
+            for _ in range(50):
+                aprs.snapshot.write_snapshot(self.path, store)
+                restored, _ = aprs.snapshot.read_snapshot(self.path)
+                for callsign in restored:
+                    station = restored[callsign]
+                    self.assertEqual(station.status,
+                                     b'%d' % station.heard)
+                    self.assertEqual(station.lat, station.heard)
+        finally:
+            done.set()
+            thread.join()
+
+
+if __name__ == '__main__':
+    unittest.main()
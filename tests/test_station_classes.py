@@ -0,0 +1,97 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""Python APRS Module Station Class Tests."""
+
+import math
+import unittest  # pylint: disable=R0801
+
+from .context import aprs  # pylint: disable=R0801
+from .context import aprs_test_classes  # pylint: disable=R0801
+
+__author__ = 'Greg Albrecht W2GMD <oss@undef.net>'  # NOQA pylint: disable=R0801
+__copyright__ = 'Copyright 2017 Greg Albrecht and Contributors'  # NOQA pylint: disable=R0801
+__license__ = 'Apache License, Version 2.0'  # NOQA pylint: disable=R0801
+
+
+class StationStoreTestCase(aprs_test_classes.APRSTestClass):  # NOQA pylint: disable=R0904
+
+    """Tests for `aprs.StationStore`."""
+
+    def test_update_frame(self):
+        """Tests recording position, symbol, path & status from Frames."""
+        store = aprs.StationStore()
+        store.update_frame(aprs.parse_frame(
+            'W2GMD-6>APRS,WIDE1-1,qAR,N0CALL:=3745.00N/12227.00W-test'),
+            heard=100.0)
+        store.update_frame(
+            aprs.parse_frame('W2GMD-6>APRS,TCPIP*:>On the air'), heard=101.0)
+
+        station = store['W2GMD-6']
+        self.assertEqual((station.lat, station.lng), (37.75, -122.45))
+        self.assertEqual(station.symbol, b'/-')
+        self.assertEqual(station.status, b'On the air')
+        self.assertEqual(station.path, b'TCPIP*')
+        self.assertEqual(station.heard, 101.0)
+        self.assertEqual(store.last_heard('W2GMD-6'), 101.0)
+
+    def test_unknown_fields(self):
+        """Tests that fields never heard are reported as unknown."""
+        store = aprs.StationStore()
+        store.update('W2GMD', heard=1.0)
+        station = store.get('W2GMD')
+        self.assertTrue(math.isnan(station.lat))
+        self.assertIsNone(station.symbol)
+        self.assertIsNone(station.status)
+        self.assertIsNone(store.get('N0CALL'))
+        with self.assertRaises(KeyError):
+            store['N0CALL']  # pylint: disable=W0104
+
+    def test_evicts_least_recently_heard(self):
+        """Tests that a full Store evicts the least recently heard."""
+        store = aprs.StationStore(max_stations=3)
+        for i, call in enumerate(['A1AA', 'B1BB', 'C1CC']):
+            store.update(call, lat=i, lng=i, heard=i)
+        store.update('A1AA', heard=3)
+        store.update('D1DD', status=b'new', heard=4)
+
+        self.assertEqual(len(store), 3)
+        self.assertEqual(store.evictions, 1)
+        self.assertNotIn('B1BB', store)
+        self.assertEqual(list(store), ['C1CC', 'A1AA', 'D1DD'])
+        self.assertTrue(math.isnan(store['D1DD'].lat))
+        self.assertEqual(store['A1AA'].lat, 0)
+
+    def test_remove_and_expire(self):
+        """Tests removing & expiring Stations keeps records consistent."""
+        store = aprs.StationStore()
+        for i in range(10):
+            store.update('N%dCALL' % i, lat=i, lng=-i, heard=i)
+        store.remove('N2CALL')
+        self.assertEqual(store.expire(5), 4)
+        self.assertEqual(len(store), 5)
+        for i in range(5, 10):
+            self.assertEqual(store['N%dCALL' % i].lat, i)
+            self.assertEqual(store['N%dCALL' % i].lng, -i)
+
+    def test_expire_out_of_order(self):
+        """Tests Stations heard out of order, eg from archives."""
+        store = aprs.StationStore()
+        store.update('A1AA', 1, 1, heard=100)
+        store.update('B1BB', heard=200)
+        store.update('A1AA', 9, 9, status=b'old', heard=50)
+        store.update('C1CC', heard=10)
+        self.assertEqual(list(store), ['A1AA', 'B1BB', 'C1CC'])
+        station = store['A1AA']
+        self.assertEqual((station.lat, station.lng, station.heard),
+                         (1.0, 1.0, 100.0))
+        self.assertEqual(station.status, b'old')
+
+        self.assertEqual(store.expire(75), 1)
+        self.assertEqual(list(store), ['A1AA', 'B1BB'])
+        self.assertEqual(store.expire(150), 1)
+        self.assertEqual(list(store), ['B1BB'])
+
+
+if __name__ == '__main__':
+    unittest.main()
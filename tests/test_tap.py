@@ -0,0 +1,128 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""Python APRS Module Packet Tap Tests."""
+
+import asyncio
+import io
+import os
+import signal
+import tempfile
+import threading
+import unittest  # pylint: disable=R0801
+
+from .context import aprs  # pylint: disable=R0801
+from .context import aprs_test_classes  # pylint: disable=R0801
+
+import aprs.server  # pylint: disable=C0411,C0413
+
+__author__ = 'Greg Albrecht W2GMD <oss@undef.net>'  # NOQA pylint: disable=R0801
+__copyright__ = 'Copyright 2017 Greg Albrecht and Contributors'  # NOQA pylint: disable=R0801
+__license__ = 'Apache License, Version 2.0'  # NOQA pylint: disable=R0801
+
+
+class PacketTapTestCase(aprs_test_classes.APRSTestClass):  # NOQA pylint: disable=R0904
+
+    """Tests for `aprs.PacketTap`."""
+
+    def test_ring(self):
+        """Tests the ring keeps the last `size` Frames, oldest first."""
+        tap = aprs.PacketTap(3)
+        self.assertEqual(tap.snapshot(), [])
+        for index in range(5):
+            tap.record(b'W2GMD-%d>APRS:>%d' % (index + 1, index), b'tcp')
+        self.assertEqual(len(tap), 3)
+        self.assertEqual(tap.count, 5)
+        self.assertEqual([frame for _, _, frame in tap.snapshot()],
+                         [b'W2GMD-3>APRS:>2', b'W2GMD-4>APRS:>3',
+                          b'W2GMD-5>APRS:>4'])
+        self.assertEqual({tag for _, tag, _ in tap.snapshot()}, {b'tcp'})
+
+    def test_dump_and_stream(self):
+        """Tests dumped & streamed lines, with escaping."""
+        stream = io.BytesIO()
+        tap = aprs.PacketTap(2, stream=stream)
+        tap.record(b'W2GMD>APRS:>a\r\nb\\', b'kiss')
+        out = io.BytesIO()
+        self.assertEqual(tap.dump(out), 1)
+        self.assertEqual(out.getvalue(), stream.getvalue())
+        timestamp, tag, frame = out.getvalue().split(b' ', 2)
+        self.assertGreater(float(timestamp), 0)
+        self.assertEqual(tag, b'kiss')
+        self.assertEqual(frame, b'W2GMD>APRS:>a\\r\\nb\\\\\n')
+
+    def test_stream_memoryview(self):
+        """Tests streaming & dumping escaped memoryview Frames."""
+        stream = io.BytesIO()
+        tap = aprs.PacketTap(2, stream=stream)
+        tap.record(memoryview(b'W2GMD>APRS:>a\nb'), b'tcp')
+        out = io.BytesIO()
+        tap.dump(out)
+        for dumped in (stream.getvalue(), out.getvalue()):
+            self.assertTrue(dumped.endswith(b' tcp W2GMD>APRS:>a\\nb\n'))
+            self.assertEqual(dumped.count(b'\n'), 1)
+
+    def test_signal_missing(self):
+        """Tests installing on a missing signal raises ValueError."""
+        with self.assertRaises(ValueError):
+            aprs.PacketTap().install_signal(None)
+
+    @unittest.skipUnless(hasattr(signal, 'SIGUSR1'), 'No SIGUSR1')
+    def test_signal(self):
+        """Tests dumping to `dump_path` on a signal."""
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, 'tap.log')
+            tap = aprs.PacketTap(dump_path=path)
+            tap.record(b'W2GMD>APRS:>signal')
+            previous = signal.getsignal(signal.SIGUSR1)
+            try:
+                tap.install_signal()
+                os.kill(os.getpid(), signal.SIGUSR1)
+            finally:
+                signal.signal(signal.SIGUSR1, previous)
+            with open(path, 'rb') as dump_file:
+                self.assertTrue(
+                    dump_file.read().endswith(b' - W2GMD>APRS:>signal\n'))
+
+    def test_receive(self):
+        """Tests `aprs.TCP` records Frames & dumps them when it fails."""
+        loop = asyncio.new_event_loop()
+        thread = threading.Thread(target=loop.run_forever)
+        thread.start()
+        server = aprs.server.APRSISServer(
+            [b'W2GMD-%d>APRS:>tap' % ssid for ssid in range(1, 6)],
+            port=0, min_clients=1)
+        asyncio.run_coroutine_threadsafe(server.start(), loop).result(5)
+
+        aprs_conn = aprs.TCP(
+            b'N0CALL', b'13023',
+            servers=[b'127.0.0.1:%d' % server.port], aprs_filter=b'p/W2GMD')
+        aprs_conn.start()
+
+        def _callback(frame):
+            if frame.source.ssid == b'5':
+                aprs_conn.interface.close()
+
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, 'tap.log')
+            aprs_conn.tap = aprs.PacketTap(dump_path=path)
+            try:
+                with self.assertRaises(OSError):
+                    aprs_conn.receive(callback=_callback)
+            finally:
+                asyncio.run_coroutine_threadsafe(
+                    server.close(), loop).result(5)
+                loop.call_soon_threadsafe(loop.stop)
+                thread.join()
+                loop.close()
+            with open(path, 'rb') as dump_file:
+                lines = dump_file.read().splitlines()
+
+        self.assertEqual(len(aprs_conn.tap), 5)
+        self.assertEqual([line.split(b' ', 2)[1:] for line in lines],
+                         [[b'tcp', b'W2GMD-%d>APRS:>tap' % ssid]
+                          for ssid in range(1, 6)])
+
+
+if __name__ == '__main__':
+    unittest.main()
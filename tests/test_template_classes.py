@@ -0,0 +1,63 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""Python APRS Module Frame Template Tests."""
+
+import unittest  # pylint: disable=R0801
+
+from .context import aprs  # pylint: disable=R0801
+from .context import aprs_test_classes  # pylint: disable=R0801
+
+__author__ = 'Greg Albrecht W2GMD <oss@undef.net>'  # NOQA pylint: disable=R0801
+__copyright__ = 'Copyright 2017 Greg Albrecht and Contributors'  # NOQA pylint: disable=R0801
+__license__ = 'Apache License, Version 2.0'  # NOQA pylint: disable=R0801
+
+
+class FrameTemplateTestCase(aprs_test_classes.APRSTestClass):  # NOQA pylint: disable=R0904
+
+    """Tests for `aprs.FrameTemplate`."""
+
+    def setUp(self):  # pylint: disable=C0103
+        super(FrameTemplateTestCase, self).setUp()
+        self.template = aprs.FrameTemplate(
+            'W2GMD-6', 'APRS', ['WIDE1-1', 'WIDE2-1'])
+        self.infos = [b'T#%03d,1,2,3,4,5,00000000' % i for i in range(5)]
+
+    def _frame(self, info):
+        return aprs.parse_frame(b'W2GMD-6>APRS,WIDE1-1,WIDE2-1:' + info)
+
+    def test_render(self):
+        """Tests rendering single Frames as text & AX.25."""
+        for info in self.infos:
+            self.assertEqual(
+                self.template.render(info), bytes(self._frame(info)))
+            self.assertEqual(
+                self.template.encode_ax25(info),
+                self._frame(info).encode_ax25())
+
+        frame = self.template.frame('>status')
+        self.assertEqual(str(frame), 'W2GMD-6>APRS,WIDE1-1,WIDE2-1:>status')
+
+    def test_render_many(self):
+        """Tests rendering many Frames into one reused buffer."""
+        buffer, offsets = self.template.render_many(self.infos)
+        self.assertEqual(len(offsets), 6)
+        self.assertEqual(
+            bytes(buffer[:offsets[-1]]),
+            b''.join(bytes(self._frame(info)) + b'\r\n'
+                     for info in self.infos))
+
+        reused, offsets = self.template.render_many(
+            self.infos[:2], buffer=buffer, ax25=True)
+        self.assertIs(reused, buffer)
+        self.assertEqual(
+            bytes(buffer[offsets[1]:offsets[2]]),
+            self._frame(self.infos[1]).encode_ax25())
+
+        grown, offsets = self.template.render_many(
+            self.infos * 3, buffer=bytearray(10))
+        self.assertEqual(len(grown), offsets[-1])
+
+
+if __name__ == '__main__':
+    unittest.main()
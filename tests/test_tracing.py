@@ -0,0 +1,95 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""Python APRS Module Receive Tracing Tests."""
+
+import asyncio
+import threading
+import time
+import unittest  # pylint: disable=R0801
+
+from .context import aprs  # pylint: disable=R0801
+from .context import aprs_test_classes  # pylint: disable=R0801
+
+import aprs.server  # pylint: disable=C0411,C0413
+import aprs.tracing  # pylint: disable=C0411,C0413
+
+__author__ = 'Greg Albrecht W2GMD <oss@undef.net>'  # NOQA pylint: disable=R0801
+__copyright__ = 'Copyright 2017 Greg Albrecht and Contributors'  # NOQA pylint: disable=R0801
+__license__ = 'Apache License, Version 2.0'  # NOQA pylint: disable=R0801
+
+
+class TracingTestCase(aprs_test_classes.APRSTestClass):  # NOQA pylint: disable=R0904
+
+    """Tests for `aprs.tracing` & Frame receive timestamps."""
+
+    def setUp(self):  # pylint: disable=C0103
+        super(TracingTestCase, self).setUp()
+        self.registry = aprs.MetricsRegistry()
+
+    def test_sampling(self):
+        """Tests deterministic 1-in-N sampling."""
+        tracer = aprs.tracing.Tracer(0.25, registry=self.registry)
+        self.assertEqual(
+            [tracer.sample() for _ in range(8)],
+            [True, False, False, False, True, False, False, False])
+        self.assertEqual(tracer.traced, 2)
+        tracer.record('parse', 2000)
+        self.assertEqual(tracer.summary()['parse']['mean'], 2e-06)
+        self.assertIn('aprs_receive_stage_seconds_count{interface="tcp",'
+                      'stage="parse"} 1', self.registry.prometheus())
+        with self.assertRaises(ValueError):
+            aprs.tracing.Tracer(0)
+
+    def test_receive(self):
+        """Tests stamping & tracing Frames received by `aprs.TCP`."""
+        loop = asyncio.new_event_loop()
+        thread = threading.Thread(target=loop.run_forever)
+        thread.start()
+        server = aprs.server.APRSISServer(
+            [b'W2GMD-%d>APRS:>trace' % ssid for ssid in range(1, 11)],
+            port=0, min_clients=1)
+        asyncio.run_coroutine_threadsafe(server.start(), loop).result(5)
+
+        aprs_conn = aprs.TCP(
+            b'N0CALL', b'13023',
+            servers=[b'127.0.0.1:%d' % server.port], aprs_filter=b'p/W2GMD')
+        aprs_conn.metrics = aprs.metrics.InterfaceMetrics(
+            'tcp', self.registry)
+        aprs_conn.tracer = aprs.tracing.Tracer(
+            0.5, registry=self.registry)
+        aprs_conn.wall_clock = True
+        aprs_conn.start()
+
+        frames = []
+        before = time.time()
+
+        def _callback(frame):
+            frames.append(frame)
+            if len(frames) == 10:
+                aprs_conn.interface.close()
+
+        with self.assertRaises(OSError):
+            aprs_conn.receive(callback=_callback)
+        asyncio.run_coroutine_threadsafe(server.close(), loop).result(5)
+        loop.call_soon_threadsafe(loop.stop)
+        thread.join()
+        loop.close()
+
+        self.assertTrue(all(isinstance(frame.received_ns, int)
+                            for frame in frames))
+        self.assertLessEqual(frames[0].received_ns, frames[-1].received_ns)
+        self.assertGreaterEqual(frames[0].received_at, before - 1)
+        self.assertGreaterEqual(frames[0].age(), 0)
+        self.assertIsNone(aprs.parse_frame(b'W2GMD>APRS:>test').age())
+
+        summary = aprs_conn.tracer.summary()
+        self.assertEqual(aprs_conn.tracer.traced, 5)
+        for stage in aprs.tracing.TRACE_STAGES:
+            self.assertEqual(summary[stage]['count'], 5)
+        self.assertGreaterEqual(summary['total']['sum'],
+                                summary['callback']['sum'])
+
+
+if __name__ == '__main__':
+    unittest.main()
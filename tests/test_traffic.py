@@ -0,0 +1,93 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""Python APRS Module Synthetic Traffic Tests."""
+
+import unittest  # pylint: disable=R0801
+
+from .context import aprs  # pylint: disable=R0801
+from .context import aprs_test_classes  # pylint: disable=R0801
+
+import aprs.traffic  # pylint: disable=C0411,C0413
+
+__author__ = 'Greg Albrecht W2GMD <oss@undef.net>'  # NOQA pylint: disable=R0801
+__copyright__ = 'Copyright 2017 Greg Albrecht and Contributors'  # NOQA pylint: disable=R0801
+__license__ = 'Apache License, Version 2.0'  # NOQA pylint: disable=R0801
+
+
+class TrafficGeneratorTestCase(aprs_test_classes.APRSTestClass):  # NOQA pylint: disable=R0904
+
+    """Tests for `aprs.traffic.TrafficGenerator`."""
+
+    def setUp(self):  # pylint: disable=C0103
+        super(TrafficGeneratorTestCase, self).setUp()
+        self.generator = aprs.traffic.TrafficGenerator(seed=7, stations=50)
+
+    def test_deterministic(self):
+        """Tests that the same seed generates the same traffic."""
+        other = aprs.traffic.TrafficGenerator(seed=7, stations=50)
+        self.assertEqual(self.generator.lines(500), other.lines(500))
+        self.assertEqual(self.generator.kiss(100), other.kiss(100))
+        self.assertNotEqual(
+            aprs.traffic.TrafficGenerator(seed=8, stations=50).lines(500),
+            self.generator.lines(500))
+
+    def test_lines(self):
+        """Tests that generated APRS-IS Frames parse & carry q-constructs."""
+        lines = self.generator.lines(1000)
+        self.assertEqual(len(lines), 1000)
+        for line in lines:
+            frame = aprs.parse_frame(line)
+            self.assertEqual(bytes(frame), line)
+            self.assertTrue(
+                any(bytes(path).startswith(b'qA') for path in frame.path))
+
+        feed = self.generator.feed(10)
+        self.assertEqual(feed.count(b'\r\n'), 10)
+        self.assertTrue(feed.endswith(b'\r\n'))
+
+        frames = list(self.generator.frames(5))
+        self.assertEqual(len(frames), 5)
+        self.assertIsInstance(frames[0], aprs.Frame)
+
+    def test_on_air(self):
+        """Tests AX.25 & KISS Frames only come from RF stations."""
+        rf_calls = set(station.callsign for station in
+                       self.generator.stations if station.rf)
+        for encoded in self.generator.ax25(200):
+            self.assertEqual(encoded[:1], aprs.AX25_FLAG)
+            frame = aprs.parse_frame(encoded)
+            self.assertIn(bytes(frame.source), rf_calls)
+            self.assertFalse(
+                any(bytes(path).startswith(b'qA') for path in frame.path))
+        for encoded in self.generator.kiss(200):
+            self.assertEqual(encoded[:2], b'\xc0\x00')
+            self.assertEqual(encoded[-1:], b'\xc0')
+            self.assertNotIn(b'\xc0', encoded[1:-1])
+
+    def test_compressed_position(self):
+        """Tests compressed position encoding."""
+        info = aprs.traffic.compressed_position(-33.85, 151.2, b'/', b'-')
+        self.assertEqual(len(info), 14)
+        lat, lng = aprs.parse_position(info)
+        self.assertAlmostEqual(lat, -33.85, 4)
+        self.assertAlmostEqual(lng, 151.2, 4)
+
+    def test_mic_e(self):
+        """Tests Mic-E destination & Information Field encoding."""
+        destination, info = aprs.traffic.mic_e(
+            33.4275, -112.129, b'/', b'>', course=251, speed=20)
+        # 33 25.65N, 'En Route', West & +100 longitude offset.
+        self.assertEqual(destination, b'SS2UVU')
+        self.assertEqual(info[:1], b'`')
+        self.assertEqual(info[1] - 28 + 100, 112)
+        # Minutes under 10 are sent as 60-69.
+        self.assertEqual(info[2] - 28, 67)
+        self.assertEqual(info[3] - 28, 74)
+        self.assertEqual((info[4] - 28) * 10 + (info[5] - 28) // 10, 20)
+        self.assertEqual(((info[5] - 28) % 10) * 100 + info[6] - 28, 251)
+        self.assertEqual(info[7:9], b'>/')
+
+
+if __name__ == '__main__':
+    unittest.main()